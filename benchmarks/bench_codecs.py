@@ -0,0 +1,108 @@
+"""Compares the JSON codecs on the payloads produced by the web API.
+
+The payloads are the serialized representations of a single resource, of
+a collection, of a bulk response and of an error. For each codec, reports
+the time to encode and decode each of them.
+
+Usage (with the package installed, e.g. via ``make develop``):
+
+    python benchmarks/bench_codecs.py [num_items] [repeats]
+"""
+import sys
+import timeit
+
+from tornadowebapi import exceptions
+from tornadowebapi.bulk_response import BulkResponse
+from tornadowebapi.codecs import JSONCodec, ORJSONCodec
+from tornadowebapi.items_response import ItemsResponse
+from tornadowebapi.resource import Resource
+from tornadowebapi.resource_fragment import ResourceFragment
+from tornadowebapi.serializers import BasicRESTSerializer
+from tornadowebapi.traitlets import OneOf, Unicode, Int, Float, List
+
+
+class Location(ResourceFragment):
+    x = Float()
+    y = Float()
+    z = Float(optional=True)
+
+
+class Atom(Resource):
+    name = Unicode()
+    element = Unicode()
+    charge = Int()
+    mass = Float()
+    tags = List(optional=True)
+    location = OneOf(Location)
+
+
+def make_atom(i):
+    return Atom(identifier=str(i),
+                name="atom {}".format(i),
+                element="C",
+                charge=0,
+                mass=12.011,
+                tags=["organic", "ring </b>"],
+                location=Location(x=float(i), y=0.5, z=1.5))
+
+
+def make_payloads(num_items):
+    """Returns the representations to encode, by name."""
+    serializer = BasicRESTSerializer()
+
+    items_response = ItemsResponse(Atom)
+    items_response.set([make_atom(i) for i in range(num_items)])
+
+    bulk_response = BulkResponse()
+    for i in range(num_items):
+        if i % 10 == 0:
+            bulk_response.add_failure(exceptions.Exists(), identifier=str(i))
+        else:
+            bulk_response.add_success(
+                201, identifier=str(i),
+                location="http://example.com/api/v1/atoms/{}/".format(i))
+
+    return [
+        ("resource", serializer.serialize(make_atom(1))),
+        ("collection", serializer.serialize(items_response)),
+        ("bulk", serializer.serialize(bulk_response)),
+        ("error", serializer.serialize(
+            exceptions.BadRepresentation("Missing mandatory element"))),
+    ]
+
+
+def main():
+    num_items = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    codecs = [("stdlib", JSONCodec())]
+    if ORJSONCodec is not None:
+        codecs.append(("orjson", ORJSONCodec()))
+    else:
+        print("orjson is not installed: only the stdlib codec is measured.")
+
+    print("{:<8} {:<12} {:>10} {:>14} {:>14}".format(
+        "codec", "payload", "bytes", "encode us", "decode us"))
+    for payload_name, representation in make_payloads(num_items):
+        number = max(1, 100000 // len(JSONCodec().encode(representation)))
+        for codec_name, codec in codecs:
+            encoded = codec.encode(representation)
+            if not codec.binary:
+                encoded = encoded.encode("utf-8")
+
+            assert codec.decode(encoded) == representation
+
+            encode = min(timeit.repeat(
+                lambda: codec.encode(representation),
+                number=number, repeat=repeats)) / number
+            decode = min(timeit.repeat(
+                lambda: codec.decode(encoded),
+                number=number, repeat=repeats)) / number
+
+            print("{:<8} {:<12} {:>10} {:>14.1f} {:>14.1f}".format(
+                codec_name, payload_name, len(encoded),
+                encode * 1e6, decode * 1e6))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Measures the throughput of BasicRESTSerializer on a large ItemsResponse.
+
+Compares the per-class serialization plan against the previous
+implementation, which introspected the traits of every item.
+
+Usage (with the package installed, e.g. via ``make develop``):
+
+    python benchmarks/bench_serializer.py [num_items] [repeats]
+"""
+import sys
+import timeit
+
+from tornadowebapi.items_response import ItemsResponse
+from tornadowebapi.resource import Resource
+from tornadowebapi.resource_fragment import ResourceFragment
+from tornadowebapi.serializers import BasicRESTSerializer
+from tornadowebapi.traitlets import Absent, OneOf, Unicode, Int, Float, List
+
+
+class Location(ResourceFragment):
+    x = Float()
+    y = Float()
+    z = Float(optional=True)
+
+
+class Atom(Resource):
+    name = Unicode()
+    element = Unicode()
+    charge = Int()
+    mass = Float()
+    tags = List(optional=True)
+    location = OneOf(Location)
+
+
+class LegacySerializer(BasicRESTSerializer):
+    """The serializer as it was before the introduction of plans."""
+    def serialize_items_response(self, items_response, fields=None):
+        return {
+            "offset": items_response.offset,
+            "total": items_response.total,
+            "items": {
+                str(item.identifier): self.serialize_resource(item)
+                for item in items_response.items
+            },
+            "identifiers": [item.identifier for item in items_response.items]
+        }
+
+    def serialize_resource(self, resource, fields=None):
+        d = {}
+
+        for trait_name, trait in resource.traits().items():
+            if getattr(resource, trait_name) is Absent:
+                continue
+
+            if isinstance(trait, OneOf):
+                fragment = getattr(resource, trait_name)
+                d[trait_name] = self.serialize_resource(fragment)
+            else:
+                d[trait_name] = getattr(resource, trait_name)
+
+        return d
+
+
+def make_items_response(num_items):
+    items = [
+        Atom(identifier=str(i),
+             name="atom {}".format(i),
+             element="C",
+             charge=0,
+             mass=12.011,
+             location=Location(x=float(i), y=0.5, z=1.5))
+        for i in range(num_items)
+    ]
+    response = ItemsResponse(Atom)
+    response.set(items)
+    return response
+
+
+def main():
+    num_items = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    response = make_items_response(num_items)
+    legacy = LegacySerializer()
+    planned = BasicRESTSerializer()
+
+    assert legacy.serialize(response) == planned.serialize(response)
+
+    for name, serializer in [("before (per-item introspection)", legacy),
+                             ("after (per-class plan)", planned)]:
+        best = min(timeit.repeat(lambda: serializer.serialize(response),
+                                 number=1, repeat=repeats))
+        print("{:<35} {:>12.0f} items/s".format(name, num_items / best))
+
+
+if __name__ == "__main__":
+    main()
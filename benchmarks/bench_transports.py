@@ -0,0 +1,90 @@
+"""Compares the JSON and MessagePack transports on numeric payloads.
+
+The payloads are the serialized representations of a collection of
+resources carrying arrays of floats, as produced by simulations, and of
+a single large one. For each transport and codec, reports the size of the
+rendered payload, and the time to render and to parse it.
+
+Usage (with the package installed, e.g. via ``make develop``):
+
+    python benchmarks/bench_transports.py [num_items] [repeats]
+"""
+import random
+import sys
+import timeit
+
+from tornadowebapi.codecs import (
+    JSONCodec, ORJSONCodec, MsgPackCodec, PureMsgPackCodec)
+from tornadowebapi.items_response import ItemsResponse
+from tornadowebapi.resource import Resource
+from tornadowebapi.transports import BasicRESTTransport, MsgPackTransport
+from tornadowebapi.traitlets import Unicode, Int, List
+from tornadowebapi.utils import payload_chunks
+
+
+class Mesh(Resource):
+    name = Unicode()
+    step = Int()
+    positions = List()
+    velocities = List()
+
+
+def make_mesh(i, num_points):
+    generator = random.Random(i)
+    return Mesh(identifier=str(i),
+                name="mesh {}".format(i),
+                step=i,
+                positions=[generator.uniform(-1e3, 1e3)
+                           for _ in range(num_points)],
+                velocities=[generator.gauss(0.0, 1.0)
+                            for _ in range(num_points)])
+
+
+def make_transports():
+    transports = [("json/stdlib", BasicRESTTransport(codec=JSONCodec()))]
+    if ORJSONCodec is not None:
+        transports.append(
+            ("json/orjson", BasicRESTTransport(codec=ORJSONCodec())))
+    if MsgPackCodec is not None:
+        transports.append(
+            ("msgpack/msgpack", MsgPackTransport(codec=MsgPackCodec())))
+    transports.append(
+        ("msgpack/pure", MsgPackTransport(codec=PureMsgPackCodec())))
+    return transports
+
+
+def main():
+    num_items = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    items_response = ItemsResponse(Mesh)
+    items_response.set([make_mesh(i, 100) for i in range(num_items)])
+    entities = [
+        ("collection", items_response),
+        ("resource", make_mesh(0, 100 * num_items)),
+    ]
+
+    print("{:<16} {:<12} {:>10} {:>12} {:>12}".format(
+        "transport", "payload", "bytes", "render ms", "parse ms"))
+    for entity_name, entity in entities:
+        for transport_name, transport in make_transports():
+            representation = transport.serializer.serialize(entity)
+            payload = b"".join(payload_chunks(
+                transport.renderer.render(representation)))
+
+            assert transport.parser.parse(payload) == representation
+
+            render = min(timeit.repeat(
+                lambda: transport.renderer.render(representation),
+                number=1, repeat=repeats))
+            parse = min(timeit.repeat(
+                lambda: transport.parser.parse(payload),
+                number=1, repeat=repeats))
+
+            print("{:<16} {:<12} {:>10} {:>12.2f} {:>12.2f}".format(
+                transport_name, entity_name, len(payload),
+                render * 1e3, parse * 1e3))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Measures the per-request cost of the web handlers, for each verb.
+
+Requests are dispatched in-process, without network, to an application
+serving an in-memory collection. For each verb, reports the time per
+request, and the peak of the memory allocated while serving it, as traced
+by tracemalloc.
+
+Usage (with the package installed, e.g. via ``make develop``):
+
+    python benchmarks/bench_web_handlers.py [num_requests]
+"""
+import sys
+import time
+import tracemalloc
+from collections import OrderedDict
+
+from tornado import escape, gen, httputil, ioloop, web
+
+from tornadowebapi.http.capture_connection import CaptureConnection
+from tornadowebapi.registry import Registry
+from tornadowebapi.resource import Resource
+from tornadowebapi.resource_handler import ResourceHandler
+from tornadowebapi.traitlets import Unicode, Int
+
+
+class Student(Resource):
+    name = Unicode()
+    age = Int()
+
+
+class StudentHandler(ResourceHandler):
+    resource_class = Student
+    collection = OrderedDict()
+    id = 0
+
+    @gen.coroutine
+    def create(self, instance, **kwargs):
+        instance.identifier = str(type(self).id)
+        type(self).id += 1
+        self.collection[instance.identifier] = instance
+
+    @gen.coroutine
+    def retrieve(self, instance, **kwargs):
+        stored = self.collection[instance.identifier]
+        instance.name = stored.name
+        instance.age = stored.age
+
+    @gen.coroutine
+    def update(self, instance, **kwargs):
+        self.collection[instance.identifier] = instance
+
+    @gen.coroutine
+    def patch(self, instance, changed_fields, **kwargs):
+        stored = self.collection[instance.identifier]
+        for name in changed_fields:
+            setattr(stored, name, getattr(instance, name))
+
+    @gen.coroutine
+    def delete(self, instance, **kwargs):
+        self.collection.pop(instance.identifier, None)
+
+    @gen.coroutine
+    def items(self, items_response, **kwargs):
+        items_response.set(list(self.collection.values())[:10])
+
+
+def make_app():
+    registry = Registry()
+    registry.register(StudentHandler)
+    return web.Application(registry.api_handlers("/"))
+
+
+@gen.coroutine
+def request(app, method, uri, body=None):
+    """Executes a request in-process, returning the status code"""
+    if body is not None:
+        body = escape.utf8(escape.json_encode(body))
+
+    connection = CaptureConnection()
+    req = httputil.HTTPServerRequest(method=method,
+                                     uri=uri,
+                                     body=body,
+                                     connection=connection)
+    app(req)
+    yield connection.finished
+    return connection.code
+
+
+@gen.coroutine
+def measure(app, method, uri, body, num_requests):
+    """Returns the µs and the peak allocated KiB per request"""
+    # Warm up, to populate the caches.
+    for _ in range(10):
+        code = yield request(app, method, uri, body)
+    assert code < 400, (method, uri, code)
+
+    start = time.perf_counter()
+    for _ in range(num_requests):
+        yield request(app, method, uri, body)
+    elapsed = time.perf_counter() - start
+
+    peak = 0
+    tracemalloc.start()
+    for _ in range(100):
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        yield request(app, method, uri, body)
+        peak += tracemalloc.get_traced_memory()[1] - current
+    tracemalloc.stop()
+
+    return elapsed / num_requests * 1e6, peak / 100 / 1024
+
+
+@gen.coroutine
+def main():
+    num_requests = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    app = make_app()
+
+    for i in range(20):
+        StudentHandler.collection[str(i)] = Student(
+            identifier=str(i), name="student {}".format(i), age=i)
+    StudentHandler.id = 20
+
+    cases = [
+        ("GET", "/api/v1/students/1/", None),
+        ("GET", "/api/v1/students/", None),
+        ("POST", "/api/v1/students/", {"name": "john", "age": 19}),
+        ("PUT", "/api/v1/students/1/", {"name": "john", "age": 20}),
+        ("PATCH", "/api/v1/students/1/", {"age": 21}),
+        ("DELETE", "/api/v1/students/2/", None),
+    ]
+
+    print("{:<8} {:<22} {:>12} {:>18}".format(
+        "verb", "path", "us/request", "peak KiB/request"))
+    for method, uri, body in cases:
+        us, kib = yield measure(app, method, uri, body, num_requests)
+        print("{:<8} {:<22} {:>12.1f} {:>18.1f}".format(
+            method, uri, us, kib))
+
+
+if __name__ == "__main__":
+    ioloop.IOLoop.current().run_sync(main)
@@ -1,10 +1,12 @@
 import os
+from collections import OrderedDict
 from tornado import web
 import tornado.ioloop
 
 from tornadowebapi.registry import Registry
 from tornadowebapi.tests.resource_handlers import StudentHandler
 from tornadowebapi.tests.resource_handlers import ServerInfoHandler
+from tornadowebapi.tests.resource_handlers import CourseHandler
 
 
 class Application(web.Application):
@@ -12,11 +14,15 @@ class Application(web.Application):
         self.reg = Registry()
         self.reg.register(StudentHandler)
         self.reg.register(ServerInfoHandler)
+        # Not shared with the students. Supports cursor pagination.
+        CourseHandler.collection = OrderedDict()
+        self.reg.register(CourseHandler)
         handlers = self.reg.api_handlers('/')
         base_path = os.path.dirname(os.path.abspath(__file__))
         handlers += [('/(.*)', web.StaticFileHandler, {'path': base_path})]
         print("Serving from base path {}".format(base_path))
-        super().__init__(handlers)
+        # Signs the cursors of the collections.
+        super().__init__(handlers, cookie_secret="jstests")
 
     # Public
     def start(self):
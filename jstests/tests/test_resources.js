@@ -210,4 +210,227 @@ define([
             });
         });
     });
+
+    QUnit.test("items with cursor", function (assert) {
+        var done = assert.async();
+        resources.Course.create_many([
+            {title: "algebra"},
+            {title: "biology"},
+            {title: "chemistry"}
+        ]).done(function() {
+            resources.Course.items({limit: 2}).done(
+                function(identifiers, items, offset, total, next_cursor) {
+                    assert.deepEqual(identifiers, ["0", "1"]);
+                    assert.equal(total, 3);
+                    assert.equal(typeof next_cursor, "string");
+                    resources.Course.items(
+                        {limit: 2, cursor: next_cursor}
+                    ).done(function(identifiers, items, offset, total,
+                                    next_cursor) {
+                        assert.deepEqual(identifiers, ["2"]);
+                        assert.equal(items["2"].title, "chemistry");
+                        assert.equal(next_cursor, undefined,
+                                     "No more items");
+                        done();
+                    });
+                });
+        });
+    });
+
+    QUnit.test("items with forged cursor", function (assert) {
+        var done = assert.async();
+        resources.Course.items({limit: 2, cursor: "IjEi.forged"})
+            .done(function() {
+                assert.notOk();
+                done();
+            })
+            .fail(function(error) {
+                assert.equal(error.code, 400);
+                done();
+            });
+    });
+
+    QUnit.test("items with total mode", function (assert) {
+        var done = assert.async(2);
+        resources.Course.items().done(
+            function(identifiers, items, offset, total, next_cursor,
+                     total_mode) {
+                assert.equal(total, 3);
+                assert.equal(total_mode, "exact", "The default");
+                done();
+            });
+        resources.Course.items({total: "estimate"}).done(
+            function(identifiers, items, offset, total, next_cursor,
+                     total_mode) {
+                assert.equal(identifiers.length, 3);
+                assert.equal(total, 10);
+                assert.equal(total_mode, "estimate");
+                done();
+            });
+    });
+
+    // The students 1 to 5 are left by the tests above.
+    QUnit.test("patch", function (assert) {
+        var done = assert.async();
+        resources.Student.patch("1", {age: 30})
+            .done(function() {
+                resources.Student.retrieve("1").done(
+                    function(student) {
+                        assert.equal(student.name, "john wick");
+                        assert.equal(student.age, 30);
+                        done();
+                    }
+                );
+            });
+    });
+
+    QUnit.test("patch unexistent", function (assert) {
+        var done = assert.async();
+        resources.Student.patch("0", {age: 30})
+            .done(function() {
+                assert.notOk();
+                done();
+            })
+            .fail(function(error) {
+                assert.equal(error.code, 404);
+                done();
+            });
+    });
+
+    QUnit.test("create_many", function (assert) {
+        var done = assert.async();
+        resources.Student.create_many([
+            {name: "neo", age: 37},
+            {name: "trinity", age: 33}
+        ]).done(function(items, status) {
+            assert.equal(status, 201);
+            assert.equal(items.length, 2);
+            assert.equal(items[0].status, 201);
+            assert.equal(items[0].identifier, "6");
+            assert.equal(items[0].location,
+                "http://127.0.0.1:12345/api/v1/students/6/");
+            assert.equal(items[1].status, 201);
+            assert.equal(items[1].identifier, "7");
+            done();
+        });
+    });
+
+    QUnit.test("retrieve_many", function (assert) {
+        var done = assert.async();
+        resources.Student.retrieve_many(["6", "7", "0"]).done(
+            function(identifiers, items, offset, total, next_cursor,
+                     total_mode, missing) {
+                assert.deepEqual(identifiers, ["6", "7"]);
+                assert.equal(items["6"].name, "neo");
+                assert.equal(items["7"].name, "trinity");
+                assert.deepEqual(missing, ["0"]);
+                done();
+            });
+    });
+
+    QUnit.test("items without ids", function (assert) {
+        var done = assert.async();
+        resources.Student.items().done(
+            function(identifiers, items, offset, total, next_cursor,
+                     total_mode, missing) {
+                assert.equal(identifiers.length, 7);
+                assert.equal(missing, undefined);
+                done();
+            });
+    });
+
+    QUnit.test("retrieve_many too many ids", function (assert) {
+        var done = assert.async();
+        var ids = [];
+        for (var i = 0; i <= 100; i++) {
+            ids.push(String(i));
+        }
+        resources.Student.retrieve_many(ids)
+            .done(function() {
+                assert.notOk();
+                done();
+            })
+            .fail(function(error) {
+                assert.equal(error.code, 400);
+                assert.equal(error.type, "BadQueryArguments");
+                done();
+            });
+    });
+
+    QUnit.test("update_many", function (assert) {
+        var done = assert.async();
+        resources.Student.update_many({
+            "6": {name: "thomas anderson", age: 38},
+            "7": {name: "trinity", age: 34}
+        }).done(function(items, status) {
+            assert.equal(status, 200);
+            assert.deepEqual(items, [
+                {status: 204, identifier: "6"},
+                {status: 204, identifier: "7"}
+            ]);
+            resources.Student.retrieve("6").done(function(student) {
+                assert.equal(student.name, "thomas anderson");
+                assert.equal(student.age, 38);
+                done();
+            });
+        });
+    });
+
+    QUnit.test("patch_many", function (assert) {
+        var done = assert.async();
+        resources.Student.patch_many({
+            "6": {age: 39},
+            "0": {age: 40}
+        }).done(function(items, status) {
+            assert.equal(status, 207, "Some of them failed");
+            assert.deepEqual(items, [
+                {status: 204, identifier: "6"},
+                {status: 404, identifier: "0"}
+            ]);
+            resources.Student.retrieve("6").done(function(student) {
+                assert.equal(student.name, "thomas anderson");
+                assert.equal(student.age, 39);
+                done();
+            });
+        });
+    });
+
+    QUnit.test("delete_many", function (assert) {
+        var done = assert.async();
+        resources.Student.delete_many({ids: "6,7"})
+            .done(function(items, status) {
+                assert.equal(status, 200);
+                assert.deepEqual(items, [
+                    {status: 204, identifier: "6"},
+                    {status: 204, identifier: "7"}
+                ]);
+                resources.Student.items().done(function(identifiers) {
+                    assert.deepEqual(identifiers, ["1", "2", "3", "4", "5"]);
+                    done();
+                });
+            });
+    });
+
+    QUnit.test("batch", function (assert) {
+        var done = assert.async();
+        resources.batch([
+            {method: "GET", path: "courses/0/"},
+            {method: "PATCH", path: "students/1/", body: {age: 31}},
+            {method: "GET", path: "students/", query: {limit: 1}},
+            {method: "GET", path: "notpresent/"}
+        ]).done(function(responses) {
+            assert.equal(responses.length, 4);
+            assert.equal(responses[0].status, 200);
+            assert.deepEqual(responses[0].body, {title: "algebra"});
+            assert.equal(responses[1].status, 204);
+            assert.equal(responses[1].body, undefined);
+            assert.equal(responses[2].status, 200);
+            assert.deepEqual(responses[2].body.identifiers, ["1"]);
+            assert.equal(responses[3].status, 404);
+            resources.Student.retrieve("1").done(function(student) {
+                assert.equal(student.age, 31);
+                done();
+            });
+        });
+    });
 });
@@ -34,6 +34,10 @@ setup(
         "setuptools>=21.0",
         "tornado>=4.3"
     ],
+    extras_require={
+        "orjson": ["orjson"],
+        "msgpack": ["msgpack"],
+    },
     packages=find_packages(),
     include_package_data=True,
     zip_safe=False
@@ -0,0 +1,64 @@
+from tornadowebapi.exceptions import WebAPIException
+from traitlets import HasTraits, List, Int, Any, Unicode, Instance
+
+
+class BulkResult(HasTraits):
+    """The outcome of a bulk operation on a single item."""
+
+    #: The HTTP status code of the outcome for this item.
+    status = Int()
+
+    #: The identifier of the item, if known.
+    identifier = Any(None, allow_none=True)
+
+    #: The URL of the item, if it has been created.
+    location = Unicode(None, allow_none=True)
+
+    #: The exception describing the failure, or None if successful.
+    exception = Instance(WebAPIException, allow_none=True)
+
+
+class BulkResponse(HasTraits):
+    """Reports the per-item outcome of an operation involving multiple
+    resources in a single request, such as a POST of an array of
+    representations on a collection. Items are reported in the same order
+    of the request."""
+
+    #: A list of BulkResult, one per item.
+    results = List()
+
+    def add_success(self, status, identifier=None, location=None):
+        """Reports a successful operation on an item.
+
+        Parameters
+        ----------
+        status: int
+            The HTTP status code for the item, e.g. CREATED.
+        identifier: str or None
+            The identifier of the item.
+        location: str or None
+            The URL of the item, if created.
+        """
+        self.results.append(BulkResult(status=status,
+                                       identifier=identifier,
+                                       location=location))
+
+    def add_failure(self, exception, identifier=None):
+        """Reports a failed operation on an item.
+
+        Parameters
+        ----------
+        exception: WebAPIException
+            The exception describing the failure. Its http_code is
+            used as status for the item.
+        identifier: str or None
+            The identifier of the item, if known.
+        """
+        self.results.append(BulkResult(status=exception.http_code,
+                                       identifier=identifier,
+                                       exception=exception))
+
+    @property
+    def succeeded(self):
+        """True if the operation succeeded for all the items."""
+        return all(result.exception is None for result in self.results)
@@ -0,0 +1,74 @@
+import sys
+
+from tornado import gen
+from tornado.concurrent import Future
+
+
+class Coalescer:
+    """Coalesces concurrent identical operations: while an operation
+    identified by a given key is in flight, further requests for the
+    same key wait for it and share its result, instead of performing
+    it again (single-flight).
+
+    A coalescer is held by the Registry.
+    """
+
+    def __init__(self):
+        # The futures of the operations in flight, by key.
+        self._in_flight = {}
+
+        #: The number of operations requested.
+        self.requests = 0
+
+        #: The number of operations that have been satisfied by
+        #: waiting for an identical one already in flight.
+        self.coalesced = 0
+
+    @gen.coroutine
+    def run(self, key, func):
+        """Runs the coroutine function func, unless an operation with the
+        same key is already in flight. In that case, waits for it and
+        returns its result, or raises its exception.
+
+        Parameters
+        ----------
+        key: hashable
+            The key identifying the operation. Operations with the same
+            key must be interchangeable.
+        func: callable
+            A function without arguments returning a Future.
+
+        Returns
+        -------
+        The result of func
+        """
+        self.requests += 1
+
+        in_flight = self._in_flight.get(key)
+        if in_flight is not None:
+            self.coalesced += 1
+            result, exc_info = yield in_flight
+            if exc_info is not None:
+                raise exc_info[1].with_traceback(exc_info[2])
+            return result
+
+        # The outcome is set as a result, also in case of failure, so that
+        # an exception with no waiters does not get logged as unretrieved.
+        future = Future()
+        self._in_flight[key] = future
+        try:
+            result = yield func()
+        except Exception:
+            future.set_result((None, sys.exc_info()))
+            raise
+        else:
+            future.set_result((result, None))
+        finally:
+            del self._in_flight[key]
+
+        return result
+
+    @property
+    def in_flight(self):
+        """The number of operations currently in flight."""
+        return len(self._in_flight)
@@ -0,0 +1,22 @@
+from .base_codec import BaseCodec  # noqa
+from .json_codec import JSONCodec  # noqa
+from .pure_msgpack_codec import PureMsgPackCodec  # noqa
+
+try:
+    from .orjson_codec import ORJSONCodec
+except ImportError:
+    ORJSONCodec = None
+
+try:
+    from .msgpack_codec import MsgPackCodec
+except ImportError:
+    MsgPackCodec = None
+
+
+def default_msgpack_codec():
+    """Returns the fastest MessagePack codec available: MsgPackCodec if
+    msgpack is installed, PureMsgPackCodec otherwise."""
+    if MsgPackCodec is not None:
+        return MsgPackCodec()
+
+    return PureMsgPackCodec()
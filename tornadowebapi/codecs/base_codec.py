@@ -0,0 +1,45 @@
+import abc
+
+
+class BaseCodec(metaclass=abc.ABCMeta):
+    """Converts between the low level representation (dicts, lists and
+    basic types) and its encoded form. Codecs are used by renderers and
+    parsers, so that the same format can be provided by different
+    implementations, e.g. accelerated ones."""
+
+    #: True if encode() returns bytes, False if it returns a string.
+    binary = False
+
+    @abc.abstractmethod
+    def encode(self, obj):
+        """Encodes the object.
+
+        Parameters
+        ----------
+        obj:
+            The representation to encode.
+
+        Returns
+        -------
+        string or bytes
+            The encoded object. bytes if the codec is binary.
+        """
+
+    @abc.abstractmethod
+    def decode(self, data):
+        """Decodes the data.
+
+        Parameters
+        ----------
+        data: bytes, memoryview or string
+            The encoded data.
+
+        Returns
+        -------
+        The decoded representation
+
+        Raises
+        ------
+        ValueError:
+            If the data cannot be decoded.
+        """
@@ -0,0 +1,21 @@
+import json
+
+from tornado import escape
+
+from .base_codec import BaseCodec
+
+
+class JSONCodec(BaseCodec):
+    """JSON codec based on the standard library.
+    Like tornado.escape.json_encode, escapes the "</" sequence, so that
+    the output can be safely embedded in a HTML script element."""
+
+    def encode(self, obj):
+        return escape.json_encode(obj)
+
+    def decode(self, data):
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            # Decodes straight from the buffer.
+            data = str(data, "utf-8")
+
+        return json.loads(data)
@@ -0,0 +1,18 @@
+import msgpack
+
+from .base_codec import BaseCodec
+
+
+class MsgPackCodec(BaseCodec):
+    """MessagePack codec based on the msgpack package."""
+
+    binary = True
+
+    def encode(self, obj):
+        return msgpack.packb(obj, use_bin_type=True)
+
+    def decode(self, data):
+        if isinstance(data, str):
+            raise ValueError("MessagePack data must be bytes")
+
+        return msgpack.unpackb(data, raw=False)
@@ -0,0 +1,140 @@
+import math
+import re
+
+import orjson
+
+from .base_codec import BaseCodec
+from .json_codec import JSONCodec
+
+# Values orjson would serialize, but the standard library rejects, are
+# passed to the default, which raises TypeError to use the fallback.
+_OPTIONS = (orjson.OPT_NON_STR_KEYS |
+            orjson.OPT_PASSTHROUGH_DATETIME |
+            orjson.OPT_PASSTHROUGH_DATACLASS)
+
+# orjson decodes the integers beyond 64 bits as floats. Inputs with such
+# integer tokens are decoded by the standard library. They are found with
+# bytes operations, faster than a regular expression, on a mapping of the
+# input: digits to "0", the characters continuing a float to ".", the
+# separators preceding a number to " ", other characters but the minus
+# sign, quotes and backslashes to "a". A long integer is then a run of
+# zeros preceded by a space, or a space and a minus, and not followed by
+# a dot.
+_TOKENS_TABLE = bytes(
+    0x30 if 0x30 <= i <= 0x39 else
+    0x2e if i in b".eE" else
+    0x20 if i in b"[,: \t\r\n" else
+    i if i in b'-"\\' else
+    0x61
+    for i in range(256))
+_LONG_DIGITS = b"0" * 19
+_LONG_INTEGER = b" " + _LONG_DIGITS
+_NEGATIVE_LONG_INTEGER = b" -" + _LONG_DIGITS
+_ZEROS = re.compile(b"0*")
+
+
+def _unsupported(obj):
+    raise TypeError("Unsupported type {}".format(type(obj)))
+
+
+def _has_non_finite(obj):
+    """True if obj contains NaN or infinite floats."""
+    if isinstance(obj, float):
+        return not math.isfinite(obj)
+    elif isinstance(obj, dict):
+        return any(_has_non_finite(value) for value in obj.values())
+    elif isinstance(obj, (list, tuple)):
+        return any(_has_non_finite(value) for value in obj)
+
+    return False
+
+
+def _has_long_integer(data):
+    """True if data contains integer tokens of 19 digits or more,
+    outside strings."""
+    tokens = b" " + data.translate(_TOKENS_TABLE)
+    if _LONG_DIGITS not in tokens:
+        return False
+
+    escapes = b"\\" in tokens
+    return (_has_token(tokens, _LONG_INTEGER, escapes) or
+            _has_token(tokens, _NEGATIVE_LONG_INTEGER, escapes))
+
+
+def _has_token(tokens, pattern, escapes):
+    """True if the mapped input has a match of the pattern, not followed
+    by a dot, outside strings."""
+    quotes = 0
+    scanned = 0
+    start = tokens.find(pattern)
+    while start != -1:
+        end = _ZEROS.match(tokens, start + len(pattern)).end()
+        if tokens[end:end + 1] != b".":
+            # Outside strings if preceded by an even number of
+            # unescaped quotes.
+            if escapes:
+                quotes += tokens[scanned:start].replace(
+                    b"\\\\", b"").replace(b'\\"', b"").count(b'"')
+            else:
+                quotes += tokens.count(b'"', scanned, start)
+            scanned = start
+            if quotes % 2 == 0:
+                return True
+
+        start = tokens.find(pattern, end)
+
+    return False
+
+
+class ORJSONCodec(BaseCodec):
+    """JSON codec based on orjson, producing UTF-8 bytes.
+    The decoded output is the same of JSONCodec, including the escape of
+    the "</" sequence, but not byte by byte identical: it is compact and
+    non-ASCII characters are not escaped.
+    Falls back to JSONCodec for the values orjson does not encode as the
+    standard library, e.g. integers beyond 64 bits, NaN and Infinity
+    (which orjson encodes as null) and datetimes, and for decoding what
+    only the standard library accepts, or decodes differently, e.g.
+    integers beyond 64 bits. Enum and UUID values, which the
+    standard library rejects, are encoded by orjson.
+
+    Not used by default: pass it to the transport, e.g.
+    BasicRESTTransport(codec=ORJSONCodec()).
+    """
+
+    binary = True
+
+    def __init__(self):
+        self._fallback = JSONCodec()
+
+    def encode(self, obj):
+        try:
+            data = orjson.dumps(obj, default=_unsupported, option=_OPTIONS)
+        except TypeError:
+            return self._fallback.encode(obj).encode("utf-8")
+
+        # Non-finite floats are encoded as null. Only look for them
+        # if the output contains any.
+        if b"null" in data and _has_non_finite(obj):
+            return self._fallback.encode(obj).encode("utf-8")
+
+        if b"</" in data:
+            data = data.replace(b"</", b"<\\/")
+
+        return data
+
+    def decode(self, data):
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        elif isinstance(data, memoryview):
+            data = data.tobytes()
+
+        if _has_long_integer(data):
+            return self._fallback.decode(data)
+
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # Either invalid, or using what only the stdlib accepts,
+            # e.g. NaN. Let the stdlib decide.
+            return self._fallback.decode(data)
@@ -0,0 +1,220 @@
+import struct
+
+from .base_codec import BaseCodec
+
+_UINT8 = struct.Struct(">B")
+_UINT16 = struct.Struct(">H")
+_UINT32 = struct.Struct(">I")
+_UINT64 = struct.Struct(">Q")
+_INT8 = struct.Struct(">b")
+_INT16 = struct.Struct(">h")
+_INT32 = struct.Struct(">i")
+_INT64 = struct.Struct(">q")
+_FLOAT32 = struct.Struct(">f")
+_FLOAT64 = struct.Struct(">d")
+
+
+class PureMsgPackCodec(BaseCodec):
+    """MessagePack codec implemented in pure Python, used when the msgpack
+    package is not installed. Supports the types of the representations:
+    None, bool, int, float, str, bytes, lists, tuples and dicts.
+    Floats are always encoded in double precision. Extension types are
+    not supported."""
+
+    binary = True
+
+    def encode(self, obj):
+        buffer = bytearray()
+        self._pack(obj, buffer)
+        return bytes(buffer)
+
+    def decode(self, data):
+        if isinstance(data, str):
+            raise ValueError("MessagePack data must be bytes")
+
+        data = memoryview(data)
+        obj, pos = self._unpack(data, 0)
+        if pos != len(data):
+            raise ValueError("Extra data after the MessagePack object")
+
+        return obj
+
+    def _pack(self, obj, buffer):
+        if obj is None:
+            buffer.append(0xc0)
+        elif obj is True:
+            buffer.append(0xc3)
+        elif obj is False:
+            buffer.append(0xc2)
+        elif isinstance(obj, int):
+            self._pack_int(obj, buffer)
+        elif isinstance(obj, float):
+            buffer.append(0xcb)
+            buffer += _FLOAT64.pack(obj)
+        elif isinstance(obj, str):
+            data = obj.encode("utf-8")
+            self._pack_header(len(data), buffer, 0xa0, 31,
+                              (0xd9, 0xda, 0xdb))
+            buffer += data
+        elif isinstance(obj, (bytes, bytearray, memoryview)):
+            self._pack_header(len(obj), buffer, None, None,
+                              (0xc4, 0xc5, 0xc6))
+            buffer += obj
+        elif isinstance(obj, (list, tuple)):
+            self._pack_header(len(obj), buffer, 0x90, 15,
+                              (None, 0xdc, 0xdd))
+            for value in obj:
+                self._pack(value, buffer)
+        elif isinstance(obj, dict):
+            self._pack_header(len(obj), buffer, 0x80, 15,
+                              (None, 0xde, 0xdf))
+            for key, value in obj.items():
+                self._pack(key, buffer)
+                self._pack(value, buffer)
+        else:
+            raise TypeError(
+                "Cannot encode object of type {}".format(type(obj)))
+
+    def _pack_int(self, obj, buffer):
+        if 0 <= obj <= 0x7f or -32 <= obj < 0:
+            buffer += _INT8.pack(obj) if obj < 0 else _UINT8.pack(obj)
+        elif obj > 0:
+            for code, packer, limit in ((0xcc, _UINT8, 0xff),
+                                        (0xcd, _UINT16, 0xffff),
+                                        (0xce, _UINT32, 0xffffffff),
+                                        (0xcf, _UINT64, 0xffffffffffffffff)):
+                if obj <= limit:
+                    buffer.append(code)
+                    buffer += packer.pack(obj)
+                    return
+            raise TypeError("Integer {} out of range".format(obj))
+        else:
+            for code, packer, limit in ((0xd0, _INT8, -0x80),
+                                        (0xd1, _INT16, -0x8000),
+                                        (0xd2, _INT32, -0x80000000),
+                                        (0xd3, _INT64, -0x8000000000000000)):
+                if obj >= limit:
+                    buffer.append(code)
+                    buffer += packer.pack(obj)
+                    return
+            raise TypeError("Integer {} out of range".format(obj))
+
+    def _pack_header(self, length, buffer, fix_code, fix_limit, codes):
+        """Packs the header of a variable length type. codes are the type
+        codes for 8, 16 and 32 bits lengths, None if not available."""
+        if fix_code is not None and length <= fix_limit:
+            buffer.append(fix_code | length)
+            return
+
+        for code, packer, limit in zip(codes,
+                                       (_UINT8, _UINT16, _UINT32),
+                                       (0xff, 0xffff, 0xffffffff)):
+            if code is not None and length <= limit:
+                buffer.append(code)
+                buffer += packer.pack(length)
+                return
+
+        raise TypeError("Object of length {} too long".format(length))
+
+    def _unpack(self, data, pos):
+        """Unpacks the object at pos. Returns the object and the position
+        following it."""
+        try:
+            code = data[pos]
+        except IndexError:
+            raise ValueError("Truncated MessagePack data")
+
+        pos += 1
+        if code <= 0x7f:
+            return code, pos
+        elif code >= 0xe0:
+            return code - 0x100, pos
+        elif code <= 0x8f:
+            return self._unpack_map(data, pos, code & 0x0f)
+        elif code <= 0x9f:
+            return self._unpack_array(data, pos, code & 0x0f)
+        elif code <= 0xbf:
+            return self._unpack_str(data, pos, code & 0x1f)
+        elif code == 0xc0:
+            return None, pos
+        elif code == 0xc2:
+            return False, pos
+        elif code == 0xc3:
+            return True, pos
+
+        try:
+            kind, unpacker = _VARIABLE_CODES[code]
+        except KeyError:
+            raise ValueError("Unsupported MessagePack type 0x{:x}".format(
+                code))
+
+        value, pos = self._read(data, pos, unpacker)
+        if kind == "value":
+            return value, pos
+        elif kind == "str":
+            return self._unpack_str(data, pos, value)
+        elif kind == "bin":
+            end = pos + value
+            if end > len(data):
+                raise ValueError("Truncated MessagePack data")
+            return bytes(data[pos:end]), end
+        elif kind == "array":
+            return self._unpack_array(data, pos, value)
+        else:
+            return self._unpack_map(data, pos, value)
+
+    def _read(self, data, pos, unpacker):
+        try:
+            value, = unpacker.unpack_from(data, pos)
+        except struct.error:
+            raise ValueError("Truncated MessagePack data")
+        return value, pos + unpacker.size
+
+    def _unpack_str(self, data, pos, length):
+        end = pos + length
+        if end > len(data):
+            raise ValueError("Truncated MessagePack data")
+        return str(data[pos:end], "utf-8"), end
+
+    def _unpack_array(self, data, pos, length):
+        result = []
+        for _ in range(length):
+            value, pos = self._unpack(data, pos)
+            result.append(value)
+        return result, pos
+
+    def _unpack_map(self, data, pos, length):
+        result = {}
+        for _ in range(length):
+            key, pos = self._unpack(data, pos)
+            value, pos = self._unpack(data, pos)
+            try:
+                result[key] = value
+            except TypeError:
+                raise ValueError("Unhashable map key")
+        return result, pos
+
+
+# The type codes followed by a fixed size value or length.
+_VARIABLE_CODES = {
+    0xc4: ("bin", _UINT8),
+    0xc5: ("bin", _UINT16),
+    0xc6: ("bin", _UINT32),
+    0xca: ("value", _FLOAT32),
+    0xcb: ("value", _FLOAT64),
+    0xcc: ("value", _UINT8),
+    0xcd: ("value", _UINT16),
+    0xce: ("value", _UINT32),
+    0xcf: ("value", _UINT64),
+    0xd0: ("value", _INT8),
+    0xd1: ("value", _INT16),
+    0xd2: ("value", _INT32),
+    0xd3: ("value", _INT64),
+    0xd9: ("str", _UINT8),
+    0xda: ("str", _UINT16),
+    0xdb: ("str", _UINT32),
+    0xdc: ("array", _UINT16),
+    0xdd: ("array", _UINT32),
+    0xde: ("map", _UINT16),
+    0xdf: ("map", _UINT32),
+}
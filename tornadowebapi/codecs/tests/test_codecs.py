@@ -0,0 +1,152 @@
+import datetime
+import json
+import unittest
+from unittest import mock
+
+from tornadowebapi.codecs import (
+    JSONCodec, ORJSONCodec, MsgPackCodec, PureMsgPackCodec)
+from tornadowebapi.transports import BasicRESTTransport
+
+
+class CodecTestMixin:
+    def test_round_trip(self):
+        codec = self.make_codec()
+        for obj in [{}, [], {"name": "è", "age": 3, "mass": 1.5},
+                    {"items": {"1": {"tags": ["a", None, True]}}}]:
+            self.assertEqual(codec.decode(codec.encode(obj)), obj)
+
+    def test_script_escape(self):
+        codec = self.make_codec()
+        data = codec.encode({"name": "</script>"})
+        if codec.binary:
+            self.assertIsInstance(data, bytes)
+            data = data.decode("utf-8")
+        else:
+            self.assertIsInstance(data, str)
+
+        self.assertNotIn("</", data)
+        self.assertEqual(json.loads(data), {"name": "</script>"})
+
+    def test_same_semantics(self):
+        codec = self.make_codec()
+        reference = JSONCodec()
+        for obj in [{1: "a"}, {"big": 2**70}, [0.1, -3, "\U0001f600"],
+                    {"a": float("nan"), "b": [float("inf"), None]},
+                    [None, -float("inf")], {"a": None}]:
+            # repr, as NaN is not equal to itself
+            self.assertEqual(repr(codec.decode(codec.encode(obj))),
+                             repr(reference.decode(reference.encode(obj))))
+
+    def test_decode_buffers(self):
+        codec = self.make_codec()
+        data = '{"name": "è"}'.encode("utf-8")
+        for payload in [data, memoryview(data), bytearray(data),
+                        data.decode("utf-8")]:
+            self.assertEqual(codec.decode(payload), {"name": "è"})
+
+        self.assertEqual(str(codec.decode("[NaN]")), "[nan]")
+        self.assertEqual(codec.decode(b"[18446744073709551616]"),
+                         [2**64])
+
+        with self.assertRaises(ValueError):
+            codec.decode(b"{")
+
+
+class TestJSONCodec(CodecTestMixin, unittest.TestCase):
+    def make_codec(self):
+        return JSONCodec()
+
+
+@unittest.skipIf(ORJSONCodec is None, "orjson is not installed")
+class TestORJSONCodec(CodecTestMixin, unittest.TestCase):
+    def make_codec(self):
+        return ORJSONCodec()
+
+    def test_not_default(self):
+        self.assertIsInstance(BasicRESTTransport().codec, JSONCodec)
+
+    def test_unsupported_by_stdlib(self):
+        codec = self.make_codec()
+        with self.assertRaises(TypeError):
+            codec.encode({"when": datetime.datetime.now()})
+
+    def test_long_integers(self):
+        codec = self.make_codec()
+        reference = JSONCodec()
+        codec._fallback = mock.Mock(wraps=reference)
+
+        for data in [b"[18446744073709551616]", b'{"a":-9223372036854775809}',
+                     b'{"a\\"": 12345678901234567890}']:
+            self.assertEqual(codec.decode(data), reference.decode(data))
+        self.assertEqual(codec._fallback.decode.call_count, 3)
+
+        # Not integer tokens, decoded by orjson.
+        codec._fallback.reset_mock()
+        for data in [b"[0.0012345678901234567, 1.5e-12345678901234567890]",
+                     b'{"id": "id-12345678901234567890"}',
+                     b'{"id": "12345678901234567890"}',
+                     b'["a \\" -12345678901234567890"]',
+                     b"[1234567890123456789012.5]"]:
+            self.assertEqual(repr(codec.decode(data)),
+                             repr(reference.decode(data)))
+        self.assertEqual(codec._fallback.decode.call_count, 0)
+
+
+class MsgPackCodecTestMixin:
+    def test_round_trip(self):
+        codec = self.make_codec()
+        values = [None, True, False, 0, 127, 128, 255, 256, 65535, 65536,
+                  2**32, 2**64 - 1, -1, -32, -33, -128, -129, -32768,
+                  -32769, -2**31 - 1, -2**63, 0.5, -1e300, "", "è" * 40,
+                  "x" * 300, "x" * 70000, b"", b"\x00" * 300, [],
+                  list(range(20)), list(range(70000)), {},
+                  {str(i): i for i in range(20)},
+                  {"items": {"1": {"tags": ["a", None], "mass": 12.011}}}]
+        for value in values:
+            encoded = codec.encode(value)
+            self.assertIsInstance(encoded, bytes)
+            self.assertEqual(codec.decode(encoded), value)
+            self.assertEqual(codec.decode(memoryview(encoded)), value)
+
+        self.assertEqual(codec.decode(codec.encode((1, 2))), [1, 2])
+
+    def test_format(self):
+        codec = self.make_codec()
+        self.assertEqual(codec.encode({"a": [1, -1, None, True]}),
+                         b"\x81\xa1a\x94\x01\xff\xc0\xc3")
+        self.assertEqual(codec.encode(1.5),
+                         b"\xcb\x3f\xf8\x00\x00\x00\x00\x00\x00")
+        self.assertEqual(codec.encode(300), b"\xcd\x01\x2c")
+        self.assertEqual(codec.encode(b"ab"), b"\xc4\x02ab")
+        self.assertEqual(codec.decode(b"\xca\x3f\xc0\x00\x00"), 1.5)
+
+    def test_errors(self):
+        codec = self.make_codec()
+        for data in [b"", b"\x92\x01", b"\xa3ab", b"\xcd\x01",
+                     b"\x01\x02", b"\xc1", "\x01"]:
+            with self.assertRaises(ValueError):
+                codec.decode(data)
+
+        with self.assertRaises(TypeError):
+            codec.encode(object())
+
+        with self.assertRaises((TypeError, OverflowError)):
+            codec.encode(2**64)
+
+
+class TestPureMsgPackCodec(MsgPackCodecTestMixin, unittest.TestCase):
+    def make_codec(self):
+        return PureMsgPackCodec()
+
+
+@unittest.skipIf(MsgPackCodec is None, "msgpack is not installed")
+class TestMsgPackCodec(MsgPackCodecTestMixin, unittest.TestCase):
+    def make_codec(self):
+        return MsgPackCodec()
+
+    def test_same_output(self):
+        codec = self.make_codec()
+        pure = PureMsgPackCodec()
+        value = {"items": {"1": {"tags": ["a", None], "mass": 12.011,
+                                 "charge": -2, "big": 2**40}}}
+        self.assertEqual(codec.encode(value), pure.encode(value))
@@ -0,0 +1,60 @@
+from tornado.concurrent import Future
+from tornado.httputil import HTTPConnection
+
+
+class CaptureConnection(HTTPConnection):
+    """An in-process HTTP connection that captures the response
+    written by a request handler, instead of sending it over the network.
+    Used to dispatch the sub-requests of a batch.
+
+    The response is available once the finished future is resolved.
+    """
+    def __init__(self, current_user=None):
+        """Initializes the connection.
+
+        Parameters
+        ----------
+        current_user:
+            The user already authenticated by the request that
+            originated this connection.
+        """
+        self.current_user = current_user
+
+        #: The response status code, headers and body chunks.
+        self.code = None
+        self.reason = None
+        self.headers = None
+        self.chunks = []
+
+        #: Resolved when the handler finishes the response.
+        self.finished = Future()
+
+    @property
+    def body(self):
+        """The captured response body, as bytes."""
+        return b"".join(self.chunks)
+
+    def set_close_callback(self, callback):
+        # The connection is never closed by the client.
+        pass
+
+    def write_headers(self, start_line, headers, chunk=None, callback=None):
+        self.code = start_line.code
+        self.reason = start_line.reason
+        self.headers = headers
+        return self.write(chunk, callback)
+
+    def write(self, chunk, callback=None):
+        if chunk:
+            self.chunks.append(chunk)
+
+        if callback is not None:
+            callback()
+
+        future = Future()
+        future.set_result(None)
+        return future
+
+    def finish(self):
+        if not self.finished.done():
+            self.finished.set_result(None)
@@ -0,0 +1,181 @@
+"""Negotiation, compression and decompression of the HTTP content
+codings supported by the web API: gzip and deflate."""
+import zlib
+
+#: The supported content codings, in order of preference, with the
+#: zlib window bits of their format.
+WBITS = {
+    "gzip": 16 + zlib.MAX_WBITS,
+    "deflate": zlib.MAX_WBITS,
+}
+
+
+def negotiate(accept_encoding, supported=("gzip", "deflate")):
+    """Returns the content coding to use for a response, given the
+    value of the Accept-Encoding request header, or None if the
+    response must not be compressed.
+
+    Parameters
+    ----------
+    accept_encoding: str or None
+        The value of the Accept-Encoding header.
+    supported: sequence of str
+        The codings the server can apply, in order of preference.
+        Used to break ties among equally acceptable codings.
+
+    Returns
+    -------
+    str or None
+    """
+    if not accept_encoding:
+        return None
+
+    qvalues = {}
+    for element in accept_encoding.split(","):
+        coding, _, params = element.partition(";")
+        coding = coding.strip().lower()
+        if coding == "":
+            continue
+
+        qvalue = 1.0
+        params = params.strip().lower()
+        if params.startswith("q="):
+            try:
+                qvalue = float(params[2:])
+            except ValueError:
+                qvalue = 0.0
+        qvalues[coding] = qvalue
+
+    best = None
+    best_qvalue = 0.0
+    for coding in supported:
+        qvalue = qvalues.get(coding, qvalues.get("*", 0.0))
+        if qvalue > best_qvalue:
+            best = coding
+            best_qvalue = qvalue
+
+    return best
+
+
+def compressor(coding, level):
+    """Returns a zlib compression object producing the given
+    content coding, at the given compression level (0-9)."""
+    return zlib.compressobj(level, zlib.DEFLATED, WBITS[coding])
+
+
+def compress(chunks, coding, level):
+    """Compresses a payload.
+
+    Parameters
+    ----------
+    chunks: list of bytes
+        The payload, as a list of chunks. They are not joined.
+    coding: str
+        The content coding, one of WBITS.
+    level: int
+        The compression level, from 0 to 9.
+
+    Returns
+    -------
+    list of bytes
+        The compressed payload chunks.
+    """
+    compressobj = compressor(coding, level)
+    compressed = [compressobj.compress(chunk) for chunk in chunks]
+    compressed.append(compressobj.flush())
+    return [chunk for chunk in compressed if len(chunk) != 0]
+
+
+def decompress(data, coding, max_size=None):
+    """Decompresses a request body.
+
+    Parameters
+    ----------
+    data: bytes
+        The compressed body.
+    coding: str
+        The content coding, one of WBITS.
+    max_size: int or None
+        The maximum size of the decompressed body. None means no limit.
+
+    Returns
+    -------
+    bytes
+        The decompressed body
+
+    Raises
+    ------
+    ValueError:
+        If the data is not valid for the coding, or is truncated.
+    OverflowError:
+        If the decompressed body would be larger than max_size.
+    """
+    decompressor = Decompressor(coding, max_size)
+    result = decompressor.decompress(data)
+    decompressor.flush()
+    return result
+
+
+class Decompressor:
+    """Decompresses a request body received in chunks, enforcing the
+    maximum size of the decompressed data as they are received."""
+
+    def __init__(self, coding, max_size=None):
+        """Initializes the decompressor.
+
+        Parameters
+        ----------
+        coding: str
+            The content coding, one of WBITS.
+        max_size: int or None
+            The maximum size of the decompressed body. None means no limit.
+        """
+        self.coding = coding
+        self.max_size = max_size
+
+        #: The number of decompressed bytes produced so far.
+        self.size = 0
+
+        self._decompressobj = zlib.decompressobj(WBITS[coding])
+
+    def decompress(self, chunk):
+        """Decompresses the next chunk of the body.
+
+        Returns
+        -------
+        bytes
+            The decompressed data available so far.
+
+        Raises
+        ------
+        ValueError:
+            If the data is not valid for the coding.
+        OverflowError:
+            If the decompressed body would be larger than max_size.
+        """
+        try:
+            if self.max_size is None:
+                result = self._decompressobj.decompress(chunk)
+            else:
+                result = self._decompressobj.decompress(
+                    chunk, self.max_size - self.size + 1)
+        except zlib.error as e:
+            raise ValueError("Invalid {} data: {}".format(self.coding, e))
+
+        self.size += len(result)
+        if self.max_size is not None and self.size > self.max_size:
+            raise OverflowError(
+                "Decompressed data exceeds {} bytes".format(self.max_size))
+
+        return result
+
+    def flush(self):
+        """Checks that the whole body has been received.
+
+        Raises
+        ------
+        ValueError:
+            If the data is truncated.
+        """
+        if not self._decompressobj.eof:
+            raise ValueError("Truncated {} data".format(self.coding))
@@ -2,11 +2,15 @@
 OK = 200
 CREATED = 201
 NO_CONTENT = 204
+MULTI_STATUS = 207
+
+NOT_MODIFIED = 304
 
 BAD_REQUEST = 400
 NOT_FOUND = 404
 METHOD_NOT_ALLOWED = 405
 CONFLICT = 409
+REQUEST_ENTITY_TOO_LARGE = 413
 UNSUPPORTED_MEDIA_TYPE = 415
 UNPROCESSABLE_ENTITY = 422
 
@@ -0,0 +1,78 @@
+"""Parsing of the media types in the Content-Type and Accept headers,
+for the negotiation of the transports."""
+
+
+def media_type(content_type):
+    """Returns the media type of a Content-Type header value, in lower
+    case and without parameters, e.g. "application/json" for
+    "application/json; charset=UTF-8". Returns None if content_type is
+    None or empty."""
+    if not content_type:
+        return None
+
+    return content_type.partition(";")[0].strip().lower() or None
+
+
+def parse_accept(accept):
+    """Parses the value of an Accept header.
+
+    Parameters
+    ----------
+    accept: str
+        The header value
+
+    Returns
+    -------
+    list
+        A list of (media range, quality) pairs, in the header order.
+        Media ranges are in lower case. Invalid qualities are taken as 0.
+    """
+    ranges = []
+    for element in accept.split(","):
+        params = element.split(";")
+        media_range = params[0].strip().lower()
+        if media_range == "":
+            continue
+
+        if media_range == "*":
+            # Non-standard abbreviation of */*
+            media_range = "*/*"
+
+        quality = 1.0
+        for param in params[1:]:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value.strip())
+                except ValueError:
+                    quality = 0.0
+
+        ranges.append((media_range, quality))
+
+    return ranges
+
+
+def quality(media_type, ranges):
+    """Returns the quality with which a media type is accepted, given
+    the media ranges of an Accept header, as returned by parse_accept().
+    The most specific matching range applies. Returns 0 if the media
+    type is not accepted."""
+    type_range = media_type.partition("/")[0] + "/*"
+
+    best_specificity = -1
+    best_quality = 0.0
+    for media_range, range_quality in ranges:
+        if media_range == media_type:
+            specificity = 2
+        elif media_range == type_range:
+            specificity = 1
+        elif media_range == "*/*":
+            specificity = 0
+        else:
+            continue
+
+        if specificity > best_specificity:
+            best_specificity = specificity
+            best_quality = range_quality
+
+    return best_quality
@@ -7,14 +7,15 @@ class PayloadedHTTPError(HTTPError):
                  content_type=None,
                  log_message=None,
                  *args, **kwargs):
-        """Provides a HTTPError that contains a string payload to output
+        """Provides a HTTPError that contains a payload to output
         as a response. If the payload is None, behaves like a regular
         HTTPError, producing no payload in the response.
 
         Parameters
         ----------
-        payload: str or None
-            The payload as a string
+        payload: str, bytes, list of bytes, or None
+            The payload as a string, as bytes, or as a list of bytes
+            chunks. Bytes are output as they are, without copying.
         content_type: str or None
             The content type of the payload
         log_message: str or None
@@ -23,8 +24,11 @@ class PayloadedHTTPError(HTTPError):
         super().__init__(status_code, log_message, *args, **kwargs)
 
         if payload is not None:
-            if not isinstance(payload, str):
-                raise ValueError("payload must be a string.")
+            if not (isinstance(payload, (str, bytes)) or (
+                    isinstance(payload, list) and
+                    all(isinstance(chunk, bytes) for chunk in payload))):
+                raise ValueError(
+                    "payload must be a string, bytes or a list of bytes.")
 
             if content_type is None:
                 content_type = "text/plain"
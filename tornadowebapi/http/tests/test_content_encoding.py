@@ -0,0 +1,51 @@
+import gzip
+import unittest
+import zlib
+
+from tornadowebapi.http import content_encoding
+
+
+class TestContentEncoding(unittest.TestCase):
+    def test_negotiate(self):
+        negotiate = content_encoding.negotiate
+        self.assertIsNone(negotiate(None))
+        self.assertIsNone(negotiate(""))
+        self.assertIsNone(negotiate("identity"))
+        self.assertIsNone(negotiate("br, gzip;q=0"))
+        self.assertEqual(negotiate("gzip"), "gzip")
+        self.assertEqual(negotiate("deflate, gzip"), "gzip")
+        self.assertEqual(negotiate("deflate, GZIP;q=0.5"), "deflate")
+        self.assertEqual(negotiate("*"), "gzip")
+        self.assertEqual(negotiate("*;q=0.1, deflate;q=0.2"), "deflate")
+        self.assertEqual(negotiate("gzip;q=bad, deflate"), "deflate")
+        self.assertEqual(negotiate("gzip", supported=("deflate",)), None)
+
+    def test_compress(self):
+        chunks = [b'{"a": ', b"1" * 1000, b"}"]
+        data = b"".join(chunks)
+
+        compressed = content_encoding.compress(chunks, "gzip", 6)
+        self.assertEqual(gzip.decompress(b"".join(compressed)), data)
+
+        compressed = content_encoding.compress(chunks, "deflate", 9)
+        self.assertEqual(zlib.decompress(b"".join(compressed)), data)
+
+    def test_decompress(self):
+        data = b"x" * 1000
+        for coding in ["gzip", "deflate"]:
+            compressed = b"".join(
+                content_encoding.compress([data], coding, 6))
+
+            self.assertEqual(
+                content_encoding.decompress(compressed, coding), data)
+            self.assertEqual(
+                content_encoding.decompress(compressed, coding, 1000), data)
+
+            with self.assertRaises(OverflowError):
+                content_encoding.decompress(compressed, coding, 999)
+
+            with self.assertRaises(ValueError):
+                content_encoding.decompress(compressed[:-5], coding)
+
+            with self.assertRaises(ValueError):
+                content_encoding.decompress(b"whatever", coding)
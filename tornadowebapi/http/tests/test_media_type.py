@@ -0,0 +1,26 @@
+import unittest
+
+from tornadowebapi.http.media_type import media_type, parse_accept, quality
+
+
+class TestMediaType(unittest.TestCase):
+    def test_media_type(self):
+        self.assertIsNone(media_type(None))
+        self.assertIsNone(media_type(""))
+        self.assertEqual(media_type("application/json"), "application/json")
+        self.assertEqual(media_type("Application/JSON ; charset=UTF-8"),
+                         "application/json")
+
+    def test_parse_accept(self):
+        self.assertEqual(parse_accept(""), [])
+        self.assertEqual(
+            parse_accept("text/html, application/*;level=1;q=0.5, *;q=x"),
+            [("text/html", 1.0), ("application/*", 0.5), ("*/*", 0.0)])
+
+    def test_quality(self):
+        ranges = parse_accept(
+            "application/msgpack;q=0.2, application/*;q=0.5, */*;q=0.1")
+        self.assertEqual(quality("application/msgpack", ranges), 0.2)
+        self.assertEqual(quality("application/json", ranges), 0.5)
+        self.assertEqual(quality("text/html", ranges), 0.1)
+        self.assertEqual(quality("text/html", parse_accept("image/png")), 0)
@@ -25,3 +25,15 @@ class TestPayloadedHTTPError(unittest.TestCase):
         payloaded = PayloadedHTTPError(500, payload="hello")
         self.assertEqual(payloaded.content_type, "text/plain")
         self.assertEqual(payloaded.status_code, 500)
+
+    def test_bytes_payload(self):
+        chunks = [b"hel", b"lo"]
+        payloaded = PayloadedHTTPError(500, payload=chunks)
+        self.assertIs(payloaded.payload, chunks)
+
+        payloaded = PayloadedHTTPError(500, payload=b"hello")
+        self.assertEqual(payloaded.payload, b"hello")
+        self.assertEqual(payloaded.content_type, "text/plain")
+
+        with self.assertRaises(ValueError):
+            PayloadedHTTPError(500, payload=[b"hello", "world"])
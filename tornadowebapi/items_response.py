@@ -1,7 +1,17 @@
+import builtins
 import copy
 
+from tornado import gen
 from tornadowebapi.resource import Resource
-from traitlets import HasTraits, List, Int, Type
+from traitlets import HasTraits, List, Int, Type, Any, Enum
+
+# Not available before python 3.5, where no asynchronous iterator
+# can be passed anyway.
+_StopAsyncIteration = getattr(builtins, "StopAsyncIteration", StopIteration)
+
+#: The accepted values for the total query argument and
+#: ItemsResponse.total_mode
+TOTAL_MODES = ("exact", "estimate", "none")
 
 
 class ItemsResponse(HasTraits):
@@ -16,8 +26,25 @@ class ItemsResponse(HasTraits):
     #: store.
     offset = Int(0, min=0)
 
-    #: The total number of items available.
-    total = Int(0, min=0)
+    #: The total number of items available. None if not computed, according
+    #: to the total_mode.
+    total = Int(0, min=0, allow_none=True)
+
+    #: How the total has been obtained: "exact" if it's the actual number
+    #: of items, "estimate" if it's an approximation, "none" if it has not
+    #: been computed at all.
+    total_mode = Enum(TOTAL_MODES, "exact")
+
+    #: For cursor pagination, the sort key of the last returned item,
+    #: from which the next page starts. None if there are no more items.
+    #: It must be serializable by the transport. The web handler replaces
+    #: it with an opaque signed token before sending it to the client,
+    #: who passes it back as the cursor query argument.
+    next_cursor = Any(None, allow_none=True)
+
+    #: When specific items are requested by identifier, the requested
+    #: identifiers that have not been found. None otherwise.
+    missing = List(default_value=None, allow_none=True)
 
     #: The type to check for the items. None means any type.
     _type = Type(klass=Resource, allow_none=True)
@@ -32,9 +59,20 @@ class ItemsResponse(HasTraits):
             A Resource
         """
         self._type = type
+        self._stream = None
+        self._stream_total = None
+        self._iterator = None
+        self._fetched = 0
         super().__init__(**kwargs)
 
-    def set(self, lst, offset=None, total=None):
+    @property
+    def is_streamed(self):
+        """True if the items are produced incrementally by an iterator
+        set with set_stream()."""
+        return self._stream is not None
+
+    def set(self, lst, offset=None, total=None, next_cursor=None,
+            total_mode="exact"):
         """Sets the content of the object from a list.
 
         Parameters
@@ -51,6 +89,14 @@ class ItemsResponse(HasTraits):
             the total number of items, for a partial response. If None, it will
             default to the length of the passed list.
 
+        next_cursor: any or None
+            The sort key from which the next page starts, for cursor
+            pagination. None if there are no more items.
+
+        total_mode: str
+            One of "exact", "estimate" or "none". With "none", the total is
+            not reported and the passed total is ignored.
+
         Raises
         ------
         TypeError
@@ -62,7 +108,133 @@ class ItemsResponse(HasTraits):
         self._check_list_types(self.items)
 
         self.offset = 0 if offset is None else offset
-        self.total = len(self.items) if total is None else total
+        self.total_mode = total_mode
+        if total_mode == "none":
+            self.total = None
+        else:
+            self.total = len(self.items) if total is None else total
+        self.next_cursor = next_cursor
+
+    def set_stream(self, iterable, offset=None, total=None,
+                   next_cursor=None, total_mode="exact"):
+        """Sets the content of the object from an iterable, such as a
+        generator, or an asynchronous iterable, such as a database cursor.
+        The items are not consumed here. They are pulled by the web handler
+        as the response is produced.
+
+        Parameters
+        ----------
+        iterable: iterable or asynchronous iterable
+            The source of the items of the response.
+
+        offset: int or None
+            The offset of the data, for partial responses. If None, it will
+            be zero by default
+
+        total: int or None
+            the total number of items, for a partial response. If None, it
+            will be set to the number of produced items once the iterable
+            is exhausted.
+
+        next_cursor: any or None
+            The sort key from which the next page starts, for cursor
+            pagination. It can also be assigned while the iterable is
+            consumed.
+
+        total_mode: str
+            One of "exact", "estimate" or "none". With "none", the total is
+            not reported and the passed total is ignored.
+        """
+        self.items = []
+        self._stream = iterable
+        self._stream_total = total
+        self._iterator = None
+        self._fetched = 0
+
+        self.offset = 0 if offset is None else offset
+        self.total_mode = total_mode
+        if total_mode == "none":
+            self.total = None
+        elif total is not None:
+            self.total = total
+        self.next_cursor = next_cursor
+
+    @gen.coroutine
+    def fetch_next(self, batch_size):
+        """Returns the next batch of items, of at most batch_size entries.
+        An empty list means that there are no more items.
+        For a streamed response, the total is finalised when the stream is
+        exhausted. For a response set from a list, the batches are taken
+        from the items.
+
+        Raises
+        ------
+        TypeError
+            If the type of the elements do not match with the declared type.
+        """
+        source = self._stream if self.is_streamed else self.items
+        if self._iterator is None:
+            if hasattr(source, "__aiter__"):
+                self._iterator = source.__aiter__()
+            else:
+                self._iterator = iter(source)
+
+        iterator = self._iterator
+        is_async = hasattr(iterator, "__anext__")
+
+        batch = []
+        while len(batch) < batch_size:
+            try:
+                if is_async:
+                    item = yield iterator.__anext__()
+                else:
+                    item = next(iterator)
+            except (StopIteration, _StopAsyncIteration):
+                if (self.is_streamed and
+                        self._stream_total is None and
+                        self.total_mode != "none"):
+                    self.total = self._fetched + len(batch)
+                break
+
+            batch.append(item)
+
+        self._check_list_types(batch)
+        self._fetched += len(batch)
+        return batch
+
+    @gen.coroutine
+    def fetch_all(self):
+        """Consumes a streamed response, storing all the items
+        in self.items. Does nothing if the response is not streamed."""
+        if not self.is_streamed:
+            return
+
+        items = []
+        while True:
+            batch = yield self.fetch_next(1000)
+            if len(batch) == 0:
+                break
+            items.extend(batch)
+
+        self._stream = None
+        self._iterator = None
+        self.items = items
+
+    @gen.coroutine
+    def fetch_total(self):
+        """Consumes a streamed response without storing its items, when
+        needed to know the total, i.e. if it has not been passed to
+        set_stream(). Does nothing if the response is not streamed, or
+        its total_mode is "none"."""
+        if (not self.is_streamed or
+                self._stream_total is not None or
+                self.total_mode == "none"):
+            return
+
+        while True:
+            batch = yield self.fetch_next(1000)
+            if len(batch) == 0:
+                break
 
     def _check_list_types(self, l):
         """Checks the list types to verify if they are all
@@ -0,0 +1,55 @@
+import hashlib
+
+from tornado import escape
+
+from .http import content_encoding
+
+
+class JSAPIBundle:
+    """The rendered JavaScript API, ready to be served: the body,
+    its gzip compressed variant, and their strong ETags.
+    Bundles are cached by the Registry."""
+
+    def __init__(self, source, minify=False):
+        """Initializes the bundle.
+
+        Parameters
+        ----------
+        source: str or bytes
+            The rendered JavaScript source.
+        minify: bool
+            If True, the source is minified.
+        """
+        source = escape.to_unicode(source)
+        if minify:
+            source = minify_js(source)
+
+        #: The JavaScript source, as UTF-8 bytes.
+        self.body = escape.utf8(source)
+
+        #: The body, compressed with gzip.
+        self.gzip_body = b"".join(
+            content_encoding.compress([self.body], "gzip", 9))
+
+        #: The strong ETag of the body, including the quotes.
+        self.etag = '"{}"'.format(hashlib.sha1(self.body).hexdigest())
+
+        #: The strong ETag of the compressed body, which must differ from
+        #: the one of the body, as a different representation.
+        self.gzip_etag = '"{}-gzip"'.format(
+            hashlib.sha1(self.body).hexdigest())
+
+
+def minify_js(source):
+    """Performs a conservative minification of JavaScript source:
+    removes the indentation, the empty lines and the lines containing
+    only a // comment. Line breaks are kept, so that the automatic
+    semicolon insertion is not affected."""
+    lines = []
+    for line in source.splitlines():
+        line = line.strip()
+        if len(line) == 0 or line.startswith("//"):
+            continue
+        lines.append(line)
+
+    return "\n".join(lines) + "\n"
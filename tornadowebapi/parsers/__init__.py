@@ -1 +1,2 @@
 from .json_parser import JSONParser  # noqa
+from .msgpack_parser import MsgPackParser  # noqa
@@ -13,9 +13,11 @@ class BaseParser(metaclass=abc.ABCMeta):
 
         Parameters
         ----------
-        payload: string or None
+        payload: bytes, bytearray, memoryview, string or None
             The payload coming from the HTTP request. Can be None if there
-            is no payload
+            is no payload. Parsers should accept the bytes of the request
+            body, also in a bytearray or a memoryview, without requiring
+            a conversion to string.
 
         Returns
         -------
@@ -23,3 +25,55 @@ class BaseParser(metaclass=abc.ABCMeta):
             The dictionary extracted from the payload. If the payload is None,
             the result is None.
         """
+
+    def incremental(self):
+        """Returns an IncrementalParser, to parse a payload received
+        in chunks, e.g. a request body as it arrives from the network.
+
+        The default implementation accumulates the chunks in a single
+        buffer, and parses it with parse() when closed. Parsers able to
+        decode the chunks as they arrive can reimplement this method.
+        """
+        return BufferedIncrementalParser(self)
+
+
+class IncrementalParser(metaclass=abc.ABCMeta):
+    """Parses a payload received in chunks."""
+
+    @abc.abstractmethod
+    def feed(self, chunk):
+        """Feeds the next chunk of the payload.
+
+        Parameters
+        ----------
+        chunk: bytes
+            The chunk of the payload.
+        """
+
+    @abc.abstractmethod
+    def close(self):
+        """Signals that the whole payload has been fed, and returns
+        the result of its parsing, as BaseParser.parse()."""
+
+
+class BufferedIncrementalParser(IncrementalParser):
+    """Accumulates the chunks in a single buffer, without keeping
+    them individually, and parses the buffer when closed."""
+
+    def __init__(self, parser):
+        """Initializes the incremental parser.
+
+        Parameters
+        ----------
+        parser: BaseParser
+            The parser of the whole payload.
+        """
+        self.parser = parser
+        self._buffer = bytearray()
+
+    def feed(self, chunk):
+        self._buffer += chunk
+
+    def close(self):
+        buffer, self._buffer = self._buffer, None
+        return self.parser.parse(buffer)
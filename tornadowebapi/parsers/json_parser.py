@@ -1,14 +1,26 @@
-from tornado import escape
+from tornadowebapi.codecs import JSONCodec
 from tornadowebapi.exceptions import BadRepresentation
 from .base_parser import BaseParser
 
 
 class JSONParser(BaseParser):
+    def __init__(self, codec=None):
+        """Initializes the parser.
+
+        Parameters
+        ----------
+        codec: BaseCodec or None
+            The JSON codec decoding the payload. If None, JSONCodec.
+        """
+        if codec is None:
+            codec = JSONCodec()
+        self.codec = codec
+
     def parse(self, payload):
         if payload is None:
             return None
 
         try:
-            return escape.json_decode(payload)
+            return self.codec.decode(payload)
         except Exception:
             raise BadRepresentation("Passed payload is not valid JSON")
@@ -0,0 +1,27 @@
+from tornadowebapi.codecs import default_msgpack_codec
+from tornadowebapi.exceptions import BadRepresentation
+from .base_parser import BaseParser
+
+
+class MsgPackParser(BaseParser):
+    def __init__(self, codec=None):
+        """Initializes the parser.
+
+        Parameters
+        ----------
+        codec: BaseCodec or None
+            The MessagePack codec decoding the payload. If None, the
+            fastest available, as by default_msgpack_codec().
+        """
+        if codec is None:
+            codec = default_msgpack_codec()
+        self.codec = codec
+
+    def parse(self, payload):
+        if payload is None:
+            return None
+
+        try:
+            return self.codec.decode(payload)
+        except Exception:
+            raise BadRepresentation("Passed payload is not valid MessagePack")
@@ -16,9 +16,35 @@ class TestJSONParser(unittest.TestCase):
         with self.assertRaises(BadRepresentation):
             parser.parse(3)
 
+    def test_bytes(self):
+        parser = JSONParser()
+        payload = '{"name": "\u00e8"}'.encode("utf-8")
+        self.assertEqual(parser.parse(payload), {"name": "\u00e8"})
+        self.assertEqual(parser.parse(memoryview(payload)),
+                         {"name": "\u00e8"})
+        self.assertEqual(parser.parse(bytearray(payload)),
+                         {"name": "\u00e8"})
+
+        with self.assertRaises(BadRepresentation):
+            parser.parse(b"\xff")
+
     def test_parser_renderer(self):
         parser = JSONParser()
         renderer = JSONRenderer()
 
         for entity in [{}, None]:
             self.assertEqual(entity, parser.parse(renderer.render(entity)))
+
+    def test_incremental(self):
+        parser = JSONParser()
+        payload = '{"name": "è"}'.encode("utf-8")
+
+        incremental = parser.incremental()
+        for i in range(len(payload)):
+            incremental.feed(payload[i:i + 1])
+        self.assertEqual(incremental.close(), {"name": "è"})
+
+        incremental = parser.incremental()
+        incremental.feed(payload[:5])
+        with self.assertRaises(BadRepresentation):
+            incremental.close()
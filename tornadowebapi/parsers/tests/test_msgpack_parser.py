@@ -0,0 +1,24 @@
+import unittest
+
+from tornadowebapi.exceptions import BadRepresentation
+from tornadowebapi.parsers import MsgPackParser
+from tornadowebapi.renderers import MsgPackRenderer
+
+
+class TestMsgPackParser(unittest.TestCase):
+    def test_basic_functionality(self):
+        parser = MsgPackParser()
+        self.assertEqual(parser.parse(b"\x80"), {})
+        self.assertEqual(parser.parse(None), None)
+        with self.assertRaises(BadRepresentation):
+            parser.parse(b"\xc1")
+
+        with self.assertRaises(BadRepresentation):
+            parser.parse("{}")
+
+    def test_parser_renderer(self):
+        parser = MsgPackParser()
+        renderer = MsgPackRenderer()
+
+        for entity in [{}, None, {"x": [0.1, 0.2], "name": "</script>"}]:
+            self.assertEqual(entity, parser.parse(renderer.render(entity)))
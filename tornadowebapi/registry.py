@@ -1,12 +1,25 @@
+import re
+
 from .web_handlers import (
+    BatchWebHandler,
     WithIdentifierWebHandler,
     WithoutIdentifierWebHandler,
+    StreamedWithIdentifierWebHandler,
+    StreamedWithoutIdentifierWebHandler,
     JSAPIWebHandler)
 
 from .transports import BasicRESTTransport
 from .utils import url_path_join, with_end_slash
 from .resource_handler import ResourceHandler
 from .authenticator import NullAuthenticator
+from .coalescer import Coalescer
+from .jsapi_bundle import JSAPIBundle
+from .http.media_type import media_type, parse_accept, quality
+from .response_cache import ResponseCache
+
+#: The resource class names that cannot be registered, as they are used
+#: by the JavaScript API.
+RESERVED_CLASS_NAMES = ("batch",)
 
 
 class Registry:
@@ -20,14 +33,53 @@ class Registry:
 
     A registry is normally instantiated and held on the
     Tornado Application.
+
+    The registry can hold multiple transports. The one used for each
+    request is negotiated from the Content-Type header for the request
+    body, and the Accept header for the response.
     """
 
+    #: The maximum number of distinct Accept headers whose negotiated
+    #: transport is remembered.
+    max_negotiated_accepts = 256
+
     def __init__(self, transport=None):
         self._registered_handlers = {}
         self._authenticator = NullAuthenticator
         if transport is None:
             transport = BasicRESTTransport()
-        self._transport = transport
+
+        # The transports in order of preference. The first is the default.
+        self._transports = []
+        self._transports_by_media_type = {}
+
+        # The transport negotiated for an Accept header value.
+        self._negotiated = {}
+
+        self.add_transport(transport)
+        self._coalescer = Coalescer()
+        self._response_cache = ResponseCache()
+
+        # The JSAPIBundle, by (base_urlpath, api_version, minify).
+        self._jsapi_bundles = {}
+
+        # The shared instances of the stateless handlers, by name.
+        self._stateless_handlers = {}
+
+        # True once the api handlers have been returned. The routes to
+        # the streamed web handlers are fixed from then on.
+        self._routed = False
+
+        #: If True, the responses of the web handlers carry a
+        #: Server-Timing header, with the duration of each stage of the
+        #: processing of the request, as measured by a Timer.
+        self.server_timing = False
+
+        #: If not None, a callable invoked when each request of the web
+        #: handlers is finished, with the web handler and the durations
+        #: of the stages, as the Timer.durations dictionary.
+        #: Enables the timing of the stages, as server_timing does.
+        self.timing_observer = None
 
     @property
     def authenticator(self):
@@ -39,8 +91,93 @@ class Registry:
 
     @property
     def transport(self):
-        """Returns the current transport."""
-        return self._transport
+        """Returns the default transport."""
+        return self._transports[0]
+
+    @property
+    def transports(self):
+        """Returns the transports, in order of preference.
+        The first is the default."""
+        return tuple(self._transports)
+
+    def add_transport(self, transport):
+        """Adds a transport, with lower preference than the ones already
+        present.
+
+        Parameters
+        ----------
+        transport: BaseTransport
+            The transport to add
+
+        Raises
+        ------
+        ValueError:
+            if a transport with the same content type is already present.
+        """
+        content_type = media_type(transport.content_type)
+        if content_type in self._transports_by_media_type:
+            raise ValueError(
+                "A transport for {} is already present".format(
+                    content_type))
+
+        self._transports.append(transport)
+        self._transports_by_media_type[content_type] = transport
+        self._negotiated.clear()
+
+    def request_transport(self, content_type):
+        """Returns the transport to parse a request body, given the
+        value of its Content-Type header. The default transport is
+        returned if none matches."""
+        transport = self._transports_by_media_type.get(content_type)
+        if transport is not None:
+            return transport
+
+        return self._transports_by_media_type.get(
+            media_type(content_type), self._transports[0])
+
+    def response_transport(self, accept):
+        """Returns the transport to render a response, given the value
+        of the Accept header of the request. The most acceptable one is
+        returned, preferring the earliest added on ties, or the default
+        transport if none is acceptable."""
+        if not accept or len(self._transports) == 1:
+            return self._transports[0]
+
+        transport = self._negotiated.get(accept)
+        if transport is None:
+            transport = self._negotiate(accept)
+            if len(self._negotiated) >= self.max_negotiated_accepts:
+                self._negotiated.clear()
+            self._negotiated[accept] = transport
+
+        return transport
+
+    def _negotiate(self, accept):
+        """Chooses the transport for an Accept header value."""
+        ranges = parse_accept(accept)
+
+        best = self._transports[0]
+        best_quality = 0.0
+        for transport in self._transports:
+            transport_quality = quality(media_type(transport.content_type),
+                                        ranges)
+            if transport_quality > best_quality:
+                best = transport
+                best_quality = transport_quality
+
+        return best
+
+    @property
+    def coalescer(self):
+        """Returns the coalescer of concurrent identical reads, for
+        the resource handlers that enable coalesce_reads."""
+        return self._coalescer
+
+    @property
+    def response_cache(self):
+        """Returns the cache of GET responses, for the resource
+        handlers that enable it with cache_ttl."""
+        return self._response_cache
 
     @property
     def registered_handlers(self):
@@ -63,12 +200,24 @@ class Registry:
         ------
         TypeError:
             if typ is not a subclass of Resource
+        ValueError:
+            if the name is already in use, or reserved: the URL
+            _batch/ is the batch endpoint, and the JavaScript API exports
+            the batch function beside the resource classes. Also if the
+            handler receives the request bodies in streaming, and the api
+            handlers have already been returned without a route for it.
         """
         if handler is None or not issubclass(handler, ResourceHandler):
             raise TypeError("handler must be a subclass of ResourceHandler")
 
         name = handler.bound_name()
 
+        if (name == "_batch" or
+                handler.resource_class.__name__ in RESERVED_CLASS_NAMES):
+            raise ValueError(
+                "Class {} cannot be registered, as its name is "
+                "reserved".format(handler.resource_class.__name__))
+
         if name in self._registered_handlers:
             raise ValueError(
                 "Name {} is already in use by "
@@ -78,7 +227,77 @@ class Registry:
                     handler.__name__
                 ))
 
+        if self._routed and handler.streams_request_body():
+            raise ValueError(
+                "Class {} receives the request bodies in streaming, so it "
+                "must be registered before the api handlers are "
+                "created".format(handler.__name__))
+
         self._registered_handlers[name] = handler
+        self._jsapi_bundles.clear()
+
+    def resource_handler(self, collection_name, application, current_user):
+        """Returns the resource handler serving a request on the given
+        collection. Stateless handlers are created once, and the same
+        instance is returned for all requests. Otherwise, a new instance
+        is created for every call.
+
+        Parameters
+        ----------
+        collection_name: str
+            The name of the collection
+        application: web.Application
+            The tornado web application
+        current_user:
+            The user performing the request. Not passed to the
+            constructor of stateless handlers.
+
+        Raises
+        ------
+        KeyError:
+            if no handler is registered for the collection name
+        """
+        handler_class = self._registered_handlers[collection_name]
+        if not handler_class.stateless:
+            return handler_class(application=application,
+                                 current_user=current_user)
+
+        handler = self._stateless_handlers.get(collection_name)
+        if handler is None or handler.application is not application:
+            handler = handler_class(application=application,
+                                    current_user=None)
+            self._stateless_handlers[collection_name] = handler
+
+        return handler
+
+    def jsapi_bundle(self, base_urlpath, api_version, minify, render):
+        """Returns the JavaScript API bundle for the given parameters.
+        It is rendered only the first time, and until a new handler is
+        registered.
+
+        Parameters
+        ----------
+        base_urlpath: str
+            The base url path of the API
+        api_version: str
+            The version of the API
+        minify: bool
+            If the bundle must be minified
+        render: callable
+            Called without arguments to render the JavaScript source,
+            if the bundle is not available.
+
+        Returns
+        -------
+        JSAPIBundle
+        """
+        key = (base_urlpath, api_version, minify)
+        bundle = self._jsapi_bundles.get(key)
+        if bundle is None:
+            bundle = JSAPIBundle(render(), minify=minify)
+            self._jsapi_bundles[key] = bundle
+
+        return bundle
 
     def __getitem__(self, collection_name):
         """Returns the class from the collection name with the
@@ -106,6 +325,16 @@ class Registry:
         -----
         The current implementation does not support multiple API versions yet.
         The version option is only provided for futureproofing.
+
+        The handlers include a batch endpoint at api/<version>/_batch/,
+        executing multiple requests to the resources in a single
+        round trip.
+
+        The collections whose resource handler receives the request
+        bodies in streaming are routed to dedicated web handlers. They
+        must be registered before calling this method. The request
+        bodies of the other collections are buffered whole, and available
+        to the authenticator.
         """
         init_args = dict(
             registry=self,
@@ -113,7 +342,37 @@ class Registry:
             api_version=version,
         )
 
+        streamed = []
+        for name, handler in self._registered_handlers.items():
+            if not handler.streams_request_body():
+                continue
+
+            collection = "({})".format(re.escape(name))
+            streamed += [
+                (with_end_slash(
+                    url_path_join(base_urlpath, "api", version,
+                                  collection, "([^/]*)")),
+                 StreamedWithIdentifierWebHandler,
+                 init_args
+                 ),
+                (with_end_slash(
+                    url_path_join(base_urlpath, "api", version,
+                                  collection)),
+                 StreamedWithoutIdentifierWebHandler,
+                 init_args
+                 ),
+            ]
+
+        self._routed = True
+
         return [
+            # Must precede the resource handlers, which would match it.
+            (with_end_slash(
+                url_path_join(base_urlpath, "api", version, "_batch")),
+             BatchWebHandler,
+             init_args
+             ),
+        ] + streamed + [
             (with_end_slash(
                 url_path_join(base_urlpath, "api", version, "(.*)", "(.*)")),
              WithIdentifierWebHandler,
@@ -1 +1,2 @@
 from .json_renderer import JSONRenderer  # noqa
+from .msgpack_renderer import MsgPackRenderer  # noqa
@@ -2,6 +2,10 @@ import abc
 
 
 class BaseRenderer(metaclass=abc.ABCMeta):
+    #: True if the renderer implements the render_stream methods.
+    #: Otherwise, streamed collections are rendered at once.
+    streaming = False
+
     @abc.abstractmethod
     def render(self, representation):
         """
@@ -20,9 +24,60 @@ class BaseRenderer(metaclass=abc.ABCMeta):
 
         Returns
         -------
-        string or None
+        string, bytes, list of bytes, or None
             If there is a rendered representation for the passed dict
-            representation, it returns it.
+            representation, it returns it. Renderers producing UTF-8
+            natively should return bytes, or a list of bytes chunks,
+            which are written to the response without further copies.
             It can return None when the passed representation produces no
             payload. Typically this happens when representation is None.
         """
+
+    def render_stream_open(self, key):
+        """Renders the beginning of a streamed envelope, up to the
+        opening of the mapping that will contain the items under the
+        given key.
+
+        Parameters
+        ----------
+        key: str
+            The envelope key of the items mapping.
+
+        Returns
+        -------
+        string or bytes
+        """
+        raise NotImplementedError()
+
+    def render_stream_item(self, key, representation, first):
+        """Renders a single entry of the streamed items mapping.
+
+        Parameters
+        ----------
+        key: str
+            The key of the item in the mapping.
+        representation: dict
+            The item representation.
+        first: bool
+            True if this is the first item of the mapping.
+
+        Returns
+        -------
+        string or bytes
+        """
+        raise NotImplementedError()
+
+    def render_stream_close(self, envelope):
+        """Renders the closing of the items mapping, followed by the
+        remaining members of the envelope.
+
+        Parameters
+        ----------
+        envelope: dict
+            The envelope members, excluding the items.
+
+        Returns
+        -------
+        string or bytes
+        """
+        raise NotImplementedError()
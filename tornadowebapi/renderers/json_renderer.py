@@ -1,11 +1,52 @@
-from tornado import escape
-
+from tornadowebapi.codecs import JSONCodec
 from .base_renderer import BaseRenderer
 
 
 class JSONRenderer(BaseRenderer):
+    streaming = True
+
+    def __init__(self, codec=None):
+        """Initializes the renderer.
+
+        Parameters
+        ----------
+        codec: BaseCodec or None
+            The JSON codec encoding the representations. If None,
+            JSONCodec, rendering strings. Binary codecs render bytes.
+        """
+        if codec is None:
+            codec = JSONCodec()
+        self.codec = codec
+
     def render(self, representation):
         if representation is not None:
-            return escape.json_encode(representation)
+            return self.codec.encode(representation)
 
         return None
+
+    def render_stream_open(self, key):
+        return self._join("{", self.codec.encode(key), ": {")
+
+    def render_stream_item(self, key, representation, first):
+        return self._join("" if first else ", ",
+                          self.codec.encode(key),
+                          ": ",
+                          self.codec.encode(representation))
+
+    def render_stream_close(self, envelope):
+        parts = ["}"]
+        for key, value in envelope.items():
+            parts.extend([", ", self.codec.encode(key),
+                          ": ", self.codec.encode(value)])
+        parts.append("}")
+        return self._join(*parts)
+
+    def _join(self, *parts):
+        """Joins the literal separators with the encoded parts,
+        as bytes if the codec is binary."""
+        if not self.codec.binary:
+            return "".join(parts)
+
+        return b"".join(
+            part.encode("utf-8") if isinstance(part, str) else part
+            for part in parts)
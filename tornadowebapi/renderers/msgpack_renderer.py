@@ -0,0 +1,27 @@
+from tornadowebapi.codecs import default_msgpack_codec
+from .base_renderer import BaseRenderer
+
+
+class MsgPackRenderer(BaseRenderer):
+    """Renders the representations as MessagePack bytes.
+    Streaming is not supported, because the envelope of a collection must
+    declare the number of its members before them."""
+
+    def __init__(self, codec=None):
+        """Initializes the renderer.
+
+        Parameters
+        ----------
+        codec: BaseCodec or None
+            The MessagePack codec encoding the representations. If None,
+            the fastest available, as by default_msgpack_codec().
+        """
+        if codec is None:
+            codec = default_msgpack_codec()
+        self.codec = codec
+
+    def render(self, representation):
+        if representation is not None:
+            return self.codec.encode(representation)
+
+        return None
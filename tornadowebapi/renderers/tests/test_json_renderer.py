@@ -1,5 +1,7 @@
 import unittest
 
+from tornado import escape
+from tornadowebapi.codecs import ORJSONCodec
 from tornadowebapi.renderers import JSONRenderer
 
 
@@ -8,3 +10,34 @@ class TestJSONRenderer(unittest.TestCase):
         renderer = JSONRenderer()
         self.assertEqual(renderer.render({}), "{}")
         self.assertEqual(renderer.render(None), None)
+
+    def test_stream_rendering(self):
+        self.check_stream_rendering(JSONRenderer(), "")
+
+    @unittest.skipIf(ORJSONCodec is None, "orjson is not installed")
+    def test_binary_codec(self):
+        renderer = JSONRenderer(ORJSONCodec())
+        self.assertEqual(escape.json_decode(renderer.render({"a": 1})),
+                         {"a": 1})
+        self.assertEqual(renderer.render(None), None)
+        self.check_stream_rendering(renderer, b"")
+
+    def check_stream_rendering(self, renderer, empty):
+        chunks = [
+            renderer.render_stream_open("items"),
+            renderer.render_stream_item("1", {"name": "foo"}, True),
+            renderer.render_stream_item("2", {"name": "</script>"}, False),
+            renderer.render_stream_close({"total": 2,
+                                          "identifiers": ["1", "2"]})
+        ]
+        self.assertNotIn("</", escape.to_unicode(empty.join(chunks)))
+        self.assertEqual(escape.json_decode(empty.join(chunks)),
+                         {"items": {"1": {"name": "foo"},
+                                    "2": {"name": "</script>"}},
+                          "total": 2,
+                          "identifiers": ["1", "2"]})
+
+        self.assertEqual(
+            escape.json_decode(renderer.render_stream_open("items") +
+                               renderer.render_stream_close({})),
+            {"items": {}})
@@ -115,6 +115,39 @@ def mandatory_absents(resource, scope):
     return res
 
 
+def present_fields(resource):
+    """Returns a set of the trait names that have a specified value
+    (i.e. are not Absent). For fragments, the set contains both the
+    fragment trait name and the dotted names of its present traits.
+    The traits with scope "output" are excluded, as they are ignored
+    on input.
+
+    Parameters
+    ----------
+    resource: Resource or ResourceFragment
+        The resource to check
+    """
+    if not isinstance(resource, (BaseResource)):
+        raise TypeError("Resource must be a BaseResource, "
+                        "got {} {} instead".format(resource, type(resource)))
+
+    res = set()
+    for trait_name, trait in resource.traits().items():
+        if trait.metadata.get("scope") == "output":
+            continue
+
+        value = getattr(resource, trait_name)
+        if value == Absent:
+            continue
+
+        res.add(trait_name)
+        if isinstance(trait, OneOf):
+            res.update([
+                ".".join([trait_name, x]) for x in present_fields(value)])
+
+    return res
+
+
 def is_valid(resource, scope):
     """Returns True if the resource is valid, False otherwise.
     Validity is defined as follows:
@@ -123,3 +156,58 @@ def is_valid(resource, scope):
     """
     return (resource.identifier is not None and
             len(mandatory_absents(resource, scope)) == 0)
+
+
+def validate_fields(resource_class, fields):
+    """Checks that the passed projection refers to existing traits
+    of the resource class.
+
+    Parameters
+    ----------
+    resource_class: type
+        A Resource, SingletonResource or ResourceFragment subclass
+    fields: set
+        The names of the traits. Dotted paths refer to the traits of
+        fragments, e.g. "mayor.name".
+
+    Raises
+    ------
+    ValueError:
+        If any of the fields does not refer to a trait.
+    """
+    for path in fields:
+        klass = resource_class
+        for name in path.split("."):
+            trait = None
+            if klass is not None:
+                trait = klass.class_traits().get(name)
+
+            if trait is None:
+                raise ValueError("Unknown field {}".format(path))
+
+            klass = trait.klass if isinstance(trait, OneOf) else None
+
+
+def select_fields(paths, fields):
+    """Returns the subset of the dotted trait paths that are relevant for
+    the passed projection, that is, those selected by one of the fields,
+    either directly or through a parent fragment, and those leading to
+    one of the fields.
+
+    Parameters
+    ----------
+    paths: set
+        The dotted trait paths, e.g. as returned by mandatory_absents
+    fields: set
+        The projection, as the set of dotted paths to emit.
+    """
+    res = set()
+    for path in paths:
+        components = path.split(".")
+        ancestors = [".".join(components[:i])
+                     for i in range(1, len(components) + 1)]
+        if (any(x in fields for x in ancestors) or
+                any(f.startswith(path + ".") for f in fields)):
+            res.add(path)
+
+    return res
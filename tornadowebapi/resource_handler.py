@@ -3,6 +3,7 @@ from tornadowebapi.resource import Resource
 from tornadowebapi.singleton_resource import SingletonResource
 
 from . import exceptions
+from .items_response import ItemsResponse
 
 
 class ResourceHandler:
@@ -13,12 +14,82 @@ class ResourceHandler:
 
     The ResourceHandler exports two member vars: application and current_user.
     They are equivalent to the members in the tornado web handler.
+    Stateless handlers receive the current_user as a keyword argument
+    of each method instead.
     """
 
     #: Specify the Resource subtype this handler manipulates.
     #: Must be overridden in the derived class.
     resource_class = None
 
+    #: If not None, the response to a GET on the collection is streamed
+    #: to the client, one item at a time, flushing every stream_batch_size
+    #: items instead of rendering the whole collection at once.
+    #: If the renderer of the transport does not support streaming,
+    #: the collection is rendered at once.
+    stream_batch_size = None
+
+    #: If True, concurrent identical GET requests on a resource or the
+    #: collection are coalesced: only one of them calls retrieve() or
+    #: items(), and all share the resulting response. Requests are
+    #: identical if they have the same identifier, query arguments and
+    #: partition_key(). Streamed collections are not coalesced.
+    coalesce_reads = False
+
+    #: If not None, the time in seconds for which the responses to GET
+    #: requests on a resource or the collection are cached by the registry.
+    #: Cached responses are shared among the requests with the same
+    #: query arguments and partition_key(), and invalidated by successful
+    #: modifications of the collection through the web API. Modifications
+    #: performed otherwise become visible only after this time.
+    #: Streamed collections are not cached.
+    cache_ttl = None
+
+    #: The maximum number of cached responses for the collection.
+    #: The least recently used ones are evicted. None means no limit.
+    cache_max_entries = 1000
+
+    #: The maximum total size, in bytes, of the cached responses for the
+    #: collection. None means no limit.
+    cache_max_bytes = None
+
+    #: The zlib compression level, from 0 to 9, of the responses, when the
+    #: transport enables compression and the client accepts it.
+    #: None disables the compression of the responses of this handler.
+    compression_level = 6
+
+    #: If True, the handler is instantiated once per registry and shared
+    #: among all requests, so that it can hold warm state, e.g. connection
+    #: handles. Its current_user member is None: the current user is
+    #: passed instead to each method as the current_user keyword argument,
+    #: and must not be stored on the instance.
+    #: If False, a new instance is created for each request.
+    stateless = False
+
+    #: The maximum size, in bytes, of the request bodies. Requests
+    #: declaring a larger Content-Length are rejected with 413 before
+    #: their body is received, and the reception of larger bodies without
+    #: Content-Length is aborted. None means the max_body_size of the
+    #: HTTP server.
+    #: If not None, the request bodies are received in streaming, so the
+    #: handler must be registered before Registry.api_handlers() is called.
+    max_body_size = None
+
+    #: If True, the request body is fed to the incremental parser of the
+    #: transport as it is received, decompressing it on the fly, instead
+    #: of being buffered whole and parsed at once. Reduces the memory
+    #: used by large POST and PUT payloads with transports whose parser
+    #: decodes the chunks as they arrive. The JSON parser accumulates them,
+    #: and parses the body when complete.
+    #: The handler must be registered before Registry.api_handlers() is
+    #: called. The body is not available to the authenticator.
+    stream_request_body = False
+
+    #: The maximum number of identifiers accepted in the ids query argument
+    #: of GET and DELETE on the collection. Requests with more identifiers
+    #: are rejected with 400. None means no limit.
+    max_ids = 100
+
     def __init__(self, application, current_user):
         """Initializes the Resource with a given application and user instance
 
@@ -65,6 +136,37 @@ class ResourceHandler:
         """
         raise NotImplementedError()
 
+    @gen.coroutine
+    def create_many(self, instances, **kwargs):
+        """Called to create multiple resources at once, when an array
+        of representations is POSTed on the resource collection.
+        Every instance must have its identifier set, as in create().
+
+        By default, it calls create() for each instance, in order.
+        Reimplement it to perform a more efficient bulk insertion.
+
+        Parameters
+        ----------
+        instances: list
+            A list of instances of the associated resource_class,
+            pre-filled with the data from the payload of the HTTP request.
+            Representations that failed validation are not included.
+
+        Returns
+        -------
+        list
+            A list with one entry per instance, in the same order. The entry
+            is None if the instance has been created, or a WebAPIException
+            (e.g. Exists) describing why it could not be created.
+
+        Raises
+        ------
+        NotImplementedError:
+            If the resource does not support the method.
+        """
+        results = yield self._for_each(self.create, instances, **kwargs)
+        return results
+
     @gen.coroutine
     def retrieve(self, instance, **kwargs):
         """Called to retrieve a specific resource given its
@@ -83,6 +185,14 @@ class ResourceHandler:
             This instance has only the identifier filled. The rest
             must be filled by this routine.
 
+        Additionally, the following keyword arguments can be passed:
+
+        fields: frozenset
+            Passed if the client requested a subset of the traits with the
+            fields query argument. Only these traits must be filled, and
+            only these will be returned. Dotted names refer to traits of
+            fragments.
+
         Returns
         -------
         None
@@ -97,6 +207,51 @@ class ResourceHandler:
         """
         raise NotImplementedError()
 
+    @gen.coroutine
+    def retrieve_many(self, instances, **kwargs):
+        """Called to retrieve multiple resources at once, given their
+        identifiers. Corresponds to a GET operation on the resource
+        collection URL with the ids query argument.
+
+        By default, it calls retrieve() concurrently for each instance.
+        Their number is limited by max_ids.
+        Reimplement it to fetch all the instances with a single query.
+
+        Parameters
+        ----------
+        instances: list
+            A list of instances of the resource_class. Only the identifier
+            is filled. The found ones must be filled as in retrieve().
+
+        Additionally, the fields keyword argument can be passed, as in
+        retrieve().
+
+        Returns
+        -------
+        list
+            The instances that have been found, in the same order.
+
+        Raises
+        ------
+        NotImplementedError:
+            If the resource does not support the method.
+        """
+        retrieved = yield gen.multi([
+            self._retrieve_or_none(instance, **kwargs)
+            for instance in instances])
+
+        return [instance for instance in retrieved if instance is not None]
+
+    @gen.coroutine
+    def _retrieve_or_none(self, instance, **kwargs):
+        """Retrieves the instance, returning None if not found."""
+        try:
+            yield self.retrieve(instance, **kwargs)
+        except exceptions.NotFound:
+            return None
+
+        return instance
+
     @gen.coroutine
     def update(self, instance, **kwargs):
         """Called to update (fully) a specific Resource given its
@@ -123,6 +278,36 @@ class ResourceHandler:
         """
         raise NotImplementedError()
 
+    @gen.coroutine
+    def patch(self, instance, changed_fields, **kwargs):
+        """Called to update partially a specific Resource given its
+        identifier. Only the data present in the request must be changed.
+        Corresponds to a PATCH operation on the Resource URL.
+
+        Parameters
+        ----------
+        instance:
+            An instance of the resource_class. This instance will be filled
+            with the data from the payload. Traits not present in the
+            payload are Absent, and must be left unchanged.
+        changed_fields: set
+            The names of the traits present in the payload. For fragments,
+            it also contains the dotted names of their present traits.
+
+        Returns
+        -------
+        None
+
+        Raises
+        ------
+        NotFound:
+            Raised if the resource with the given identifier cannot
+            be found
+        NotImplementedError:
+            If the resource does not support the method.
+        """
+        raise NotImplementedError()
+
     @gen.coroutine
     def delete(self, instance, **kwargs):
         """Called to delete a specific resource given its identifier.
@@ -149,10 +334,133 @@ class ResourceHandler:
         """
         raise NotImplementedError()
 
+    @gen.coroutine
+    def update_many(self, instances, **kwargs):
+        """Called to update (fully) multiple resources at once.
+        Corresponds to a PUT operation on the resource collection URL,
+        with a mapping from identifiers to representations as payload.
+
+        By default, it calls update() for each instance, in order.
+        Reimplement it to perform a more efficient bulk update.
+
+        Parameters
+        ----------
+        instances: list
+            A list of instances of the resource_class, filled with the
+            data from the payload. Representations that failed validation
+            are not included.
+
+        Returns
+        -------
+        list
+            A list with one entry per instance, in the same order. The entry
+            is None if the instance has been updated, or a WebAPIException
+            (e.g. NotFound) describing why it could not be updated.
+
+        Raises
+        ------
+        NotImplementedError:
+            If the resource does not support the method.
+        """
+        results = yield self._for_each(self.update, instances, **kwargs)
+        return results
+
+    @gen.coroutine
+    def patch_many(self, instances, changed_fields, **kwargs):
+        """Called to update partially multiple resources at once.
+        Corresponds to a PATCH operation on the resource collection URL,
+        with a mapping from identifiers to partial representations as
+        payload.
+
+        By default, it calls patch() for each instance, in order.
+        Reimplement it to perform a more efficient bulk update.
+
+        Parameters
+        ----------
+        instances: list
+            A list of instances of the resource_class, filled with the
+            data from the payload, as in patch().
+        changed_fields: list
+            For each instance, the set of its traits present in the
+            payload, as in patch().
+
+        Returns
+        -------
+        list
+            A list with one entry per instance, in the same order. The entry
+            is None if the instance has been updated, or a WebAPIException
+            describing why it could not be updated.
+
+        Raises
+        ------
+        NotImplementedError:
+            If the resource does not support the method.
+        """
+        results = []
+        for instance, fields in zip(instances, changed_fields):
+            try:
+                yield self.patch(instance, fields, **kwargs)
+            except exceptions.WebAPIException as e:
+                results.append(e)
+            else:
+                results.append(None)
+
+        return results
+
+    @gen.coroutine
+    def delete_many(self, instances, **kwargs):
+        """Called to delete multiple resources at once. Corresponds to
+        a DELETE operation on the resource collection URL, with either the
+        ids query argument or a filter selecting the resources to delete.
+        With a filter, the matching resources are obtained from items().
+
+        By default, it calls delete() for each instance, in order.
+        Reimplement it to perform a more efficient bulk deletion.
+
+        Parameters
+        ----------
+        instances: list
+            A list of instances of the resource_class. Only the identifier
+            is filled.
+
+        Returns
+        -------
+        list
+            A list with one entry per instance, in the same order. The entry
+            is None if the instance has been deleted, or a WebAPIException
+            (e.g. NotFound) describing why it could not be deleted.
+
+        Raises
+        ------
+        NotImplementedError:
+            If the resource does not support the method.
+        """
+        results = yield self._for_each(self.delete, instances, **kwargs)
+        return results
+
+    @gen.coroutine
+    def _for_each(self, method, instances, **kwargs):
+        """Calls method on each instance in turn, collecting the
+        WebAPIExceptions raised, or None for success."""
+        results = []
+        for instance in instances:
+            try:
+                yield method(instance, **kwargs)
+            except exceptions.WebAPIException as e:
+                results.append(e)
+            else:
+                results.append(None)
+
+        return results
+
     @gen.coroutine
     def exists(self, instance, **kwargs):
         """Returns True if the resource with a given identifier
-        exists. False otherwise.
+        exists. False otherwise. Used to answer HEAD requests on the
+        resource URL.
+
+        By default, it calls retrieve(). Reimplement it to perform a
+        cheaper check.
 
         Parameters
         ----------
@@ -164,17 +472,81 @@ class ResourceHandler:
         bool: True if found, False otherwise.
         """
         try:
-            yield self.retrieve(instance)
+            yield self.retrieve(instance, **kwargs)
         except exceptions.NotFound:
             return False
 
         return True
 
+    @gen.coroutine
+    def count(self, **kwargs):
+        """Returns the number of items in the collection. Used to answer
+        HEAD requests on the collection URL. It receives the same keyword
+        arguments of items().
+
+        By default, it calls items() and returns the resulting total.
+        If items() sets a stream without its total, the stream is consumed
+        to count the items. Reimplement it to perform a cheaper count.
+
+        Returns
+        -------
+        int or None: The number of items, or None if unknown.
+        """
+        items_response = ItemsResponse(self.resource_class)
+        yield self.items(items_response, **kwargs)
+        yield items_response.fetch_total()
+        return items_response.total
+
+    @gen.coroutine
+    def version(self, instance, **kwargs):
+        """Returns a version token for a resource, used to answer
+        conditional GET requests without retrieving the resource.
+        The token must change whenever the representation of the resource
+        changes (for example, a revision number or a modification timestamp).
+        If the representation depends on the current user, the token must
+        depend on it too.
+
+        By default, returns None, meaning that no cheap version is
+        available. In that case, the ETag of GET responses is obtained by
+        hashing the response payload, and HEAD responses, which do not
+        produce the payload, carry no ETag. Implement this method for HEAD
+        and GET responses to carry the same ETag.
+
+        Parameters
+        ----------
+        instance: Resource or SingletonResource
+            An instance of the resource_class. Only the identifier
+            will be filled.
+
+        Returns
+        -------
+        str, int or None
+            Values other than strings and bytes are converted with str().
+        """
+        return None
+
+    @gen.coroutine
+    def items_version(self, **kwargs):
+        """Returns a version token for the collection, used to answer
+        conditional GET requests on the collection URL without calling
+        items(). The same considerations of version() apply.
+        It receives the same keyword arguments of items().
+
+        Returns
+        -------
+        str, int or None
+            Values other than strings and bytes are converted with str().
+        """
+        return None
+
     @gen.coroutine
     def items(self, items_response, offset=None, limit=None, **kwargs):
         """Invoked when a request is performed to the collection
         URL. Passes an empty items_response object that must be filled
-        with the relevant information.
+        with the relevant information, either with a list via
+        items_response.set(), or with a (possibly asynchronous) iterator via
+        items_response.set_stream(), if the items should be produced
+        incrementally while the response is written.
         Corresponds to a GET operation on the collection URL.
 
         Parameters
@@ -187,6 +559,32 @@ class ResourceHandler:
         limit: int or None
             The maximum amount of elements to return.
 
+        Additionally, the following keyword arguments can be passed:
+
+        cursor:
+            For cursor (keyset) pagination, the sort key of the last item
+            of the previous page, as set in items_response.next_cursor.
+            The client receives and sends it back as an opaque token,
+            signed with an HMAC of the cookie_secret application setting.
+            Without this setting, requests with a cursor are rejected
+            with 400.
+
+        fields: frozenset
+            Passed if the client requested a subset of the traits with the
+            fields query argument. As for retrieve(), only these traits
+            must be filled in the items.
+
+        items() is not called when specific items are requested with the
+        ids query argument. See retrieve_many().
+
+        total_mode:
+            Passed if the client specified the total query argument.
+            "exact" requests the exact total, "estimate" allows an
+            approximate total, and "none" means that the total is not needed,
+            so no counting has to be performed. Report the mode that was
+            actually used through the total_mode argument of
+            items_response.set().
+
         Raises
         ------
         NotImplementedError:
@@ -253,6 +651,30 @@ class ResourceHandler:
         """
         return identifier
 
+    def partition_key(self, **kwargs):
+        """Returns a hashable key identifying the users that share the
+        same view of the resources. Responses are shared among requests
+        only if they have the same partition key.
+
+        By default, returns the current_user, so that responses are never
+        shared among different users. Reimplement it to return e.g.
+        a role, if the representations only depend on it.
+
+        Parameters
+        ----------
+        kwargs:
+            For stateless handlers, contains the current_user.
+        """
+        return kwargs.get("current_user", self.current_user)
+
+    @classmethod
+    def streams_request_body(cls):
+        """Returns true if the request bodies must be received in streaming,
+        as the handler sets stream_request_body or max_body_size.
+        The request bodies of the other handlers are buffered whole
+        before the request is processed."""
+        return cls.stream_request_body or cls.max_body_size is not None
+
     @classmethod
     def handles_singleton(cls):
         """Returns true if the handler resource_class is a singleton class.
@@ -0,0 +1,157 @@
+import time
+from collections import OrderedDict
+
+from .utils import payload_chunks
+
+
+class _Bucket:
+    """The cached responses of a single collection, in LRU order."""
+    def __init__(self):
+        # (identifier, variant) -> (payload, expiration time, size)
+        self.entries = OrderedDict()
+        self.size = 0
+
+        # Incremented at every invalidation.
+        self.generation = 0
+
+    def remove(self, key):
+        _, _, size = self.entries.pop(key)
+        self.size -= size
+
+
+class ResponseCache:
+    """Caches the rendered payloads of GET responses, per collection,
+    with a time to live and LRU eviction. The entries of a collection are
+    invalidated when it is modified.
+
+    A response cache is held by the Registry. It is local to the process.
+    """
+
+    def __init__(self, clock=time.monotonic):
+        """Initializes the cache.
+
+        Parameters
+        ----------
+        clock: callable
+            Returns the current time in seconds.
+        """
+        self._clock = clock
+        self._buckets = {}
+
+        #: The number of lookups that found a valid entry.
+        self.hits = 0
+
+        #: The number of lookups that did not find a valid entry.
+        self.misses = 0
+
+        #: The number of entries removed to respect the size limits.
+        self.evictions = 0
+
+    def get(self, collection_name, identifier, variant):
+        """Returns the cached payload, or None if not present or expired.
+
+        Parameters
+        ----------
+        collection_name: str
+            The name of the collection.
+        identifier: str or None
+            The identifier of the resource, or None for the collection.
+        variant: hashable
+            Identifies the response among the ones for the same resource,
+            e.g. the query arguments and the user.
+        """
+        bucket = self._buckets.get(collection_name)
+        key = (identifier, variant)
+
+        if bucket is None or key not in bucket.entries:
+            self.misses += 1
+            return None
+
+        payload, expires, _ = bucket.entries[key]
+        if expires <= self._clock():
+            bucket.remove(key)
+            self.misses += 1
+            return None
+
+        bucket.entries.move_to_end(key)
+        self.hits += 1
+        return payload
+
+    def generation(self, collection_name):
+        """Returns the current generation of the collection, changed
+        by every invalidation. Pass it to put() to prevent caching a
+        payload obtained before an invalidation."""
+        return self._buckets.setdefault(
+            collection_name, _Bucket()).generation
+
+    def put(self, collection_name, identifier, variant, payload, ttl,
+            max_entries=None, max_bytes=None, generation=None):
+        """Stores a payload, evicting the least recently used entries
+        of the collection if the limits are exceeded.
+
+        Parameters
+        ----------
+        collection_name, identifier, variant:
+            As in get()
+        payload: str, bytes or list of bytes
+            The rendered payload.
+        ttl: float
+            The time to live of the entry, in seconds.
+        max_entries: int or None
+            The maximum number of entries for the collection.
+        max_bytes: int or None
+            The maximum total size of the payloads of the collection.
+        generation: int or None
+            If not None, the payload is stored only if the collection has
+            not been invalidated since this generation was obtained.
+        """
+        bucket = self._buckets.setdefault(collection_name, _Bucket())
+        if generation is not None and generation != bucket.generation:
+            return
+
+        size = sum(len(chunk) for chunk in payload_chunks(payload))
+        if max_bytes is not None and size > max_bytes:
+            return
+
+        key = (identifier, variant)
+        if key in bucket.entries:
+            bucket.remove(key)
+
+        bucket.entries[key] = (payload, self._clock() + ttl, size)
+        bucket.size += size
+
+        while ((max_entries is not None
+                and len(bucket.entries) > max_entries) or
+               (max_bytes is not None and bucket.size > max_bytes)):
+            bucket.remove(next(iter(bucket.entries)))
+            self.evictions += 1
+
+    def invalidate(self, collection_name, identifier=None):
+        """Invalidates the entries affected by a modification of the
+        collection. If identifier is None, all the entries of the collection
+        are removed. Otherwise, the ones of the given resource, and the ones
+        of the collection listings.
+        The generation of the collection is changed even if nothing is
+        cached, to prevent storing the payloads being obtained."""
+        bucket = self._buckets.setdefault(collection_name, _Bucket())
+        bucket.generation += 1
+
+        if identifier is None:
+            bucket.entries.clear()
+            bucket.size = 0
+            return
+
+        for key in list(bucket.entries):
+            if key[0] is None or key[0] == identifier:
+                bucket.remove(key)
+
+    def clear(self):
+        """Removes all the entries."""
+        for bucket in self._buckets.values():
+            bucket.generation += 1
+            bucket.entries.clear()
+            bucket.size = 0
+
+    def __len__(self):
+        """The number of entries in the cache, including expired ones."""
+        return sum(len(bucket.entries) for bucket in self._buckets.values())
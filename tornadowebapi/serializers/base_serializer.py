@@ -1,6 +1,7 @@
 import abc
 
 from tornadowebapi.base_resource import BaseResource
+from tornadowebapi.bulk_response import BulkResponse
 from tornadowebapi.exceptions import WebAPIException
 from tornadowebapi.items_response import ItemsResponse
 
@@ -13,14 +14,24 @@ class BaseSerializer(metaclass=abc.ABCMeta):
     This dictionary will then be passed to the renderer to be
     converted into something that is shown on the web.
     """
-    def serialize(self, entity):
+    #: The key of the envelope under which the items are placed
+    #: when an ItemsResponse is serialized in streaming mode.
+    items_key = "items"
+
+    def serialize(self, entity, fields=None):
         """
         Serializes the passed entity. Returns a dictionary with the
         result of the serialization
 
         Parameters
         ----------
-        entity: BaseResource or ItemsResponse or WebAPIException
+        entity: BaseResource or ItemsResponse or BulkResponse or
+                WebAPIException
+
+        fields: frozenset or None
+            If not None, the projection to apply to the serialized resources:
+            the names of the traits to emit. Dotted paths select traits
+            of the fragments. Ignored for exceptions.
 
         Returns
         -------
@@ -28,9 +39,11 @@ class BaseSerializer(metaclass=abc.ABCMeta):
             A dict representing the serialized entity
         """
         if isinstance(entity, BaseResource):
-            return self.serialize_resource(entity)
+            return self.serialize_resource(entity, fields)
         elif isinstance(entity, ItemsResponse):
-            return self.serialize_items_response(entity)
+            return self.serialize_items_response(entity, fields)
+        elif isinstance(entity, BulkResponse):
+            return self.serialize_bulk_response(entity)
         elif isinstance(entity, WebAPIException):
             return self.serialize_exception(entity)
         else:
@@ -38,13 +51,15 @@ class BaseSerializer(metaclass=abc.ABCMeta):
                             "BaseSerializer.serialize".format(entity))
 
     @abc.abstractmethod
-    def serialize_items_response(self, items_response):
+    def serialize_items_response(self, items_response, fields=None):
         """Serializes a collection of items.
 
         Parameters
         ----------
         items_response: ItemsResponse
             The ItemsResponse to serialize.
+        fields: frozenset or None
+            The projection to apply to the items, or None for all the traits.
 
         Returns
         -------
@@ -70,16 +85,69 @@ class BaseSerializer(metaclass=abc.ABCMeta):
         """
 
     @abc.abstractmethod
-    def serialize_resource(self, resource):
+    def serialize_resource(self, resource, fields=None):
         """Serializes a resource.
 
         Parameters
         ----------
         resource: Resource
             The resource to serialize
+        fields: frozenset or None
+            The projection to apply, or None for all the traits.
 
         Returns
         -------
         dict
             A dict representing the resource.
         """
+
+    def serialize_bulk_response(self, bulk_response):
+        """Serializes the per-item outcome of a bulk operation.
+
+        Parameters
+        ----------
+        bulk_response: BulkResponse
+            The BulkResponse to serialize.
+
+        Returns
+        -------
+        dict
+            A dict representing the outcome of the operation.
+        """
+        raise NotImplementedError()
+
+    def serialize_item(self, item, fields=None):
+        """Serializes a single item of an ItemsResponse, for streaming.
+
+        Parameters
+        ----------
+        item: Resource
+            The item to serialize
+        fields: frozenset or None
+            The projection to apply, or None for all the traits.
+
+        Returns
+        -------
+        tuple
+            A (key, representation) pair, where key is the string under
+            which the item is placed in the items_key mapping.
+        """
+        raise NotImplementedError()
+
+    def serialize_items_envelope(self, items_response, keys):
+        """Serializes the envelope of an ItemsResponse, for streaming.
+        The envelope contains everything except the items themselves.
+
+        Parameters
+        ----------
+        items_response: ItemsResponse
+            The ItemsResponse being streamed.
+        keys: list
+            The keys of the items that have been streamed, in order.
+
+        Returns
+        -------
+        dict
+            The envelope members, excluding items_key.
+        """
+        raise NotImplementedError()
@@ -1,24 +1,95 @@
+from collections import OrderedDict
+
+from tornadowebapi.resource import validate_fields
 from tornadowebapi.traitlets import Absent, OneOf
 from .base_serializer import BaseSerializer
 
 
 class BasicRESTSerializer(BaseSerializer):
     """Serialize with our own style of REST content."""
-    def serialize_items_response(self, items_response):
+
+    #: The maximum number of cached serialization plans for projections,
+    #: which are chosen by the clients with the fields query argument.
+    #: The least recently used ones are evicted.
+    max_projection_plans = 256
+
+    def __init__(self):
+        # Serialization plans without projection, one per resource class.
+        # See _plan_for.
+        self._plans = {}
+
+        # Serialization plans by (resource class, fields), in LRU order.
+        self._projection_plans = OrderedDict()
+
+    def serialize_items_response(self, items_response, fields=None):
         # For security reasons stemming from cross site execution,
         # this list will not be rendered as a list in a json representation.
         # Instead, a dictionary with the key "items" and value as this list
         # will be returned.
-        return {
+        items = {}
+        identifiers = []
+        plans = self._plans if fields is None else {}
+        serialize = self._serialize_with_plan
+
+        for item in items_response.items:
+            cls = type(item)
+            plan = plans.get(cls)
+            if plan is None:
+                plan = plans[cls] = self._plan_for(cls, item, fields)
+
+            identifier = item.identifier
+            items[str(identifier)] = serialize(item, plan)
+            identifiers.append(identifier)
+
+        envelope = self.serialize_items_envelope(items_response, identifiers)
+        envelope[self.items_key] = items
+        return envelope
+
+    def serialize_item(self, item, fields=None):
+        return str(item.identifier), self.serialize_resource(item, fields)
+
+    def serialize_items_envelope(self, items_response, keys):
+        envelope = {
             "offset": items_response.offset,
-            "total": items_response.total,
-            "items": {
-                str(item.identifier): self.serialize_resource(item)
-                for item in items_response.items
-            },
-            "identifiers": [item.identifier for item in items_response.items]
+            "identifiers": keys
         }
 
+        if items_response.total is not None:
+            envelope["total"] = items_response.total
+
+        # The default exact mode is implied.
+        if items_response.total_mode != "exact":
+            envelope["total_mode"] = items_response.total_mode
+
+        if items_response.next_cursor is not None:
+            envelope["next_cursor"] = items_response.next_cursor
+
+        if items_response.missing is not None:
+            envelope["missing"] = items_response.missing
+
+        return envelope
+
+    def serialize_bulk_response(self, bulk_response):
+        # As for items responses, the list is wrapped in a dictionary.
+        items = []
+        for result in bulk_response.results:
+            item = {"status": result.status}
+
+            if result.identifier is not None:
+                item["identifier"] = result.identifier
+
+            if result.location is not None:
+                item["location"] = result.location
+
+            if result.exception is not None:
+                error = self.serialize_exception(result.exception)
+                if error is not None:
+                    item["error"] = error
+
+            items.append(item)
+
+        return {self.items_key: items}
+
     def serialize_exception(self, exception):
         if exception.message is None and exception.info is None:
             return None
@@ -38,17 +109,93 @@ class BasicRESTSerializer(BaseSerializer):
 
         return data
 
-    def serialize_resource(self, resource):
-        d = {}
+    def serialize_resource(self, resource, fields=None):
+        return self._serialize_with_plan(
+            resource, self._plan_for(type(resource), resource, fields))
+
+    def _plan_for(self, cls, resource, fields=None):
+        """Returns the serialization plan for the given resource class
+        and projection, building it from the passed instance if not already
+        cached.
+
+        The plan is a tuple of (trait_name, is_fragment, subfields) entries,
+        in the order the traits must be emitted. Traits with scope "input"
+        are not part of the output representation, so they are left out.
+        If fields is not None, only the traits it selects are part of the
+        plan. subfields is the projection to apply to a fragment, or None
+        to emit it entirely.
+
+        The plans without projection are always cached. The ones with
+        a projection are cached up to max_projection_plans, and only if
+        the projection refers to existing traits.
+        """
+        if fields is None:
+            plan = self._plans.get(cls)
+        else:
+            plan = self._projection_plans.get((cls, fields))
+            if plan is not None:
+                self._projection_plans.move_to_end((cls, fields))
 
+        if plan is not None:
+            return plan
+
+        plan = []
         for trait_name, trait in resource.traits().items():
-            if getattr(resource, trait_name) is Absent:
+            if trait.metadata.get("scope") == "input":
+                continue
+
+            is_fragment = isinstance(trait, OneOf)
+            subfields = None
+
+            if fields is not None and trait_name not in fields:
+                if not is_fragment:
+                    continue
+
+                prefix = trait_name + "."
+                subfields = frozenset(
+                    path[len(prefix):] for path in fields
+                    if path.startswith(prefix))
+
+                if len(subfields) == 0:
+                    continue
+
+            plan.append((trait_name, is_fragment, subfields))
+
+        plan = tuple(plan)
+        if fields is None:
+            self._plans[cls] = plan
+        else:
+            self._cache_projection_plan(cls, fields, plan)
+
+        return plan
+
+    def _cache_projection_plan(self, cls, fields, plan):
+        """Caches the plan of a projection, evicting the least recently
+        used one if needed."""
+        try:
+            validate_fields(cls, fields)
+        except ValueError:
+            return
+
+        plans = self._projection_plans
+        plans[(cls, fields)] = plan
+        while len(plans) > self.max_projection_plans:
+            plans.popitem(last=False)
+
+    def _serialize_with_plan(self, resource, plan):
+        d = {}
+
+        for trait_name, is_fragment, subfields in plan:
+            value = getattr(resource, trait_name)
+            if value is Absent:
                 continue
 
-            if isinstance(trait, OneOf):
-                fragment = getattr(resource, trait_name)
-                d[trait_name] = self.serialize_resource(fragment)
-            else:
-                d[trait_name] = getattr(resource, trait_name)
+            if is_fragment:
+                # Fragments get their own plan, according to the
+                # actual class of the contained value.
+                value = self._serialize_with_plan(
+                    value, self._plan_for(type(value), value, subfields))
+
+            d[trait_name] = value
 
         return d
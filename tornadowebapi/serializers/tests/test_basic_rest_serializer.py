@@ -1,9 +1,20 @@
 import unittest
 
+from tornadowebapi import exceptions
+from tornadowebapi.bulk_response import BulkResponse
+from tornadowebapi.http import httpstatus
 from tornadowebapi.items_response import ItemsResponse
 from tornadowebapi.serializers import BasicRESTSerializer
+from tornadowebapi.resource import Resource
 from tornadowebapi.tests.resource_handlers import Student, Teacher, City, \
     Person
+from tornadowebapi.traitlets import Unicode
+
+
+class Job(Resource):
+    command = Unicode()
+    params = Unicode(scope="input")
+    status = Unicode(scope="output")
 
 
 class TestBasicRESTSerializer(unittest.TestCase):
@@ -33,6 +44,65 @@ class TestBasicRESTSerializer(unittest.TestCase):
                 "identifiers": ["1", "2", "3"]
             })
 
+    def test_serialize_items_response_without_total(self):
+        students = ItemsResponse(type=Student)
+        students.set([Student(identifier="1")], total_mode="none")
+
+        serializer = BasicRESTSerializer()
+        self.assertEqual(
+            serializer.serialize(students),
+            {
+                "offset": 0,
+                "total_mode": "none",
+                "items": {
+                    "1": {},
+                },
+                "identifiers": ["1"]
+            })
+
+    def test_serialize_items_response_with_missing(self):
+        students = ItemsResponse(type=Student)
+        students.set([Student(identifier="1")])
+        students.missing = ["2"]
+
+        serializer = BasicRESTSerializer()
+        self.assertEqual(
+            serializer.serialize(students),
+            {
+                "offset": 0,
+                "total": 1,
+                "items": {
+                    "1": {},
+                },
+                "identifiers": ["1"],
+                "missing": ["2"]
+            })
+
+    def test_serialize_bulk_response(self):
+        bulk_response = BulkResponse()
+        bulk_response.add_success(httpstatus.CREATED,
+                                  identifier="1",
+                                  location="http://example.com/1/")
+        bulk_response.add_failure(exceptions.BadRepresentation("wrong"))
+        bulk_response.add_failure(exceptions.NotFound(), identifier="2")
+        self.assertFalse(bulk_response.succeeded)
+
+        serializer = BasicRESTSerializer()
+        self.assertEqual(
+            serializer.serialize(bulk_response),
+            {
+                "items": [
+                    {"status": 201,
+                     "identifier": "1",
+                     "location": "http://example.com/1/"},
+                    {"status": 400,
+                     "error": {"type": "BadRepresentation",
+                               "message": "wrong"}},
+                    {"status": 404,
+                     "identifier": "2"},
+                ]
+            })
+
     def test_serialize_resource(self):
         student = Student(identifier="1", name="john wick", age=39)
 
@@ -78,6 +148,94 @@ class TestBasicRESTSerializer(unittest.TestCase):
                              }
                          })
 
+    def test_serialize_scoped_traits(self):
+        job = Job(identifier="1",
+                  command="ls",
+                  params="-l",
+                  status="running")
+
+        serializer = BasicRESTSerializer()
+        self.assertEqual(
+            serializer.serialize(job),
+            {"command": "ls",
+             "status": "running"})
+
+    def test_plan_is_cached(self):
+        serializer = BasicRESTSerializer()
+        students = ItemsResponse(
+            type=Student,
+            items=[
+                Student(identifier="1", name="john wick", age=39),
+                Student(identifier="2", name="john wick 2", age=40),
+            ]
+        )
+        serializer.serialize(students)
+        plan = serializer._plans[Student]
+        self.assertEqual(set(plan),
+                         {("name", False, None), ("age", False, None)})
+
+        serializer.serialize(Student(identifier="3", name="john", age=1))
+        self.assertIs(serializer._plans[Student], plan)
+
+        serializer.serialize(City(identifier="1",
+                                  name="Cambridge",
+                                  mayor=Person(name="Jeremy", age=50)))
+        self.assertEqual(set(serializer._plans[City]),
+                         {("name", False, None), ("mayor", True, None)})
+        self.assertIn(Person, serializer._plans)
+
+    def test_serialize_with_fields(self):
+        serializer = BasicRESTSerializer()
+        resource = City(
+            identifier="1",
+            name="Cambridge",
+            mayor=Person(
+                name="Jeremy Benstead",
+                age=50,
+            )
+        )
+
+        self.assertEqual(
+            serializer.serialize(resource, frozenset(["name"])),
+            {"name": "Cambridge"})
+        self.assertEqual(
+            serializer.serialize(resource, frozenset(["mayor"])),
+            {"mayor": {"name": "Jeremy Benstead", "age": 50}})
+        self.assertEqual(
+            serializer.serialize(resource, frozenset(["name", "mayor.age"])),
+            {"name": "Cambridge", "mayor": {"age": 50}})
+
+        students = ItemsResponse(type=Student)
+        students.set([Student(identifier="1", name="john wick", age=39)])
+        self.assertEqual(
+            serializer.serialize(students, frozenset(["age"])),
+            {
+                "total": 1,
+                "offset": 0,
+                "items": {"1": {"age": 39}},
+                "identifiers": ["1"]
+            })
+
+    def test_projection_plans_are_bounded(self):
+        serializer = BasicRESTSerializer()
+        serializer.max_projection_plans = 2
+        student = Student(identifier="1", name="john wick", age=39)
+
+        for fields in [["name"], ["age"], ["name", "age"], ["age"]]:
+            serializer.serialize(student, frozenset(fields))
+
+        self.assertEqual(list(serializer._projection_plans), [
+            (Student, frozenset(["name", "age"])),
+            (Student, frozenset(["age"]))])
+
+        # Unknown traits are not cached
+        self.assertEqual(
+            serializer.serialize(student, frozenset(["name", "whatever"])),
+            {"name": "john wick"})
+        self.assertEqual(len(serializer._projection_plans), 2)
+        self.assertNotIn((Student, frozenset(["name", "whatever"])),
+                         serializer._projection_plans)
+
     def test_serialize_incorrect_type(self):
         serializer = BasicRESTSerializer()
         with self.assertRaises(TypeError):
@@ -165,6 +165,27 @@ define(['jquery'], function ($) {
         promise.resolve(id, location);
     };
 
+    var bulk_handler = function(promise, data, textStatus, jqXHR) {
+        var status = jqXHR.status;
+
+        var payload = null;
+        try {
+            payload = JSON.parse(data);
+        } catch (e) {
+            // Suppress any syntax error and discard the payload
+        }
+
+        if (payload === null || !payload.items) {
+            console.log("Bulk response had invalid or absent payload");
+            promise.reject(status, payload);
+            return;
+        }
+
+        // One entry per item, in the order of the request, with its
+        // own status. 207 means that some of them failed.
+        promise.resolve(payload.items, status);
+    };
+
     var create_singleton_handler = function(promise, data, textStatus, jqXHR) {
         var status = jqXHR.status;
 
@@ -293,6 +314,67 @@ define(['jquery'], function ($) {
             return promise;
         };
         
+        this.create_many = function(representations, query_args) {
+            var body = JSON.stringify(representations);
+            var promise = $.Deferred();
+
+            API.request("POST", type, body, query_args)
+                .done(function(data, textStatus, jqXHR) {
+                    bulk_handler(promise, data, textStatus, jqXHR);
+                })
+                .fail(function(jqXHR, textStatus, error) {
+                    fail_handler(promise, jqXHR, textStatus, error);
+                });
+
+            return promise;
+        };
+
+        this.update_many = function(representations, query_args) {
+            // representations maps each id to its new representation.
+            var body = JSON.stringify(representations);
+            var promise = $.Deferred();
+
+            API.request("PUT", type, body, query_args)
+                .done(function(data, textStatus, jqXHR) {
+                    bulk_handler(promise, data, textStatus, jqXHR);
+                })
+                .fail(function(jqXHR, textStatus, error) {
+                    fail_handler(promise, jqXHR, textStatus, error);
+                });
+
+            return promise;
+        };
+
+        this.patch_many = function(representations, query_args) {
+            var body = JSON.stringify(representations);
+            var promise = $.Deferred();
+
+            API.request("PATCH", type, body, query_args)
+                .done(function(data, textStatus, jqXHR) {
+                    bulk_handler(promise, data, textStatus, jqXHR);
+                })
+                .fail(function(jqXHR, textStatus, error) {
+                    fail_handler(promise, jqXHR, textStatus, error);
+                });
+
+            return promise;
+        };
+
+        this.delete_many = function(query_args) {
+            // query_args must contain either ids or filter.
+            var promise = $.Deferred();
+
+            API.request("DELETE", type, null, query_args)
+                .done(function(data, textStatus, jqXHR) {
+                    bulk_handler(promise, data, textStatus, jqXHR);
+                })
+                .fail(function(jqXHR, textStatus, error) {
+                    fail_handler(promise, jqXHR, textStatus, error);
+                });
+
+            return promise;
+        };
+
         this.update = function(id, representation, query_args) {
             var body = JSON.stringify(representation);
             var promise = $.Deferred();
@@ -309,6 +391,22 @@ define(['jquery'], function ($) {
             return promise;
         };
         
+        this.patch = function(id, representation, query_args) {
+            var body = JSON.stringify(representation);
+            var promise = $.Deferred();
+
+            API.request("PATCH", url_path_join(type, id), body, query_args)
+                .done(function(data, textStatus, jqXHR) {
+                    update_handler(promise, data, textStatus, jqXHR)
+                  }
+                )
+                .fail(function(jqXHR, textStatus, error) {
+                    fail_handler(promise, jqXHR, textStatus, error);
+                });
+
+            return promise;
+        };
+
         this.delete = function(id, query_args) {
             var promise = $.Deferred();
             
@@ -371,11 +469,21 @@ define(['jquery'], function ($) {
                         return;
                     }
 
+                    // next_cursor is undefined unless the collection
+                    // supports cursor pagination and there are more items.
+                    // Pass it back as the "cursor" query argument.
+                    // total is undefined if not computed, as requested
+                    // with the "total" query argument.
+                    // missing is undefined unless specific ids were
+                    // requested with the "ids" query argument.
                     promise.resolve(
                         payload.identifiers, 
                         payload.items, 
                         payload.offset, 
-                        payload.total);
+                        payload.total,
+                        payload.next_cursor,
+                        payload.total_mode || "exact",
+                        payload.missing);
                 })
                 .fail(function(jqXHR, textStatus, error) {
                     fail_handler(promise, jqXHR, textStatus, error);
@@ -383,6 +491,11 @@ define(['jquery'], function ($) {
             
             return promise;
         };
+
+        this.retrieve_many = function(ids, query_args) {
+            query_args = $.extend({}, query_args, {ids: ids.join(",")});
+            return this.items(query_args);
+        };
     };
 
     var SingletonResource = function(type) {
@@ -419,6 +532,22 @@ define(['jquery'], function ($) {
 
         };
 
+        this.patch = function(representation, query_args) {
+            var body = JSON.stringify(representation);
+            var promise = $.Deferred();
+
+            API.request("PATCH", type, body, query_args)
+              .done(function(data, textStatus, jqXHR) {
+                    update_handler(promise, data, textStatus, jqXHR)
+                }
+              )
+              .fail(function(jqXHR, textStatus, error) {
+                  fail_handler(promise, jqXHR, textStatus, error);
+              });
+
+            return promise;
+        };
+
         this.delete = function(query_args) {
             var promise = $.Deferred();
 
@@ -450,7 +579,40 @@ define(['jquery'], function ($) {
         };
     };
     
+    var batch = function(requests) {
+        // Executes multiple requests in a single round trip. Each
+        // request is an object {method, path, query, body}, with path
+        // relative to the API root, e.g. "students/1/".
+        // Resolves with the list of {status, headers, body} responses,
+        // in the same order.
+        var body = JSON.stringify(requests);
+        var promise = $.Deferred();
+
+        API.request("POST", "_batch", body)
+            .done(function(data, textStatus, jqXHR) {
+                var payload = null;
+                try {
+                    payload = JSON.parse(data);
+                } catch (e) {
+                    // Suppress any syntax error and discard the payload
+                }
+
+                if (payload === null || !payload.responses) {
+                    console.log("Batch response had invalid payload");
+                    promise.reject(jqXHR.status, payload);
+                    return;
+                }
+                promise.resolve(payload.responses);
+            })
+            .fail(function(jqXHR, textStatus, error) {
+                fail_handler(promise, jqXHR, textStatus, error);
+            });
+
+        return promise;
+    };
+
     return {
+        "batch" : batch,
         {% for res in resources %}"{{ res['class_name'] }}" : new {% if res["singleton"] %}SingletonResource{% else %}Resource{% end %}("{{ res['bound_name'] }}"),
         {% end %}
     };
@@ -39,6 +39,17 @@ class WorkingResourceHandler(ResourceHandler):
 
         self.collection[instance.identifier] = instance
 
+    @gen.coroutine
+    def patch(self, instance, changed_fields, **kwargs):
+        if instance.identifier not in self.collection:
+            raise exceptions.NotFound()
+
+        stored_item = self.collection[instance.identifier]
+        for trait_name in changed_fields:
+            if "." not in trait_name:
+                setattr(stored_item, trait_name,
+                        getattr(instance, trait_name))
+
     @gen.coroutine
     def delete(self, instance, **kwargs):
         if instance.identifier not in self.collection:
@@ -95,6 +106,15 @@ class SingletonResourceHandler(ResourceHandler):
 
         self.instance["instance"] = instance
 
+    @gen.coroutine
+    def patch(self, instance, changed_fields, **kwargs):
+        if "instance" not in self.instance:
+            raise exceptions.NotFound()
+
+        for trait_name in changed_fields:
+            setattr(self.instance["instance"], trait_name,
+                    getattr(instance, trait_name))
+
     @gen.coroutine
     def delete(self, instance, **kwargs):
         if "instance" not in self.instance:
@@ -112,6 +132,183 @@ class StudentHandler(WorkingResourceHandler):
     resource_class = Student
 
 
+class Graduate(Resource):
+    name = Unicode()
+    age = Int()
+
+
+class AsyncCursor:
+    """Simulates an asynchronous database cursor over the given values"""
+    def __init__(self, values):
+        self._values = iter(values)
+
+    def __aiter__(self):
+        return self
+
+    @gen.coroutine
+    def __anext__(self):
+        yield gen.moment
+        try:
+            return next(self._values)
+        except StopIteration:
+            raise StopAsyncIteration()
+
+
+class GraduateHandler(WorkingResourceHandler):
+    """Streams the items, produced by an asynchronous cursor"""
+    resource_class = Graduate
+    stream_batch_size = 2
+
+    @gen.coroutine
+    def items(self, items_response, offset=None, limit=None, **kwargs):
+        offset = 0 if offset is None else offset
+        end = None if limit is None else offset + limit
+        values = list(self.collection.values())[offset:end]
+
+        items_response.set_stream(AsyncCursor(values),
+                                  offset=offset,
+                                  total=len(self.collection))
+
+
+class Course(Resource):
+    title = Unicode()
+
+
+class CourseHandler(WorkingResourceHandler):
+    """Supports keyset pagination, using the identifier as sort key,
+    and versioning of the resources"""
+    resource_class = Course
+    retrieve_calls = 0
+    items_calls = 0
+
+    @gen.coroutine
+    def version(self, instance, **kwargs):
+        if instance.identifier not in self.collection:
+            return None
+        return self.collection[instance.identifier].title
+
+    @gen.coroutine
+    def items_version(self, **kwargs):
+        return ",".join(x.title for x in self.collection.values())
+
+    @gen.coroutine
+    def retrieve(self, instance, **kwargs):
+        type(self).retrieve_calls += 1
+        yield super().retrieve(instance, **kwargs)
+
+    @gen.coroutine
+    def items(self, items_response, limit=None, cursor=None,
+              total_mode="exact", **kwargs):
+        type(self).items_calls += 1
+        values = sorted(self.collection.values(),
+                        key=lambda x: x.identifier)
+        if cursor is not None:
+            values = [x for x in values if x.identifier > cursor]
+
+        next_cursor = None
+        if limit is not None and limit < len(values):
+            values = values[:limit]
+            next_cursor = values[-1].identifier
+
+        total = len(self.collection)
+        if total_mode == "estimate":
+            total = 10 * (total // 10 + 1)
+
+        items_response.set(values,
+                           total=total,
+                           next_cursor=next_cursor,
+                           total_mode=total_mode)
+
+
+class Article(Resource):
+    title = Unicode()
+
+
+class ArticleHandler(WorkingResourceHandler):
+    """Slow to retrieve, with coalescing of concurrent reads"""
+    resource_class = Article
+    coalesce_reads = True
+    retrieve_calls = 0
+    items_calls = 0
+
+    @gen.coroutine
+    def retrieve(self, instance, **kwargs):
+        type(self).retrieve_calls += 1
+        yield gen.sleep(0.05)
+        yield super().retrieve(instance, **kwargs)
+
+    @gen.coroutine
+    def items(self, items_response, **kwargs):
+        type(self).items_calls += 1
+        yield gen.sleep(0.05)
+        yield super().items(items_response, **kwargs)
+
+
+class Planet(Resource):
+    name = Unicode()
+
+
+class PlanetHandler(WorkingResourceHandler):
+    """Reference collection with cached responses"""
+    resource_class = Planet
+    cache_ttl = 60
+    cache_max_entries = 3
+    retrieve_calls = 0
+    items_calls = 0
+
+    @gen.coroutine
+    def retrieve(self, instance, **kwargs):
+        type(self).retrieve_calls += 1
+        yield super().retrieve(instance, **kwargs)
+
+    @gen.coroutine
+    def items(self, items_response, **kwargs):
+        type(self).items_calls += 1
+        yield super().items(items_response, **kwargs)
+
+
+class Essay(Resource):
+    title = Unicode()
+    pages = Int()
+
+
+class EssayHandler(WorkingResourceHandler):
+    """Receives the request bodies in streaming"""
+    resource_class = Essay
+    stream_request_body = True
+
+
+class Lesson(Resource):
+    topic = Unicode()
+
+
+class LessonHandler(WorkingResourceHandler):
+    """Shared among requests, records the users it is called with"""
+    resource_class = Lesson
+    stateless = True
+    instances = 0
+    users = []
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        type(self).instances += 1
+
+    @gen.coroutine
+    def create(self, instance, current_user=None, **kwargs):
+        self.users.append(current_user)
+        yield super().create(instance, **kwargs)
+
+    @gen.coroutine
+    def retrieve(self, instance, current_user=None, **kwargs):
+        self.users.append(current_user)
+        yield super().retrieve(instance, **kwargs)
+
+    @gen.coroutine
+    def items(self, items_response, current_user=None, **kwargs):
+        self.users.append(current_user)
+        yield super().items(items_response, **kwargs)
+
+
 class Teacher(Resource):
     name = Unicode()
     age = Int(optional=True)
@@ -0,0 +1,48 @@
+from tornado import gen
+from tornado.testing import AsyncTestCase, gen_test
+from tornadowebapi.coalescer import Coalescer
+
+
+class TestCoalescer(AsyncTestCase):
+    @gen_test
+    def test_run(self):
+        coalescer = Coalescer()
+        calls = []
+
+        def make_func(value):
+            @gen.coroutine
+            def func():
+                calls.append(value)
+                yield gen.sleep(0.01)
+                return value
+            return func
+
+        results = yield gen.multi([coalescer.run("a", make_func(1)),
+                                   coalescer.run("a", make_func(2)),
+                                   coalescer.run("b", make_func(3))])
+        self.assertEqual(results, [1, 1, 3])
+        self.assertEqual(calls, [1, 3])
+        self.assertEqual(coalescer.requests, 3)
+        self.assertEqual(coalescer.coalesced, 1)
+        self.assertEqual(coalescer.in_flight, 0)
+
+        result = yield coalescer.run("a", make_func(4))
+        self.assertEqual(result, 4)
+
+    @gen_test
+    def test_run_with_exception(self):
+        coalescer = Coalescer()
+
+        @gen.coroutine
+        def func():
+            yield gen.sleep(0.01)
+            raise ValueError("boom")
+
+        first = coalescer.run("a", func)
+        second = coalescer.run("a", func)
+
+        for future in [first, second]:
+            with self.assertRaises(ValueError):
+                yield future
+
+        self.assertEqual(coalescer.in_flight, 0)
@@ -1,11 +1,10 @@
-import unittest
-
+from tornado.testing import AsyncTestCase, gen_test
 from tornadowebapi.items_response import ItemsResponse
-from tornadowebapi.tests.resource_handlers import Student
+from tornadowebapi.tests.resource_handlers import Student, AsyncCursor
 from traitlets import TraitError
 
 
-class TestItemsResponse(unittest.TestCase):
+class TestItemsResponse(AsyncTestCase):
     def test_set_from_list(self):
         response = ItemsResponse(Student)
 
@@ -25,6 +24,21 @@ class TestItemsResponse(unittest.TestCase):
         self.assertEqual(response.offset, 3)
         self.assertEqual(response.total, 8)
 
+    def test_set_total_mode(self):
+        response = ItemsResponse(Student)
+        items = [Student("1"), Student("2")]
+
+        response.set(items, total=100, total_mode="none")
+        self.assertIsNone(response.total)
+        self.assertEqual(response.total_mode, "none")
+
+        response.set(items, total=100, total_mode="estimate")
+        self.assertEqual(response.total, 100)
+        self.assertEqual(response.total_mode, "estimate")
+
+        with self.assertRaises(TraitError):
+            response.set(items, total_mode="whatever")
+
     def test_no_type(self):
         response = ItemsResponse(None)
 
@@ -38,3 +52,69 @@ class TestItemsResponse(unittest.TestCase):
 
         with self.assertRaises(TraitError):
             response.set("hello")
+
+    @gen_test
+    def test_fetch_next_from_list(self):
+        response = ItemsResponse(Student)
+        items = [Student("1"), Student("2"), Student("3")]
+        response.set(items, 2, 10)
+
+        self.assertFalse(response.is_streamed)
+        batch = yield response.fetch_next(2)
+        self.assertEqual(batch, items[0:2])
+        batch = yield response.fetch_next(2)
+        self.assertEqual(batch, items[2:])
+        batch = yield response.fetch_next(2)
+        self.assertEqual(batch, [])
+        self.assertEqual(response.total, 10)
+
+    @gen_test
+    def test_set_stream_from_generator(self):
+        response = ItemsResponse(Student)
+        response.set_stream((Student(str(i)) for i in range(5)), offset=3)
+
+        self.assertTrue(response.is_streamed)
+        self.assertEqual(response.items, [])
+        self.assertEqual(response.offset, 3)
+
+        batch = yield response.fetch_next(3)
+        self.assertEqual([x.identifier for x in batch], ["0", "1", "2"])
+        batch = yield response.fetch_next(3)
+        self.assertEqual([x.identifier for x in batch], ["3", "4"])
+        self.assertEqual(response.total, 5)
+
+    @gen_test
+    def test_set_stream_from_async_iterator(self):
+        response = ItemsResponse(Student)
+        response.set_stream(AsyncCursor([Student("1"), Student("2")]),
+                            total=20)
+
+        yield response.fetch_all()
+        self.assertFalse(response.is_streamed)
+        self.assertEqual([x.identifier for x in response.items], ["1", "2"])
+        self.assertEqual(response.total, 20)
+
+    @gen_test
+    def test_set_stream_wrong_type(self):
+        response = ItemsResponse(Student)
+        response.set_stream(iter(["A", "B"]))
+
+        with self.assertRaises(TypeError):
+            yield response.fetch_all()
+
+    @gen_test
+    def test_fetch_total(self):
+        response = ItemsResponse(Student)
+        response.set_stream((Student(str(i)) for i in range(7)))
+        yield response.fetch_total()
+        self.assertEqual(response.total, 7)
+        self.assertEqual(response.items, [])
+
+        consumed = []
+        response = ItemsResponse(Student)
+        response.set_stream((consumed.append(i) or Student(str(i))
+                             for i in range(7)),
+                            total=20)
+        yield response.fetch_total()
+        self.assertEqual(response.total, 20)
+        self.assertEqual(consumed, [])
@@ -1,10 +1,12 @@
+import gzip
 from collections import OrderedDict
 from unittest import mock
 
 from tornadowebapi.http import httpstatus
 from tornadowebapi.registry import Registry
+from tornadowebapi.jsapi_bundle import minify_js
 from tornadowebapi.tests.resource_handlers import (
-    StudentHandler, TeacherHandler, FrobnicatorHandler)
+    StudentHandler, TeacherHandler, FrobnicatorHandler, ServerInfoHandler)
 from tornadowebapi.tests.utils import AsyncHTTPTestCase
 from tornado import web
 
@@ -17,6 +19,7 @@ class TestJSAPIHandler(AsyncHTTPTestCase):
 
     def get_app(self):
         registry = Registry()
+        self.registry = registry
         registry.register(StudentHandler)
         registry.register(TeacherHandler)
         registry.register(FrobnicatorHandler)
@@ -34,3 +37,61 @@ class TestJSAPIHandler(AsyncHTTPTestCase):
                       res.body)
         self.assertIn(b'"Frobnicator" : new Resource("frobnicators")',
                       res.body)
+
+    def test_jsapi_caching(self):
+        res = self.fetch("/jsapi/v1/resources.js",
+                         decompress_response=False)
+        self.assertEqual(res.code, httpstatus.OK)
+        self.assertNotIn("Content-Encoding", res.headers)
+        self.assertEqual(res.headers["Cache-Control"], "public, max-age=86400")
+        etag = res.headers["Etag"]
+
+        res = self.fetch("/jsapi/v1/resources.js",
+                         headers={"If-None-Match": etag},
+                         decompress_response=False)
+        self.assertEqual(res.code, httpstatus.NOT_MODIFIED)
+
+        res = self.fetch("/jsapi/v1/resources.js",
+                         headers={"Accept-Encoding": "gzip"},
+                         decompress_response=False)
+        self.assertEqual(res.code, httpstatus.OK)
+        self.assertEqual(res.headers["Content-Encoding"], "gzip")
+        gzip_etag = res.headers["Etag"]
+        self.assertNotEqual(gzip_etag, etag)
+        body = gzip.decompress(res.body)
+        self.assertIn(b'"Student" : new Resource("students")', body)
+
+        # Matched against the ETag of the variant being served.
+        res = self.fetch("/jsapi/v1/resources.js",
+                         headers={"Accept-Encoding": "gzip",
+                                  "If-None-Match": etag},
+                         decompress_response=False)
+        self.assertEqual(res.code, httpstatus.OK)
+
+        res = self.fetch("/jsapi/v1/resources.js",
+                         headers={"Accept-Encoding": "gzip",
+                                  "If-None-Match": gzip_etag},
+                         decompress_response=False)
+        self.assertEqual(res.code, httpstatus.NOT_MODIFIED)
+
+        res = self.fetch("/jsapi/v1/resources.js",
+                         headers={"If-None-Match": gzip_etag},
+                         decompress_response=False)
+        self.assertEqual(res.code, httpstatus.OK)
+
+        res = self.fetch("/jsapi/v1/resources.js?minify=1")
+        self.assertEqual(res.code, httpstatus.OK)
+        self.assertNotEqual(res.headers["Etag"], etag)
+        self.assertLess(len(res.body), len(body))
+        self.assertEqual(res.body, minify_js(body.decode("utf-8")).encode())
+
+        self.registry.register(ServerInfoHandler)
+        res = self.fetch("/jsapi/v1/resources.js")
+        self.assertNotEqual(res.headers["Etag"], etag)
+        self.assertIn(b'"ServerInfo" : new SingletonResource("serverinfo")',
+                      res.body)
+
+    def test_minify_js(self):
+        self.assertEqual(
+            minify_js("  // comment\n\n  var a = 'b // c';\n   f();  \n"),
+            "var a = 'b // c';\nf();\n")
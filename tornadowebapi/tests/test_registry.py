@@ -5,7 +5,11 @@ from tornadowebapi.registry import Registry
 from tornadowebapi.tests.resource_handlers import (
     StudentHandler, SheepHandler, OctopusHandler, FrobnicatorHandler,
     WrongClassHandler)
+from tornadowebapi.transports import BasicRESTTransport, MsgPackTransport
 from tornadowebapi.transports.base_transport import BaseTransport
+from tornadowebapi.resource import Resource
+from tornadowebapi.resource_handler import ResourceHandler
+from tornadowebapi.singleton_resource import SingletonResource
 
 
 class TestRegistry(unittest.TestCase):
@@ -36,6 +40,21 @@ class TestRegistry(unittest.TestCase):
         with self.assertRaises(ValueError):
             reg.register(StudentHandler)
 
+    def test_reserved_names(self):
+        reg = Registry()
+
+        class batch(Resource):
+            pass
+
+        class _batch(SingletonResource):
+            pass
+
+        for resource_class in [batch, _batch]:
+            handler = type("Handler", (ResourceHandler,),
+                           {"resource_class": resource_class})
+            with self.assertRaises(ValueError):
+                reg.register(handler)
+
     def test_incorrect_class_registration(self):
         reg = Registry()
 
@@ -56,15 +75,50 @@ class TestRegistry(unittest.TestCase):
     def test_api_handlers(self):
         reg = Registry()
         api_handlers = reg.api_handlers("/foo")
-        self.assertEqual(len(api_handlers), 3)
+        self.assertEqual(len(api_handlers), 4)
 
         self.assertEqual(api_handlers[0][2]["registry"], reg)
         self.assertEqual(api_handlers[1][2]["registry"], reg)
+        self.assertEqual(api_handlers[2][2]["registry"], reg)
 
     def test_transport(self):
         reg = Registry()
         self.assertIsInstance(reg.transport, BaseTransport)
 
         mock_transport = mock.Mock(spec=BaseTransport)
+        mock_transport.content_type = "application/x-mock"
         reg = Registry(transport=mock_transport)
         self.assertEqual(reg.transport, mock_transport)
+
+    def test_transport_negotiation(self):
+        json_transport = BasicRESTTransport()
+        msgpack_transport = MsgPackTransport()
+        reg = Registry(transport=json_transport)
+        reg.add_transport(msgpack_transport)
+        self.assertEqual(reg.transports, (json_transport, msgpack_transport))
+
+        with self.assertRaises(ValueError):
+            reg.add_transport(BasicRESTTransport())
+
+        for content_type, expected in [
+                (None, json_transport),
+                ("", json_transport),
+                ("text/plain", json_transport),
+                ("application/json", json_transport),
+                ("application/msgpack", msgpack_transport),
+                ("Application/MsgPack; charset=binary", msgpack_transport)]:
+            self.assertIs(reg.request_transport(content_type), expected)
+
+        for accept, expected in [
+                (None, json_transport),
+                ("*/*", json_transport),
+                ("text/html", json_transport),
+                ("application/msgpack", msgpack_transport),
+                ("application/json;q=0.5, application/msgpack",
+                 msgpack_transport),
+                ("application/*;q=0.5, application/json;q=0.1",
+                 msgpack_transport),
+                ("application/msgpack;q=0, */*", json_transport)]:
+            self.assertIs(reg.response_transport(accept), expected)
+            # Remembered
+            self.assertIs(reg.response_transport(accept), expected)
@@ -1,7 +1,9 @@
 import unittest
 
 from tornadowebapi.resource_fragment import ResourceFragment
-from tornadowebapi.resource import Resource, mandatory_absents, is_valid
+from tornadowebapi.resource import (
+    Resource, mandatory_absents, is_valid, validate_fields, select_fields,
+    present_fields)
 from tornadowebapi.traitlets import Int, Unicode, OneOf, Absent
 
 
@@ -144,3 +146,39 @@ class TestResource(unittest.TestCase):
 
         with self.assertRaises(ValueError):
             mandatory_absents(j, "whatever")
+
+    def test_validate_fields(self):
+        validate_fields(Teacher, {"name", "classroom", "classroom.floor"})
+        validate_fields(Teacher, set())
+
+        for fields in [{"whatever"},
+                       {"classroom.whatever"},
+                       {"name.floor"},
+                       {"name", "classroom.floor.whatever"}]:
+            with self.assertRaises(ValueError):
+                validate_fields(Teacher, fields)
+
+    def test_select_fields(self):
+        paths = {"name", "classroom", "classroom.floor",
+                 "alternative_classroom.floor"}
+        self.assertEqual(select_fields(paths, {"name"}), {"name"})
+        self.assertEqual(select_fields(paths, {"classroom"}),
+                         {"classroom", "classroom.floor"})
+        self.assertEqual(select_fields(paths, {"classroom.name"}),
+                         {"classroom"})
+        self.assertEqual(select_fields(paths, {"alternative_classroom.name"}),
+                         set())
+
+    def test_present_fields(self):
+        self.assertEqual(present_fields(Teacher("1")), set())
+        self.assertEqual(
+            present_fields(Teacher("1",
+                                   name="john",
+                                   classroom=Classroom(floor=2))),
+            {"name", "classroom", "classroom.floor"})
+        self.assertEqual(
+            present_fields(Job("1", params="x", status="done")),
+            {"params"})
+
+        with self.assertRaises(TypeError):
+            present_fields(None)
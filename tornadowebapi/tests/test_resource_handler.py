@@ -25,6 +25,18 @@ class TestResourceHandler(AsyncTestCase):
         with self.assertRaises(NotImplementedError):
             yield handler.items(Mock())
 
+        with self.assertRaises(NotImplementedError):
+            yield handler.create_many([Mock()])
+
+        with self.assertRaises(NotImplementedError):
+            yield handler.update_many([Mock()])
+
+        with self.assertRaises(NotImplementedError):
+            yield handler.patch_many([Mock()], [set()])
+
+        with self.assertRaises(NotImplementedError):
+            yield handler.delete_many([Mock()])
+
     def test_bound_name(self):
         handler = ResourceHandler(Mock(), Mock())
 
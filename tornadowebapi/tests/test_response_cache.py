@@ -0,0 +1,88 @@
+import unittest
+
+from tornadowebapi.response_cache import ResponseCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0
+
+    def __call__(self):
+        return self.now
+
+
+class TestResponseCache(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.cache = ResponseCache(clock=self.clock)
+
+    def test_get_put(self):
+        cache = self.cache
+        self.assertIsNone(cache.get("students", "1", "v"))
+
+        cache.put("students", "1", "v", "hello", ttl=10)
+        self.assertEqual(cache.get("students", "1", "v"), "hello")
+        self.assertIsNone(cache.get("students", "1", "w"))
+        self.assertIsNone(cache.get("teachers", "1", "v"))
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(cache.misses, 3)
+
+        self.clock.now = 10
+        self.assertIsNone(cache.get("students", "1", "v"))
+        self.assertEqual(len(cache), 0)
+
+    def test_eviction(self):
+        cache = self.cache
+        cache.put("students", "1", "v", "a", ttl=10, max_entries=2)
+        cache.put("students", "2", "v", "b", ttl=10, max_entries=2)
+        cache.get("students", "1", "v")
+        cache.put("students", "3", "v", "c", ttl=10, max_entries=2)
+
+        self.assertEqual(cache.evictions, 1)
+        self.assertIsNone(cache.get("students", "2", "v"))
+        self.assertEqual(cache.get("students", "1", "v"), "a")
+
+        cache.put("students", "4", "v", "d" * 10, ttl=10, max_bytes=10)
+        self.assertEqual(len(cache), 1)
+        self.assertEqual(cache.evictions, 3)
+
+        cache.put("students", "5", "v", "e" * 11, ttl=10, max_bytes=10)
+        self.assertIsNone(cache.get("students", "5", "v"))
+
+    def test_invalidate(self):
+        cache = self.cache
+        cache.put("students", "1", "v", "a", ttl=10)
+        cache.put("students", "2", "v", "b", ttl=10)
+        cache.put("students", None, "v", "c", ttl=10)
+        cache.put("teachers", "1", "v", "d", ttl=10)
+
+        generation = cache.generation("students")
+        cache.invalidate("students", "1")
+        self.assertIsNone(cache.get("students", "1", "v"))
+        self.assertIsNone(cache.get("students", None, "v"))
+        self.assertEqual(cache.get("students", "2", "v"), "b")
+        self.assertEqual(cache.get("teachers", "1", "v"), "d")
+
+        # Stale payloads are not stored
+        cache.put("students", "1", "v", "a", ttl=10, generation=generation)
+        self.assertIsNone(cache.get("students", "1", "v"))
+
+        cache.invalidate("students")
+        self.assertIsNone(cache.get("students", "2", "v"))
+
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+    def test_invalidate_empty(self):
+        cache = self.cache
+
+        # Obtained before a modification, with nothing cached yet.
+        generation = cache.generation("students")
+        cache.invalidate("students", "1")
+        cache.put("students", None, "v", "a", ttl=10, generation=generation)
+        self.assertIsNone(cache.get("students", None, "v"))
+
+        generation = cache.generation("teachers")
+        cache.clear()
+        cache.put("teachers", "1", "v", "b", ttl=10, generation=generation)
+        self.assertIsNone(cache.get("teachers", "1", "v"))
@@ -0,0 +1,36 @@
+import unittest
+
+from tornadowebapi.timing import Timer, NullTimer, NULL_TIMER
+
+
+class TestTimer(unittest.TestCase):
+    def test_stages(self):
+        now = [0.0]
+        timer = Timer(clock=lambda: now[0])
+
+        with timer.stage("parse"):
+            now[0] += 0.002
+
+        for _ in range(2):
+            with timer.stage("render"):
+                now[0] += 0.0015
+
+        with self.assertRaises(ValueError):
+            with timer.stage("parse"):
+                now[0] += 0.001
+                raise ValueError()
+
+        self.assertEqual(list(timer.durations), ["parse", "render"])
+        self.assertAlmostEqual(timer.durations["parse"], 0.003)
+        self.assertAlmostEqual(timer.durations["render"], 0.003)
+        self.assertEqual(timer.server_timing(),
+                         "parse;dur=3.000, render;dur=3.000")
+
+    def test_null_timer(self):
+        self.assertIsInstance(NULL_TIMER, NullTimer)
+        with NULL_TIMER.stage("parse"):
+            pass
+        NULL_TIMER.add("parse", 1.0)
+
+        self.assertEqual(len(NULL_TIMER.durations), 0)
+        self.assertEqual(NULL_TIMER.server_timing(), "")
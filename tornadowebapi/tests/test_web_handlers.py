@@ -43,3 +43,18 @@ class TestWebHandlers(unittest.TestCase):
 
         with self.assertRaises(TypeError):
             handler._send_created_to_client("whatever")
+
+    def test_write_payload(self):
+        handler = WithoutIdentifierWebHandler(MagicMock(), MagicMock(),
+                                              registry=MagicMock(),
+                                              base_urlpath="/",
+                                              api_version="1")
+        chunk = b'{"a": 1}'
+        handler._write_payload([chunk, b", "])
+        handler._write_payload("\u00e8")
+        self.assertIs(handler._write_buffer[0], chunk)
+        self.assertEqual(b"".join(handler._write_buffer),
+                         b'{"a": 1}, \xc3\xa8')
+
+        with self.assertRaises(TypeError):
+            handler._write_payload({"a": 1})
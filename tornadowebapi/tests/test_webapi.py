@@ -1,17 +1,22 @@
+import gzip
 import unittest
 import urllib.parse
+import zlib
 from collections import OrderedDict
 from unittest import mock
 
-from tornado.testing import LogTrapTestCase
+from tornado.testing import LogTrapTestCase, gen_test
+from tornadowebapi.codecs import PureMsgPackCodec
 from tornadowebapi.http import httpstatus
 from tornadowebapi.registry import Registry
+from tornadowebapi.transports import MsgPackTransport
 from tornadowebapi.traitlets import Absent
 from tornadowebapi.web_handlers import (
-    WithIdentifierWebHandler, WithoutIdentifierWebHandler)
+    BatchWebHandler, WithIdentifierWebHandler, WithoutIdentifierWebHandler,
+    StreamedWithIdentifierWebHandler, StreamedWithoutIdentifierWebHandler)
 from tornadowebapi.tests import resource_handlers
 from tornadowebapi.tests.utils import AsyncHTTPTestCase
-from tornado import web, escape
+from tornado import web, escape, gen
 
 ALL_RESOURCES = (
     resource_handlers.AlreadyPresentHandler,
@@ -24,6 +29,13 @@ ALL_RESOURCES = (
     resource_handlers.UnprocessableHandler,
     resource_handlers.UnsupportAllHandler,
     resource_handlers.StudentHandler,
+    resource_handlers.GraduateHandler,
+    resource_handlers.CourseHandler,
+    resource_handlers.CityHandler,
+    resource_handlers.ArticleHandler,
+    resource_handlers.PlanetHandler,
+    resource_handlers.LessonHandler,
+    resource_handlers.EssayHandler,
     resource_handlers.TeacherHandler,
     resource_handlers.InvalidIdentifierHandler,
     resource_handlers.OurExceptionInvalidIdentifierHandler,
@@ -36,15 +48,33 @@ class TestWebAPI(AsyncHTTPTestCase, LogTrapTestCase):
         super().setUp()
         resource_handlers.StudentHandler.collection = OrderedDict()
         resource_handlers.StudentHandler.id = 0
+        resource_handlers.GraduateHandler.collection = OrderedDict()
+        resource_handlers.CourseHandler.collection = OrderedDict()
+        resource_handlers.CourseHandler.retrieve_calls = 0
+        resource_handlers.CourseHandler.items_calls = 0
+        resource_handlers.CityHandler.collection = OrderedDict()
+        resource_handlers.ArticleHandler.collection = OrderedDict()
+        resource_handlers.ArticleHandler.retrieve_calls = 0
+        resource_handlers.ArticleHandler.items_calls = 0
+        resource_handlers.PlanetHandler.collection = OrderedDict()
+        resource_handlers.LessonHandler.collection = OrderedDict()
+        resource_handlers.LessonHandler.instances = 0
+        resource_handlers.LessonHandler.users = []
+        resource_handlers.PlanetHandler.id = 0
+        resource_handlers.PlanetHandler.retrieve_calls = 0
+        resource_handlers.PlanetHandler.items_calls = 0
         resource_handlers.ServerInfoHandler.instance = {}
         resource_handlers.StudentHandler.id = 0
+        resource_handlers.EssayHandler.collection = OrderedDict()
+        resource_handlers.EssayHandler.id = 0
 
     def get_app(self):
         registry = Registry()
-        handlers = registry.api_handlers('/')
+        self.registry = registry
         for resource in ALL_RESOURCES:
             registry.register(resource)
-        app = web.Application(handlers=handlers)
+        handlers = registry.api_handlers('/')
+        app = web.Application(handlers=handlers, cookie_secret="secret")
         app.hub = mock.Mock()
         return app
 
@@ -197,6 +227,157 @@ class TestWebAPI(AsyncHTTPTestCase, LogTrapTestCase):
                              "identifiers": ["2"],
                          })
 
+    def test_items_streamed(self):
+        res = self.fetch("/api/v1/graduates/")
+
+        self.assertEqual(res.code, httpstatus.OK)
+        self.assertEqual(res.headers["Content-Type"], "application/json")
+        self.assertEqual(escape.json_decode(res.body),
+                         {
+                             "total": 0,
+                             "offset": 0,
+                             "items": {},
+                             "identifiers": []
+                         })
+
+        handler = resource_handlers.GraduateHandler
+        for i in range(5):
+            handler.collection[str(i)] = handler.resource_class(
+                identifier=str(i),
+                name="john wick {}".format(i),
+                age=39)
+
+        res = self.fetch("/api/v1/graduates/?offset=1&limit=3")
+        self.assertEqual(res.code, httpstatus.OK)
+        self.assertEqual(res.headers["Transfer-Encoding"], "chunked")
+        self.assertEqual(escape.json_decode(res.body),
+                         {
+                             "total": 5,
+                             "offset": 1,
+                             "items": {
+                                 "1": {"name": "john wick 1", "age": 39},
+                                 "2": {"name": "john wick 2", "age": 39},
+                                 "3": {"name": "john wick 3", "age": 39},
+                             },
+                             "identifiers": ["1", "2", "3"]
+                         })
+
+    def test_items_with_cursor(self):
+        handler = resource_handlers.CourseHandler
+        for identifier in ["a", "b", "c", "d", "e"]:
+            handler.collection[identifier] = handler.resource_class(
+                identifier=identifier,
+                title="course " + identifier)
+
+        res = self.fetch("/api/v1/courses/?limit=2")
+        self.assertEqual(res.code, httpstatus.OK)
+        payload = escape.json_decode(res.body)
+        self.assertEqual(payload["identifiers"], ["a", "b"])
+        self.assertEqual(payload["total"], 5)
+        cursor = payload["next_cursor"]
+        self.assertNotEqual(cursor, "b")
+
+        res = self.fetch("/api/v1/courses/?" + urllib.parse.urlencode(
+            {"limit": 2, "cursor": cursor}))
+        self.assertEqual(res.code, httpstatus.OK)
+        payload = escape.json_decode(res.body)
+        self.assertEqual(payload["identifiers"], ["c", "d"])
+        self.assertEqual(payload["items"]["c"], {"title": "course c"})
+
+        res = self.fetch("/api/v1/courses/?" + urllib.parse.urlencode(
+            {"limit": 2, "cursor": payload["next_cursor"]}))
+        self.assertEqual(res.code, httpstatus.OK)
+        payload = escape.json_decode(res.body)
+        self.assertEqual(payload["identifiers"], ["e"])
+        self.assertNotIn("next_cursor", payload)
+
+        # Tampered and forged cursors are rejected
+        res = self.fetch("/api/v1/courses/?" + urllib.parse.urlencode(
+            {"cursor": cursor[:-1]}))
+        self.assertEqual(res.code, httpstatus.BAD_REQUEST)
+
+        res = self.fetch("/api/v1/courses/?cursor=%22b%22")
+        self.assertEqual(res.code, httpstatus.BAD_REQUEST)
+
+        # The tokens are deterministic, so the hash ETags of the pages match
+        @gen.coroutine
+        def items_version(self, **kwargs):
+            return None
+
+        with mock.patch.object(handler, "items_version", items_version):
+            res = self.fetch("/api/v1/courses/?limit=2")
+            self.assertEqual(escape.json_decode(res.body)["next_cursor"],
+                             cursor)
+            res = self.fetch("/api/v1/courses/?limit=2",
+                             headers={"If-None-Match": res.headers["Etag"]})
+            self.assertEqual(res.code, httpstatus.NOT_MODIFIED)
+
+        # Cursors are not accepted without cookie_secret
+        del self._app.settings["cookie_secret"]
+        res = self.fetch("/api/v1/courses/?" + urllib.parse.urlencode(
+            {"cursor": cursor}))
+        self.assertEqual(res.code, httpstatus.BAD_REQUEST)
+
+    def test_items_with_total_mode(self):
+        handler = resource_handlers.CourseHandler
+        for identifier in ["a", "b", "c"]:
+            handler.collection[identifier] = handler.resource_class(
+                identifier=identifier,
+                title="course " + identifier)
+
+        res = self.fetch("/api/v1/courses/?total=none")
+        self.assertEqual(res.code, httpstatus.OK)
+        payload = escape.json_decode(res.body)
+        self.assertNotIn("total", payload)
+        self.assertEqual(payload["total_mode"], "none")
+        self.assertEqual(payload["identifiers"], ["a", "b", "c"])
+
+        res = self.fetch("/api/v1/courses/?total=estimate")
+        payload = escape.json_decode(res.body)
+        self.assertEqual(payload["total"], 10)
+        self.assertEqual(payload["total_mode"], "estimate")
+
+        res = self.fetch("/api/v1/courses/?total=exact")
+        payload = escape.json_decode(res.body)
+        self.assertEqual(payload["total"], 3)
+        self.assertNotIn("total_mode", payload)
+
+        res = self.fetch("/api/v1/courses/?total=whatever")
+        self.assertEqual(res.code, httpstatus.BAD_REQUEST)
+
+    def test_items_with_fields(self):
+        handler = resource_handlers.CityHandler
+        handler.collection["1"] = handler.resource_class(
+            identifier="1",
+            name="Cambridge",
+            mayor=resource_handlers.Person(name="Jeremy", age=50))
+        # Mandatory data outside the requested fields can be missing
+        handler.collection["2"] = handler.resource_class(
+            identifier="2",
+            mayor=resource_handlers.Person(name="Lucy"))
+
+        res = self.fetch("/api/v1/citys/?fields=mayor.name")
+        self.assertEqual(res.code, httpstatus.OK)
+        self.assertEqual(escape.json_decode(res.body)["items"],
+                         {"1": {"mayor": {"name": "Jeremy"}},
+                          "2": {"mayor": {"name": "Lucy"}}})
+
+        res = self.fetch("/api/v1/citys/1/?fields=name&fields=mayor.age")
+        self.assertEqual(res.code, httpstatus.OK)
+        self.assertEqual(escape.json_decode(res.body),
+                         {"name": "Cambridge", "mayor": {"age": 50}})
+
+        res = self.fetch("/api/v1/citys/2/?fields=name")
+        self.assertEqual(res.code, httpstatus.INTERNAL_SERVER_ERROR)
+
+        res = self.fetch("/api/v1/citys/1/?fields=name,whatever")
+        self.assertEqual(res.code, httpstatus.BAD_REQUEST)
+        self.assertEqual(escape.json_decode(res.body)["type"],
+                         "BadQueryArguments")
+
+        res = self.fetch("/api/v1/citys/?fields=mayor.whatever")
+        self.assertEqual(res.code, httpstatus.BAD_REQUEST)
+
     def test_items_with_broken_limit_offset(self):
         res = self.fetch("/api/v1/students/?limit=hello")
 
@@ -314,6 +495,583 @@ class TestWebAPI(AsyncHTTPTestCase, LogTrapTestCase):
         )
         self.assertEqual(res.code, httpstatus.BAD_REQUEST)
 
+    def test_create_many(self):
+        res = self.fetch(
+            "/api/v1/students/",
+            method="POST",
+            body=escape.json_encode([
+                {"name": "john wick", "age": 19},
+                {"name": "john wick"},
+                {"name": "jane wick", "age": "hello"},
+                {"name": "jane wick", "age": 21},
+            ])
+        )
+
+        self.assertEqual(res.code, httpstatus.MULTI_STATUS)
+        items = escape.json_decode(res.body)["items"]
+        self.assertEqual([item["status"] for item in items],
+                         [201, 400, 400, 201])
+        self.assertEqual(items[0]["identifier"], "0")
+        self.assertEqual(
+            urllib.parse.urlparse(items[0]["location"]).path,
+            "/api/v1/students/0/")
+        self.assertEqual(items[1]["error"]["type"], "BadRepresentation")
+        self.assertEqual(items[3]["identifier"], "1")
+
+        res = self.fetch("/api/v1/students/")
+        self.assertEqual(escape.json_decode(res.body)["identifiers"],
+                         ["0", "1"])
+
+        res = self.fetch(
+            "/api/v1/students/",
+            method="POST",
+            body=escape.json_encode([
+                {"name": "jack wick", "age": 22},
+            ])
+        )
+        self.assertEqual(res.code, httpstatus.CREATED)
+        self.assertEqual(escape.json_decode(res.body),
+                         {"items": [{
+                             "status": 201,
+                             "identifier": "2",
+                             "location": res.effective_url + "2/"}]})
+
+        res = self.fetch(
+            "/api/v1/unsupportalls/",
+            method="POST",
+            body="[{}]"
+        )
+        self.assertEqual(res.code, httpstatus.METHOD_NOT_ALLOWED)
+
+    def test_retrieve_many(self):
+        for name in ["john wick", "jane wick", "jack wick"]:
+            self.fetch(
+                "/api/v1/students/",
+                method="POST",
+                body=escape.json_encode({"name": name, "age": 19}))
+
+        res = self.fetch("/api/v1/students/?ids=2,7,0&ids=2")
+        self.assertEqual(res.code, httpstatus.OK)
+        self.assertEqual(escape.json_decode(res.body),
+                         {"identifiers": ["2", "0"],
+                          "items": {
+                              "0": {"name": "john wick", "age": 19},
+                              "2": {"name": "jack wick", "age": 19}},
+                          "offset": 0,
+                          "total": 2,
+                          "missing": ["7"]})
+
+        res = self.fetch("/api/v1/students/?ids=1&fields=name")
+        self.assertEqual(escape.json_decode(res.body)["items"],
+                         {"1": {"name": "jane wick"}})
+
+        res = self.fetch("/api/v1/invalididentifiers/?ids=1")
+        self.assertEqual(res.code, httpstatus.OK)
+        self.assertEqual(escape.json_decode(res.body)["missing"], ["1"])
+
+        res = self.fetch("/api/v1/unsupportalls/?ids=1")
+        self.assertEqual(res.code, httpstatus.METHOD_NOT_ALLOWED)
+
+        ids = ",".join(str(i) for i in range(101))
+        res = self.fetch("/api/v1/students/?ids=" + ids)
+        self.assertEqual(res.code, httpstatus.BAD_REQUEST)
+        self.assertEqual(escape.json_decode(res.body)["type"],
+                         "BadQueryArguments")
+
+        res = self.fetch("/api/v1/students/?ids=" + ids, method="DELETE")
+        self.assertEqual(res.code, httpstatus.BAD_REQUEST)
+        self.assertEqual(escape.json_decode(res.body)["type"],
+                         "BadQueryArguments")
+        self.assertEqual(len(resource_handlers.StudentHandler.collection), 3)
+
+        with mock.patch.object(resource_handlers.StudentHandler,
+                               "max_ids", None):
+            res = self.fetch("/api/v1/students/?ids=" + ids)
+            self.assertEqual(res.code, httpstatus.OK)
+            self.assertEqual(len(escape.json_decode(res.body)["missing"]),
+                             98)
+
+    def test_compression(self):
+        handler = resource_handlers.StudentHandler
+        for i in range(20):
+            handler.collection[str(i)] = resource_handlers.Student(
+                identifier=str(i),
+                name="john wick {}".format(i),
+                age=39)
+
+        # Disabled by default
+        res = self.fetch("/api/v1/students/",
+                         headers={"Accept-Encoding": "gzip"},
+                         decompress_response=False)
+        self.assertEqual(res.code, httpstatus.OK)
+        self.assertNotIn("Content-Encoding", res.headers)
+        expected = escape.json_decode(res.body)
+
+        self.registry.transport.compression_min_size = 100
+
+        res = self.fetch("/api/v1/students/",
+                         headers={"Accept-Encoding": "deflate, gzip;q=0.5"},
+                         decompress_response=False)
+        self.assertEqual(res.code, httpstatus.OK)
+        self.assertEqual(res.headers["Content-Encoding"], "deflate")
+        self.assertEqual(res.headers["Vary"], "Accept-Encoding")
+        self.assertEqual(escape.json_decode(zlib.decompress(res.body)),
+                         expected)
+
+        res = self.fetch("/api/v1/students/",
+                         headers={"Accept-Encoding": "br"},
+                         decompress_response=False)
+        self.assertNotIn("Content-Encoding", res.headers)
+        self.assertEqual(escape.json_decode(res.body), expected)
+
+        # Below the threshold
+        res = self.fetch("/api/v1/students/1/",
+                         headers={"Accept-Encoding": "gzip"},
+                         decompress_response=False)
+        self.assertNotIn("Content-Encoding", res.headers)
+        self.assertEqual(res.headers["Vary"], "Accept-Encoding")
+
+        # Streamed
+        for i in range(20):
+            resource_handlers.GraduateHandler.collection[str(i)] = \
+                resource_handlers.Graduate(identifier=str(i),
+                                           name="john wick {}".format(i),
+                                           age=39)
+
+        res = self.fetch("/api/v1/graduates/",
+                         headers={"Accept-Encoding": "gzip"},
+                         decompress_response=False)
+        self.assertEqual(res.headers["Content-Encoding"], "gzip")
+        self.assertEqual(escape.json_decode(gzip.decompress(res.body)),
+                         expected)
+
+        # Compressed request bodies
+        res = self.fetch("/api/v1/students/",
+                         method="POST",
+                         headers={"Content-Encoding": "gzip"},
+                         body=gzip.compress(escape.utf8(escape.json_encode(
+                             {"name": "john wick", "age": 19}))))
+        self.assertEqual(res.code, httpstatus.CREATED)
+
+        res = self.fetch("/api/v1/students/",
+                         method="POST",
+                         headers={"Content-Encoding": "gzip"},
+                         body=b"whatever")
+        self.assertEqual(res.code, httpstatus.BAD_REQUEST)
+        self.assertEqual(escape.json_decode(res.body)["type"],
+                         "BadRepresentation")
+
+        res = self.fetch("/api/v1/students/",
+                         method="POST",
+                         headers={"Content-Encoding": "br"},
+                         body=b"whatever")
+        self.assertEqual(res.code, httpstatus.UNSUPPORTED_MEDIA_TYPE)
+
+        self.registry.transport.max_decompressed_size = 10
+        res = self.fetch("/api/v1/students/",
+                         method="POST",
+                         headers={"Content-Encoding": "gzip"},
+                         body=gzip.compress(b" " * 100))
+        self.assertEqual(res.code, httpstatus.REQUEST_ENTITY_TOO_LARGE)
+
+    def test_max_body_size(self):
+        body = escape.json_encode({"title": "tornado", "pages": 19})
+
+        with mock.patch.object(resource_handlers.EssayHandler,
+                               "max_body_size", len(body)):
+            res = self.fetch("/api/v1/essays/", method="POST", body=body)
+            self.assertEqual(res.code, httpstatus.CREATED)
+
+            res = self.fetch("/api/v1/essays/0/",
+                             method="PUT",
+                             body=body + " ")
+            self.assertEqual(res.code, httpstatus.REQUEST_ENTITY_TOO_LARGE)
+
+            res = self.fetch(
+                "/api/v1/_batch/",
+                method="POST",
+                body=escape.json_encode([
+                    {"method": "POST",
+                     "path": "essays/",
+                     "body": {"title": "tornado", "pages": 1000000000}}]))
+            self.assertEqual(res.code, httpstatus.OK)
+            responses = escape.json_decode(res.body)["responses"]
+            self.assertEqual(responses[0]["status"],
+                             httpstatus.REQUEST_ENTITY_TOO_LARGE)
+
+        res = self.fetch("/api/v1/essays/0/",
+                         method="PUT",
+                         body=body + " ")
+        self.assertEqual(res.code, httpstatus.NO_CONTENT)
+
+    def test_stream_request_body(self):
+        handler = resource_handlers.EssayHandler
+
+        res = self.fetch("/api/v1/essays/",
+                         method="POST",
+                         body=escape.json_encode(
+                             {"title": "tornado", "pages": 19}))
+        self.assertEqual(res.code, httpstatus.CREATED)
+
+        res = self.fetch("/api/v1/essays/",
+                         method="POST",
+                         headers={"Content-Encoding": "gzip"},
+                         body=gzip.compress(escape.utf8(
+                             escape.json_encode([
+                                 {"title": "rest", "pages": 20},
+                                 {"title": "crud", "pages": 21}]))))
+        self.assertEqual(res.code, httpstatus.CREATED)
+
+        res = self.fetch("/api/v1/essays/0/",
+                         method="PATCH",
+                         body=escape.json_encode({"pages": 39}))
+        self.assertEqual(res.code, httpstatus.NO_CONTENT)
+        self.assertEqual(handler.collection["0"].pages, 39)
+
+        res = self.fetch("/api/v1/essays/0/",
+                         method="PUT",
+                         body='{"title": "tornado"')
+        self.assertEqual(res.code, httpstatus.BAD_REQUEST)
+        self.assertEqual(escape.json_decode(res.body)["type"],
+                         "BadRepresentation")
+
+        res = self.fetch("/api/v1/essays/",
+                         method="POST",
+                         headers={"Content-Encoding": "gzip"},
+                         body=gzip.compress(b"{}")[:-4])
+        self.assertEqual(res.code, httpstatus.BAD_REQUEST)
+
+        self.registry.transport.max_decompressed_size = 10
+        res = self.fetch("/api/v1/essays/",
+                         method="POST",
+                         headers={"Content-Encoding": "gzip"},
+                         body=gzip.compress(b" " * 100))
+        self.assertEqual(res.code, httpstatus.REQUEST_ENTITY_TOO_LARGE)
+
+        self.assertEqual(len(handler.collection), 3)
+
+    def test_buffered_request_body(self):
+        bodies = []
+
+        class BodyAuthenticator:
+            @classmethod
+            @gen.coroutine
+            def authenticate(cls, handler):
+                bodies.append(handler.request.body)
+                return "john"
+
+        self.registry.authenticator = BodyAuthenticator
+        body = escape.json_encode({"name": "john wick", "age": 19})
+
+        res = self.fetch("/api/v1/students/", method="POST", body=body)
+        self.assertEqual(res.code, httpstatus.CREATED)
+        res = self.fetch("/api/v1/students/0/", method="PUT", body=body)
+        self.assertEqual(res.code, httpstatus.NO_CONTENT)
+        self.assertEqual(bodies, [escape.utf8(body)] * 2)
+
+        # Not available to the authenticator when streamed.
+        res = self.fetch("/api/v1/essays/",
+                         method="POST",
+                         body=escape.json_encode(
+                             {"title": "tornado", "pages": 19}))
+        self.assertEqual(res.code, httpstatus.CREATED)
+        self.assertNotIsInstance(bodies[-1], bytes)
+
+    def test_server_timing(self):
+        res = self.fetch("/api/v1/students/",
+                         method="POST",
+                         body=escape.json_encode(
+                             {"name": "john wick", "age": 19}))
+        self.assertEqual(res.code, httpstatus.CREATED)
+        self.assertNotIn("Server-Timing", res.headers)
+
+        self.registry.server_timing = True
+        res = self.fetch("/api/v1/students/0/")
+        self.assertEqual(res.code, httpstatus.OK)
+        stages = [metric.split(";")[0]
+                  for metric in res.headers["Server-Timing"].split(", ")]
+        self.assertEqual(stages, ["authenticate", "deserialize", "handler",
+                                  "check", "serialize", "render"])
+
+        observed = []
+        self.registry.server_timing = False
+        self.registry.timing_observer = (
+            lambda handler, durations: observed.append(
+                (handler.request.method, list(durations))))
+
+        res = self.fetch("/api/v1/students/0/",
+                         method="PUT",
+                         body=escape.json_encode(
+                             {"name": "john wick", "age": 20}))
+        self.assertEqual(res.code, httpstatus.NO_CONTENT)
+        self.assertNotIn("Server-Timing", res.headers)
+        self.assertEqual(observed, [
+            ("PUT", ["authenticate", "parse", "deserialize", "check",
+                     "handler"])])
+
+    def test_transport_negotiation(self):
+        self.registry.add_transport(MsgPackTransport())
+        codec = PureMsgPackCodec()
+
+        res = self.fetch("/api/v1/planets/",
+                         method="POST",
+                         headers={"Content-Type": "application/msgpack"},
+                         body=codec.encode({"name": "mars"}))
+        self.assertEqual(res.code, httpstatus.CREATED)
+
+        res = self.fetch("/api/v1/planets/0/")
+        self.assertEqual(res.headers["Content-Type"], "application/json")
+        self.assertEqual(res.headers["Vary"], "Accept")
+        self.assertEqual(escape.json_decode(res.body), {"name": "mars"})
+
+        # Not served from the cached JSON response
+        res = self.fetch("/api/v1/planets/0/",
+                         headers={"Accept": "application/msgpack"})
+        self.assertEqual(res.headers["Content-Type"], "application/msgpack")
+        self.assertEqual(codec.decode(res.body), {"name": "mars"})
+
+        res = self.fetch("/api/v1/planets/0/",
+                         method="PUT",
+                         headers={"Accept": "application/msgpack",
+                                  "Content-Type": "application/msgpack"},
+                         body=b"\xc1")
+        self.assertEqual(res.code, httpstatus.BAD_REQUEST)
+        self.assertEqual(codec.decode(res.body)["type"], "BadRepresentation")
+
+        res = self.fetch(
+            "/api/v1/_batch/",
+            method="POST",
+            headers={"Accept": "application/msgpack"},
+            body=escape.json_encode([
+                {"method": "PUT",
+                 "path": "planets/0/",
+                 "body": {"name": "venus"}},
+                {"method": "GET",
+                 "path": "planets/0/"}]))
+        self.assertEqual(res.code, httpstatus.OK)
+        responses = codec.decode(res.body)["responses"]
+        self.assertEqual([response["status"] for response in responses],
+                         [204, 200])
+        self.assertEqual(responses[1]["body"], {"name": "venus"})
+
+    def test_stateless_handler(self):
+        class Authenticator:
+            @classmethod
+            @gen.coroutine
+            def authenticate(cls, handler):
+                return handler.get_query_argument("user", None)
+
+        self.registry.authenticator = Authenticator
+
+        res = self.fetch("/api/v1/lessons/?user=john",
+                         method="POST",
+                         body=escape.json_encode({"topic": "maths"}))
+        self.assertEqual(res.code, httpstatus.CREATED)
+
+        res = self.fetch("/api/v1/lessons/0/?user=jane")
+        self.assertEqual(res.code, httpstatus.OK)
+
+        res = self.fetch("/api/v1/lessons/?current_user=jane")
+        self.assertEqual(res.code, httpstatus.OK)
+
+        handler_class = resource_handlers.LessonHandler
+        self.assertEqual(handler_class.instances, 1)
+        self.assertEqual(handler_class.users, ["john", "jane", None])
+
+        # The rows to delete are selected for the user.
+        res = self.fetch("/api/v1/lessons/?user=jane&filter={}".format(
+            urllib.parse.quote(escape.json_encode({"topic": "maths"}))),
+            method="DELETE")
+        self.assertEqual(res.code, httpstatus.OK)
+        self.assertEqual(handler_class.users,
+                         ["john", "jane", None, "jane"])
+        self.assertEqual(len(handler_class.collection), 0)
+
+        handler = self.registry.resource_handler(
+            "lessons", self._app, "john")
+        self.assertIsNone(handler.current_user)
+        self.assertEqual(handler.partition_key(current_user="jane"), "jane")
+        self.assertEqual(handler_class.instances, 1)
+
+        handler = self.registry.resource_handler(
+            "students", self._app, "john")
+        self.assertEqual(handler.current_user, "john")
+        self.assertEqual(handler.partition_key(), "john")
+
+    def test_batch(self):
+        authenticate_calls = []
+
+        class CountingAuthenticator:
+            @classmethod
+            @gen.coroutine
+            def authenticate(cls, handler):
+                authenticate_calls.append(handler)
+                return "john"
+
+        self.registry.authenticator = CountingAuthenticator
+
+        res = self.fetch(
+            "/api/v1/_batch/",
+            method="POST",
+            body=escape.json_encode([
+                {"method": "POST",
+                 "path": "students/",
+                 "body": {"name": "john wick", "age": 19}},
+                {"method": "GET",
+                 "path": "students/",
+                 "query": {"limit": 1}},
+                {"method": "GET",
+                 "path": "students/0/"},
+                {"method": "GET",
+                 "path": "/serverinfo/"},
+                {"method": "GET",
+                 "path": "notpresent/"},
+                {"method": "GET",
+                 "path": "students/0/whatever/"},
+                {"method": "FROBNICATE",
+                 "path": "students/"},
+                {"method": "POST",
+                 "path": "_batch/",
+                 "body": []},
+            ]))
+
+        self.assertEqual(res.code, httpstatus.OK)
+        self.assertEqual(len(authenticate_calls), 1)
+
+        responses = escape.json_decode(res.body)["responses"]
+        self.assertEqual([response["status"] for response in responses],
+                         [201, 200, 200, 404, 404, 404, 400, 404])
+        self.assertEqual(
+            urllib.parse.urlparse(
+                responses[0]["headers"]["Location"]).path,
+            "/api/v1/students/0/")
+        self.assertNotIn("body", responses[0])
+        self.assertEqual(responses[1]["body"]["identifiers"], ["0"])
+        self.assertEqual(responses[2]["body"],
+                         {"name": "john wick", "age": 19})
+        self.assertEqual(responses[6]["body"]["type"],
+                         "BadRepresentation")
+
+        # The conditional headers of the batch request are not passed on
+        res = self.fetch(
+            "/api/v1/_batch/",
+            method="POST",
+            headers={"If-None-Match": "*",
+                     "If-Modified-Since": "Sat, 01 Jan 2000 00:00:00 GMT"},
+            body=escape.json_encode([
+                {"method": "GET",
+                 "path": "students/0/"},
+            ]))
+        self.assertEqual(res.code, httpstatus.OK)
+        responses = escape.json_decode(res.body)["responses"]
+        self.assertEqual(responses[0]["status"], 200)
+        self.assertEqual(responses[0]["body"],
+                         {"name": "john wick", "age": 19})
+
+        res = self.fetch("/api/v1/_batch/", method="POST", body="{}")
+        self.assertEqual(res.code, httpstatus.BAD_REQUEST)
+
+        res = self.fetch("/api/v1/_batch/", method="POST", body="[")
+        self.assertEqual(res.code, httpstatus.BAD_REQUEST)
+
+        res = self.fetch("/api/v1/_batch/", method="GET")
+        self.assertEqual(res.code, httpstatus.METHOD_NOT_ALLOWED)
+
+    @gen_test
+    def test_coalesced_reads(self):
+        handler = resource_handlers.ArticleHandler
+        handler.collection["1"] = resource_handlers.Article(
+            identifier="1", title="hello")
+
+        def fetch_all(path, num):
+            return gen.multi([
+                self.http_client.fetch(self.get_url(path), raise_error=False)
+                for _ in range(num)])
+
+        responses = yield fetch_all("/api/v1/articles/1/", 5)
+        self.assertEqual([res.code for res in responses], [200] * 5)
+        self.assertEqual(len(set(res.body for res in responses)), 1)
+        self.assertEqual(escape.json_decode(responses[0].body),
+                         {"title": "hello"})
+        self.assertEqual(handler.retrieve_calls, 1)
+        self.assertEqual(self.registry.coalescer.requests, 5)
+        self.assertEqual(self.registry.coalescer.coalesced, 4)
+        self.assertEqual(self.registry.coalescer.in_flight, 0)
+
+        # Errors are shared too
+        responses = yield fetch_all("/api/v1/articles/2/", 3)
+        self.assertEqual([res.code for res in responses], [404] * 3)
+        self.assertEqual(handler.retrieve_calls, 2)
+
+        # Different query arguments are not coalesced
+        responses = yield gen.multi([
+            self.http_client.fetch(self.get_url(path))
+            for path in ["/api/v1/articles/", "/api/v1/articles/",
+                         "/api/v1/articles/?limit=1"]])
+        self.assertEqual(responses[0].body, responses[1].body)
+        self.assertEqual(handler.items_calls, 2)
+
+        # Sequential requests are not coalesced
+        yield self.http_client.fetch(self.get_url("/api/v1/articles/1/"))
+        self.assertEqual(handler.retrieve_calls, 3)
+
+    def test_cached_reads(self):
+        handler = resource_handlers.PlanetHandler
+        cache = self.registry.response_cache
+
+        for name in ["Mercury", "Venus"]:
+            self.fetch("/api/v1/planets/",
+                       method="POST",
+                       body=escape.json_encode({"name": name}))
+
+        for _ in range(3):
+            res = self.fetch("/api/v1/planets/0/")
+            self.assertEqual(escape.json_decode(res.body), {"name": "Mercury"})
+            res = self.fetch("/api/v1/planets/")
+            self.assertEqual(escape.json_decode(res.body)["identifiers"],
+                             ["0", "1"])
+
+        self.assertEqual(handler.retrieve_calls, 1)
+        self.assertEqual(handler.items_calls, 1)
+        self.assertEqual(cache.hits, 4)
+        self.assertEqual(cache.misses, 2)
+
+        # Different query arguments are cached separately
+        self.fetch("/api/v1/planets/?limit=1")
+        self.assertEqual(handler.items_calls, 2)
+
+        self.fetch("/api/v1/planets/1/")
+        self.assertEqual(len(cache), 3)
+        self.assertEqual(cache.evictions, 1)
+
+        # A modification of a resource invalidates it and the listings,
+        # but not the other resources.
+        res = self.fetch("/api/v1/planets/0/",
+                         method="PUT",
+                         body=escape.json_encode({"name": "Earth"}))
+        self.assertEqual(res.code, httpstatus.NO_CONTENT)
+        self.assertEqual(len(cache), 1)
+
+        res = self.fetch("/api/v1/planets/0/")
+        self.assertEqual(escape.json_decode(res.body), {"name": "Earth"})
+        self.fetch("/api/v1/planets/1/")
+        self.assertEqual(handler.retrieve_calls, 3)
+
+        # A modification of the collection invalidates everything
+        self.fetch("/api/v1/planets/",
+                   method="POST",
+                   body=escape.json_encode({"name": "Mars"}))
+        self.assertEqual(len(cache), 0)
+
+        res = self.fetch("/api/v1/planets/")
+        self.assertEqual(escape.json_decode(res.body)["identifiers"],
+                         ["0", "1", "2"])
+
+        # Failed modifications do not invalidate
+        self.fetch("/api/v1/planets/5/",
+                   method="DELETE")
+        self.assertEqual(len(cache), 1)
+
     def test_retrieve(self):
         res = self.fetch(
             "/api/v1/students/",
@@ -345,6 +1103,191 @@ class TestWebAPI(AsyncHTTPTestCase, LogTrapTestCase):
         res = self.fetch(location)
         self.assertEqual(res.code, httpstatus.INTERNAL_SERVER_ERROR)
 
+    def test_retrieve_conditional_with_payload_etag(self):
+        res = self.fetch(
+            "/api/v1/students/",
+            method="POST",
+            body=escape.json_encode({
+                "name": "john wick",
+                "age": 19,
+            })
+        )
+        location = urllib.parse.urlparse(res.headers["Location"]).path
+
+        res = self.fetch(location)
+        self.assertEqual(res.code, httpstatus.OK)
+        etag = res.headers["Etag"]
+
+        res = self.fetch(location, headers={"If-None-Match": etag})
+        self.assertEqual(res.code, httpstatus.NOT_MODIFIED)
+        self.assertEqual(res.body, b"")
+
+        res = self.fetch("/api/v1/students/")
+        collection_etag = res.headers["Etag"]
+        res = self.fetch("/api/v1/students/",
+                         headers={"If-None-Match": collection_etag})
+        self.assertEqual(res.code, httpstatus.NOT_MODIFIED)
+
+        resource_handlers.StudentHandler.collection["0"].age = 20
+
+        res = self.fetch(location, headers={"If-None-Match": etag})
+        self.assertEqual(res.code, httpstatus.OK)
+        self.assertNotEqual(res.headers["Etag"], etag)
+
+        res = self.fetch("/api/v1/students/",
+                         headers={"If-None-Match": collection_etag})
+        self.assertEqual(res.code, httpstatus.OK)
+
+    def test_retrieve_conditional_with_version(self):
+        handler = resource_handlers.CourseHandler
+        handler.collection["a"] = handler.resource_class(
+            identifier="a", title="maths")
+
+        res = self.fetch("/api/v1/courses/a/")
+        self.assertEqual(res.code, httpstatus.OK)
+        etag = res.headers["Etag"]
+        self.assertEqual(handler.retrieve_calls, 1)
+
+        res = self.fetch("/api/v1/courses/a/",
+                         headers={"If-None-Match": etag})
+        self.assertEqual(res.code, httpstatus.NOT_MODIFIED)
+        self.assertEqual(handler.retrieve_calls, 1)
+
+        # The query arguments are part of the ETag
+        res = self.fetch("/api/v1/courses/a/?fields=title",
+                         headers={"If-None-Match": etag})
+        self.assertEqual(res.code, httpstatus.OK)
+
+        handler.collection["a"].title = "physics"
+        res = self.fetch("/api/v1/courses/a/",
+                         headers={"If-None-Match": etag})
+        self.assertEqual(res.code, httpstatus.OK)
+        self.assertEqual(escape.json_decode(res.body), {"title": "physics"})
+
+        res = self.fetch("/api/v1/courses/")
+        etag = res.headers["Etag"]
+        self.assertEqual(handler.items_calls, 1)
+
+        res = self.fetch("/api/v1/courses/",
+                         headers={"If-None-Match": etag})
+        self.assertEqual(res.code, httpstatus.NOT_MODIFIED)
+        self.assertEqual(handler.items_calls, 1)
+
+    def test_retrieve_conditional_with_revision_number(self):
+        handler = resource_handlers.CourseHandler
+        handler.collection["a"] = handler.resource_class(
+            identifier="a", title="maths")
+
+        @gen.coroutine
+        def version(self, instance, **kwargs):
+            return 42
+
+        with mock.patch.object(handler, "version", version):
+            res = self.fetch("/api/v1/courses/a/")
+            self.assertEqual(res.code, httpstatus.OK)
+
+            res = self.fetch("/api/v1/courses/a/",
+                             headers={"If-None-Match": res.headers["Etag"]})
+            self.assertEqual(res.code, httpstatus.NOT_MODIFIED)
+
+    def test_head(self):
+        res = self.fetch("/api/v1/students/0/", method="HEAD")
+        self.assertEqual(res.code, httpstatus.NOT_FOUND)
+
+        res = self.fetch("/api/v1/students/", method="HEAD")
+        self.assertEqual(res.code, httpstatus.OK)
+        self.assertEqual(res.headers["X-Total-Count"], "0")
+
+        self.fetch(
+            "/api/v1/students/",
+            method="POST",
+            body=escape.json_encode({
+                "name": "john wick",
+                "age": 19,
+            })
+        )
+
+        res = self.fetch("/api/v1/students/0/", method="HEAD")
+        self.assertEqual(res.code, httpstatus.OK)
+        self.assertEqual(res.body, b"")
+        self.assertNotIn("Etag", res.headers)
+
+        res = self.fetch("/api/v1/students/", method="HEAD")
+        self.assertEqual(res.code, httpstatus.OK)
+        self.assertEqual(res.headers["X-Total-Count"], "1")
+
+        res = self.fetch("/api/v1/unsupportalls/0/", method="HEAD")
+        self.assertEqual(res.code, httpstatus.METHOD_NOT_ALLOWED)
+
+    def test_head_with_version(self):
+        handler = resource_handlers.CourseHandler
+        handler.collection["a"] = handler.resource_class(
+            identifier="a", title="maths")
+
+        res = self.fetch("/api/v1/courses/a/")
+        etag = res.headers["Etag"]
+        self.assertEqual(handler.retrieve_calls, 1)
+
+        res = self.fetch("/api/v1/courses/a/", method="HEAD")
+        self.assertEqual(res.code, httpstatus.OK)
+        self.assertEqual(res.headers["Etag"], etag)
+
+        res = self.fetch("/api/v1/courses/a/", method="HEAD",
+                         headers={"If-None-Match": etag})
+        self.assertEqual(res.code, httpstatus.NOT_MODIFIED)
+
+        res = self.fetch("/api/v1/courses/", method="HEAD")
+        self.assertEqual(res.code, httpstatus.OK)
+        self.assertEqual(res.headers["X-Total-Count"], "1")
+        self.assertIn("Etag", res.headers)
+
+    def test_head_matches_get(self):
+        handler = resource_handlers.CourseHandler
+        handler.collection["a"] = handler.resource_class(
+            identifier="a", title="maths")
+
+        for url in ["/api/v1/courses/a/", "/api/v1/courses/"]:
+            get_res = self.fetch(url)
+            head_res = self.fetch(url, method="HEAD")
+            self.assertEqual(head_res.code, httpstatus.OK)
+            for header in ["Etag", "Content-Type", "Vary"]:
+                self.assertEqual(head_res.headers.get(header),
+                                 get_res.headers.get(header))
+
+    def test_head_streamed_count(self):
+        @gen.coroutine
+        def items(self, items_response, **kwargs):
+            items_response.set_stream(iter(self.collection.values()))
+
+        handler = resource_handlers.GraduateHandler
+        for i in range(7):
+            handler.collection[str(i)] = resource_handlers.Graduate(
+                identifier=str(i), name="john wick {}".format(i), age=39)
+
+        with mock.patch.object(handler, "items", items):
+            res = self.fetch("/api/v1/graduates/")
+            self.assertEqual(len(escape.json_decode(res.body)["items"]), 7)
+
+            res = self.fetch("/api/v1/graduates/", method="HEAD")
+            self.assertEqual(res.code, httpstatus.OK)
+            self.assertEqual(res.headers["X-Total-Count"], "7")
+
+    def test_singleton_head(self):
+        res = self.fetch("/api/v1/serverinfo/", method="HEAD")
+        self.assertEqual(res.code, httpstatus.NOT_FOUND)
+
+        self.fetch(
+            "/api/v1/serverinfo/",
+            method="POST",
+            body=escape.json_encode({
+                "status": "ok",
+                "uptime": 1000,
+            })
+        )
+
+        res = self.fetch("/api/v1/serverinfo/", method="HEAD")
+        self.assertEqual(res.code, httpstatus.OK)
+
     def test_post_on_resource(self):
         res = self.fetch(
             "/api/v1/students/",
@@ -426,6 +1369,89 @@ class TestWebAPI(AsyncHTTPTestCase, LogTrapTestCase):
         )
         self.assertEqual(res.code, httpstatus.BAD_REQUEST)
 
+    def test_patch(self):
+        res = self.fetch(
+            "/api/v1/students/",
+            method="POST",
+            body=escape.json_encode({
+                "name": "john wick",
+                "age": 19,
+            })
+        )
+
+        location = urllib.parse.urlparse(res.headers["Location"]).path
+        res = self.fetch(
+            location,
+            method="PATCH",
+            body=escape.json_encode({
+                "age": 20,
+            })
+        )
+        self.assertEqual(res.code, httpstatus.NO_CONTENT)
+
+        res = self.fetch(location)
+        self.assertEqual(escape.json_decode(res.body),
+                         {
+                             "name": "john wick",
+                             "age": 20,
+                         })
+
+        # Incorrect type
+        res = self.fetch(
+            location,
+            method="PATCH",
+            body=escape.json_encode({
+                "age": "hello",
+            })
+        )
+        self.assertEqual(res.code, httpstatus.BAD_REQUEST)
+
+        res = self.fetch(
+            "/api/v1/students/1234/",
+            method="PATCH",
+            body=escape.json_encode({
+                "age": 20,
+            })
+        )
+        self.assertEqual(res.code, httpstatus.NOT_FOUND)
+
+        res = self.fetch(
+            "/api/v1/unsupportalls/1/",
+            method="PATCH",
+            body="{}"
+        )
+        self.assertEqual(res.code, httpstatus.METHOD_NOT_ALLOWED)
+
+    def test_singleton_patch(self):
+        res = self.fetch(
+            "/api/v1/serverinfo/",
+            method="PATCH",
+            body=escape.json_encode({
+                "uptime": 2000,
+            }))
+        self.assertEqual(res.code, httpstatus.NOT_FOUND)
+
+        self.fetch(
+            "/api/v1/serverinfo/",
+            method="POST",
+            body=escape.json_encode({
+                "status": "ok",
+                "uptime": 1000,
+            }))
+
+        res = self.fetch(
+            "/api/v1/serverinfo/",
+            method="PATCH",
+            body=escape.json_encode({
+                "uptime": 2000,
+            }))
+        self.assertEqual(res.code, httpstatus.NO_CONTENT)
+
+        res = self.fetch("/api/v1/serverinfo/", method="GET")
+        self.assertEqual(escape.json_decode(res.body),
+                         {"status": "ok",
+                          "uptime": 2000})
+
     def test_delete(self):
         res = self.fetch(
             "/api/v1/students/",
@@ -455,14 +1481,100 @@ class TestWebAPI(AsyncHTTPTestCase, LogTrapTestCase):
         self.assertEqual(res.code, httpstatus.METHOD_NOT_ALLOWED)
 
     def test_put_collection(self):
-        res = self.fetch("/api/v1/students/",
+        res = self.fetch("/api/v1/unsupportalls/",
                          method="PUT",
                          body=escape.json_encode({
-                             "name": "john wick",
-                             "age": 19,
+                             "1": {},
                          }))
         self.assertEqual(res.code, httpstatus.METHOD_NOT_ALLOWED)
 
+        res = self.fetch("/api/v1/students/",
+                         method="PUT",
+                         body=escape.json_encode([]))
+        self.assertEqual(res.code, httpstatus.BAD_REQUEST)
+
+    def _create_students(self, names):
+        for name in names:
+            self.fetch(
+                "/api/v1/students/",
+                method="POST",
+                body=escape.json_encode({"name": name, "age": 19}))
+
+    def test_update_many(self):
+        self._create_students(["john wick", "jane wick"])
+
+        res = self.fetch("/api/v1/students/",
+                         method="PUT",
+                         body=escape.json_encode({
+                             "0": {"name": "john wick", "age": 20},
+                             "1": {"name": "jane wick"},
+                             "5": {"name": "jack wick", "age": 20},
+                         }))
+        self.assertEqual(res.code, httpstatus.MULTI_STATUS)
+        self.assertEqual(
+            sorted((item["identifier"], item["status"])
+                   for item in escape.json_decode(res.body)["items"]),
+            [("0", 204), ("1", 400), ("5", 404)])
+
+        res = self.fetch("/api/v1/students/?fields=age")
+        self.assertEqual(escape.json_decode(res.body)["items"],
+                         {"0": {"age": 20}, "1": {"age": 19}})
+
+        res = self.fetch("/api/v1/students/",
+                         method="PUT",
+                         body=escape.json_encode({
+                             "1": {"name": "jane wick", "age": 21},
+                         }))
+        self.assertEqual(res.code, httpstatus.OK)
+
+    def test_patch_many(self):
+        self._create_students(["john wick", "jane wick"])
+
+        res = self.fetch("/api/v1/students/",
+                         method="PATCH",
+                         body=escape.json_encode({
+                             "0": {"age": 20},
+                             "1": {"age": 21},
+                         }))
+        self.assertEqual(res.code, httpstatus.OK)
+        self.assertEqual(
+            sorted((item["identifier"], item["status"])
+                   for item in escape.json_decode(res.body)["items"]),
+            [("0", 204), ("1", 204)])
+
+        res = self.fetch("/api/v1/students/")
+        self.assertEqual(escape.json_decode(res.body)["items"],
+                         {"0": {"name": "john wick", "age": 20},
+                          "1": {"name": "jane wick", "age": 21}})
+
+        res = self.fetch("/api/v1/students/",
+                         method="PATCH",
+                         body=escape.json_encode({
+                             "0": {"age": "hello"},
+                         }))
+        self.assertEqual(res.code, httpstatus.MULTI_STATUS)
+
+    def test_delete_many(self):
+        self._create_students(["john wick", "jane wick", "jack wick"])
+
+        res = self.fetch("/api/v1/students/?ids=0,7", method="DELETE")
+        self.assertEqual(res.code, httpstatus.MULTI_STATUS)
+        self.assertEqual(escape.json_decode(res.body)["items"],
+                         [{"identifier": "0", "status": 204},
+                          {"identifier": "7", "status": 404}])
+
+        res = self.fetch(
+            "/api/v1/students/?filter={}".format(urllib.parse.quote(
+                escape.json_encode({"name": "jack wick"}))),
+            method="DELETE")
+        self.assertEqual(res.code, httpstatus.OK)
+        self.assertEqual(escape.json_decode(res.body)["items"],
+                         [{"identifier": "2", "status": 204}])
+
+        res = self.fetch("/api/v1/students/")
+        self.assertEqual(escape.json_decode(res.body)["identifiers"],
+                         ["1"])
+
     def test_unexistent_resource_type(self):
         res = self.fetch(
             "/api/v1/notpresent/",
@@ -778,11 +1890,79 @@ class TestWebAPI(AsyncHTTPTestCase, LogTrapTestCase):
         self.assertEqual(res.code, httpstatus.BAD_REQUEST)
 
 
+class TestMsgPackWebAPI(AsyncHTTPTestCase, LogTrapTestCase):
+    def setUp(self):
+        super().setUp()
+        resource_handlers.StudentHandler.collection = OrderedDict()
+        resource_handlers.StudentHandler.id = 0
+        resource_handlers.GraduateHandler.collection = OrderedDict()
+
+    def get_app(self):
+        registry = Registry(transport=MsgPackTransport())
+        registry.register(resource_handlers.StudentHandler)
+        registry.register(resource_handlers.GraduateHandler)
+        return web.Application(handlers=registry.api_handlers('/'))
+
+    def test_crud(self):
+        codec = PureMsgPackCodec()
+
+        res = self.fetch("/api/v1/students/",
+                         method="POST",
+                         body=codec.encode({"name": "john wick", "age": 19}))
+        self.assertEqual(res.code, httpstatus.CREATED)
+
+        res = self.fetch("/api/v1/students/0/")
+        self.assertEqual(res.code, httpstatus.OK)
+        self.assertEqual(res.headers["Content-Type"], "application/msgpack")
+        self.assertEqual(codec.decode(res.body),
+                         {"name": "john wick", "age": 19})
+
+        res = self.fetch("/api/v1/students/")
+        self.assertEqual(codec.decode(res.body)["identifiers"], ["0"])
+
+        res = self.fetch("/api/v1/students/0/",
+                         method="PUT",
+                         body=escape.json_encode({"name": "john", "age": 1}))
+        self.assertEqual(res.code, httpstatus.BAD_REQUEST)
+        self.assertEqual(codec.decode(res.body)["type"], "BadRepresentation")
+
+    def test_streamed_items(self):
+        codec = PureMsgPackCodec()
+        for i in range(3):
+            resource_handlers.GraduateHandler.collection[str(i)] = \
+                resource_handlers.Graduate(identifier=str(i),
+                                           name="john wick {}".format(i),
+                                           age=39)
+
+        # Rendered at once, as the renderer does not stream.
+        res = self.fetch("/api/v1/graduates/")
+        self.assertEqual(res.code, httpstatus.OK)
+        self.assertEqual(codec.decode(res.body)["identifiers"],
+                         ["0", "1", "2"])
+
+
 class TestRESTFunctions(unittest.TestCase):
     def test_api_handlers(self):
         reg = Registry()
         handlers = reg.api_handlers("/foo")
-        self.assertEqual(handlers[0][0], "/foo/api/v1/(.*)/(.*)/")
-        self.assertEqual(handlers[0][1], WithIdentifierWebHandler)
-        self.assertEqual(handlers[1][0], "/foo/api/v1/(.*)/")
-        self.assertEqual(handlers[1][1], WithoutIdentifierWebHandler)
+        self.assertEqual(handlers[0][0], "/foo/api/v1/_batch/")
+        self.assertEqual(handlers[0][1], BatchWebHandler)
+        self.assertEqual(handlers[1][0], "/foo/api/v1/(.*)/(.*)/")
+        self.assertEqual(handlers[1][1], WithIdentifierWebHandler)
+        self.assertEqual(handlers[2][0], "/foo/api/v1/(.*)/")
+        self.assertEqual(handlers[2][1], WithoutIdentifierWebHandler)
+
+        reg.register(resource_handlers.StudentHandler)
+        with self.assertRaises(ValueError):
+            reg.register(resource_handlers.EssayHandler)
+
+        reg = Registry()
+        reg.register(resource_handlers.StudentHandler)
+        reg.register(resource_handlers.EssayHandler)
+        handlers = reg.api_handlers("/foo")
+        self.assertEqual(handlers[1][0], "/foo/api/v1/(essays)/([^/]*)/")
+        self.assertEqual(handlers[1][1], StreamedWithIdentifierWebHandler)
+        self.assertEqual(handlers[2][0], "/foo/api/v1/(essays)/")
+        self.assertEqual(handlers[2][1], StreamedWithoutIdentifierWebHandler)
+        self.assertEqual(handlers[3][1], WithIdentifierWebHandler)
+        self.assertEqual(handlers[4][1], WithoutIdentifierWebHandler)
@@ -0,0 +1,97 @@
+import time
+from collections import OrderedDict
+
+
+class Timer:
+    """Measures the duration of the stages of the processing of a request,
+    with a monotonic clock. The durations of the stages with the same name,
+    e.g. the serialization of the items of a collection, are added up.
+
+    The web handlers time the stages authenticate, parse, preprocess,
+    deserialize, handler (the coroutines of the resource handler), check
+    (the sanity checks of the resources), serialize and render.
+    """
+
+    def __init__(self, clock=time.perf_counter):
+        """Initializes the timer.
+
+        Parameters
+        ----------
+        clock: callable
+            Returns the current time in seconds. Must be monotonic.
+        """
+        self._clock = clock
+
+        #: The total duration in seconds of each stage, in order of
+        #: first occurrence.
+        self.durations = OrderedDict()
+
+    def stage(self, name):
+        """Returns a context manager timing the enclosed block as
+        the given stage."""
+        return _Stage(self, name)
+
+    def add(self, name, duration):
+        """Adds a duration, in seconds, to the given stage."""
+        self.durations[name] = self.durations.get(name, 0.0) + duration
+
+    def server_timing(self):
+        """Returns the durations as the value of a Server-Timing header,
+        in milliseconds."""
+        return ", ".join(
+            "{};dur={:.3f}".format(name, duration * 1000)
+            for name, duration in self.durations.items())
+
+
+class _Stage:
+    """Context manager returned by Timer.stage."""
+    __slots__ = ("_timer", "_name", "_start")
+
+    def __init__(self, timer, name):
+        self._timer = timer
+        self._name = name
+        self._start = None
+
+    def __enter__(self):
+        self._start = self._timer._clock()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        timer = self._timer
+        timer.add(self._name, timer._clock() - self._start)
+        return False
+
+
+class _NullStage:
+    """Context manager returned by NullTimer.stage. Does nothing."""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class NullTimer:
+    """A Timer that does not measure anything, used when the timing is
+    disabled. Its stages cost a method call and an empty with block."""
+
+    #: Always empty.
+    durations = OrderedDict()
+
+    def stage(self, name):
+        return _NULL_STAGE
+
+    def add(self, name, duration):
+        pass
+
+    def server_timing(self):
+        return ""
+
+
+#: The shared NullTimer.
+NULL_TIMER = NullTimer()
@@ -1 +1,2 @@
 from .basic_rest_transport import BasicRESTTransport  # noqa
+from .msgpack_transport import MsgPackTransport  # noqa
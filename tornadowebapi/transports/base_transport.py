@@ -10,6 +10,15 @@ class BaseTransport(metaclass=abc.ABCMeta):
     serializer = None
     deserializer = None
 
+    #: The minimum size in bytes of the response payloads that are
+    #: compressed, if the client accepts a supported content coding.
+    #: None disables the compression of the responses.
+    compression_min_size = None
+
+    #: The maximum size in bytes of a compressed request body, once
+    #: decompressed.
+    max_decompressed_size = 100 * 1024 * 1024
+
     @abc.abstractproperty
     def content_type(self):
         """Must return the appropriate content type for the transport.
@@ -1,3 +1,4 @@
+from tornadowebapi.codecs import JSONCodec
 from tornadowebapi.deserializers import BasicRESTDeserializer
 from tornadowebapi.parsers import JSONParser
 from tornadowebapi.renderers import JSONRenderer
@@ -6,9 +7,27 @@ from .base_transport import BaseTransport
 
 
 class BasicRESTTransport(BaseTransport):
-    def __init__(self):
-        self.parser = JSONParser()
-        self.renderer = JSONRenderer()
+    def __init__(self, codec=None, compression_min_size=None):
+        """Initializes the transport.
+
+        Parameters
+        ----------
+        codec: BaseCodec or None
+            The JSON codec used by the parser and the renderer.
+            If None, JSONCodec. ORJSONCodec is faster, if orjson is
+            installed, but its output is not byte by byte identical.
+        compression_min_size: int or None
+            The minimum size in bytes of the responses to compress with
+            gzip or deflate, if accepted by the client. None disables
+            compression.
+        """
+        if codec is None:
+            codec = JSONCodec()
+
+        self.codec = codec
+        self.compression_min_size = compression_min_size
+        self.parser = JSONParser(codec)
+        self.renderer = JSONRenderer(codec)
         self.serializer = BasicRESTSerializer()
         self.deserializer = BasicRESTDeserializer()
 
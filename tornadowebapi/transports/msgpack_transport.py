@@ -0,0 +1,37 @@
+from tornadowebapi.codecs import default_msgpack_codec
+from tornadowebapi.deserializers import BasicRESTDeserializer
+from tornadowebapi.parsers import MsgPackParser
+from tornadowebapi.renderers import MsgPackRenderer
+from tornadowebapi.serializers import BasicRESTSerializer
+from .base_transport import BaseTransport
+
+
+class MsgPackTransport(BaseTransport):
+    """Transport with the same representations of BasicRESTTransport,
+    encoded in the compact binary MessagePack format instead of JSON.
+    Floats are carried in binary, without text conversions."""
+
+    def __init__(self, codec=None, compression_min_size=None):
+        """Initializes the transport.
+
+        Parameters
+        ----------
+        codec: BaseCodec or None
+            The MessagePack codec used by the parser and the renderer.
+            If None, the fastest available, as by default_msgpack_codec().
+        compression_min_size: int or None
+            As in BasicRESTTransport.
+        """
+        if codec is None:
+            codec = default_msgpack_codec()
+
+        self.codec = codec
+        self.compression_min_size = compression_min_size
+        self.parser = MsgPackParser(codec)
+        self.renderer = MsgPackRenderer(codec)
+        self.serializer = BasicRESTSerializer()
+        self.deserializer = BasicRESTDeserializer()
+
+    @property
+    def content_type(self):
+        return "application/msgpack"
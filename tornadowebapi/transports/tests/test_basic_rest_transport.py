@@ -1,5 +1,6 @@
 import unittest
 
+from tornadowebapi.codecs import JSONCodec
 from tornadowebapi.transports.basic_rest_transport import BasicRESTTransport
 
 
@@ -10,3 +11,11 @@ class TestBasicRESTTransport(unittest.TestCase):
         self.assertIsNotNone(transport.parser)
         self.assertIsNotNone(transport.serializer)
         self.assertIsNotNone(transport.deserializer)
+
+    def test_codec(self):
+        codec = JSONCodec()
+        transport = BasicRESTTransport(codec=codec)
+        self.assertIs(transport.codec, codec)
+        self.assertIs(transport.renderer.codec, codec)
+        self.assertIs(transport.parser.codec, codec)
+        self.assertEqual(transport.renderer.render({}), "{}")
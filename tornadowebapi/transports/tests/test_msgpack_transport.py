@@ -0,0 +1,24 @@
+import unittest
+
+from tornadowebapi.codecs import PureMsgPackCodec
+from tornadowebapi.transports import MsgPackTransport
+
+
+class TestMsgPackTransport(unittest.TestCase):
+    def test_init(self):
+        transport = MsgPackTransport()
+        self.assertIsNotNone(transport.renderer)
+        self.assertIsNotNone(transport.parser)
+        self.assertIsNotNone(transport.serializer)
+        self.assertIsNotNone(transport.deserializer)
+        self.assertEqual(transport.content_type, "application/msgpack")
+
+    def test_codec(self):
+        codec = PureMsgPackCodec()
+        transport = MsgPackTransport(codec=codec)
+        self.assertIs(transport.renderer.codec, codec)
+        self.assertIs(transport.parser.codec, codec)
+        self.assertEqual(
+            transport.parser.parse(transport.renderer.render({"a": 1.5})),
+            {"a": 1.5})
+        self.assertIsNone(transport.renderer.render(None))
@@ -23,3 +23,17 @@ def url_path_join(*pieces):
 def with_end_slash(url):
     """Normalises a url to have an ending slash, and only one."""
     return url.rstrip("/")+"/"
+
+
+def payload_chunks(payload):
+    """Returns a rendered payload as a list of bytes chunks, without copying
+    them. The payload can be a str, bytes, or already a list of bytes
+    chunks."""
+    if isinstance(payload, str):
+        return [payload.encode("utf-8")]
+    elif isinstance(payload, bytes):
+        return [payload]
+    elif isinstance(payload, list):
+        return payload
+
+    raise TypeError("Invalid payload type {}".format(type(payload)))
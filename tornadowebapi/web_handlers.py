@@ -1,7 +1,11 @@
-import contextlib
-
-
-from tornado import gen, web, template, escape
+import base64
+import hashlib
+import hmac
+import zlib
+from urllib.parse import urlencode
+
+from tornado import gen, web, template, escape, httputil
+from tornado.concurrent import Future
 from tornado.log import app_log
 from tornado.web import HTTPError
 from tornadowebapi.filtering import filter_spec_to_function
@@ -11,10 +15,96 @@ from tornadowebapi.traitlets import TraitError
 
 from . import resource as resource_mod
 from . import exceptions
-from .items_response import ItemsResponse
-from .http import httpstatus
+from .bulk_response import BulkResponse
+from .items_response import ItemsResponse, TOTAL_MODES
+from .http import httpstatus, content_encoding
+from .http.capture_connection import CaptureConnection
 from .http.payloaded_http_error import PayloadedHTTPError
-from .utils import url_path_join, with_end_slash
+from .timing import Timer, NULL_TIMER
+from .utils import url_path_join, with_end_slash, payload_chunks
+
+
+# Raised on generic exceptions during the processing of the request.
+# They are converted into HTTP errors only when needed.
+_IDENTIFIER_NOT_FOUND = exceptions.NotFound()
+_CONDITIONAL_HEADERS = ("If-Match", "If-None-Match", "If-Modified-Since",
+                        "If-Unmodified-Since", "If-Range")
+_GENERIC_PREPROCESSING_ERROR = exceptions.BadRepresentation(
+    "Generic exception during preprocessing")
+_GENERIC_DESERIALIZATION_ERROR = exceptions.BadRepresentation(
+    "Generic exception during deserialization")
+
+
+class _ExceptionsToHttp:
+    """Context manager returned by BaseWebHandler.exceptions_to_http.
+    On success, it only costs its instantiation."""
+    __slots__ = ("_handler", "_res_handler", "_handler_method",
+                 "_identifier", "_on_generic_raise")
+
+    def __init__(self, handler, res_handler, handler_method, identifier,
+                 on_generic_raise):
+        self._handler = handler
+        self._res_handler = res_handler
+        self._handler_method = handler_method
+        self._identifier = identifier
+        self._on_generic_raise = on_generic_raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            return False
+
+        if (not issubclass(exc_type, Exception) or
+                issubclass(exc_type, web.HTTPError)):
+            return False
+
+        self._handler._raise_as_http(exc,
+                                     self._res_handler,
+                                     self._handler_method,
+                                     self._identifier,
+                                     self._on_generic_raise)
+
+
+class _StreamedBody:
+    """The request body of a resource handler with stream_request_body,
+    fed to the incremental parser of the transport as it is received."""
+
+    def __init__(self, parser, decompressor=None):
+        self._parser = parser
+        self._decompressor = decompressor
+
+        # The error occurred while feeding the body. It is raised by
+        # close(), as the handler cannot respond while receiving it.
+        self._error = None
+
+    def feed(self, chunk):
+        if self._error is not None:
+            return
+
+        try:
+            if self._decompressor is not None:
+                chunk = self._decompressor.decompress(chunk)
+            self._parser.feed(chunk)
+        except Exception as e:
+            # Releases what has been received so far.
+            self._parser = None
+            self._error = e
+
+    def close(self):
+        """Returns the parsed body. Raises OverflowError if the
+        decompressed body is too large, or BadRepresentation if invalid."""
+        try:
+            if self._error is not None:
+                raise self._error
+
+            if self._decompressor is not None:
+                self._decompressor.flush()
+        except ValueError as e:
+            raise exceptions.BadRepresentation(message=str(e))
+
+        return self._parser.close()
 
 
 class BaseWebHandler(web.RequestHandler):
@@ -23,18 +113,95 @@ class BaseWebHandler(web.RequestHandler):
         self._registry = registry
         self._base_urlpath = base_urlpath
         self._api_version = api_version
+        self._has_version_etag = False
+
+        # The compression level of the responses, from the resource
+        # handler serving the request. None if not compressed.
+        self._compression_level = None
+
+        # The transports negotiated for the request and the response.
+        self._request_transport = None
+        self._response_transport = None
+
+        # The resource handler serving the request, and its collection.
+        self._res_handler = None
+        self._res_handler_name = None
+
+        # The request body, for the streamed web handlers:
+        # either the list of its chunks, or a _StreamedBody if parsed
+        # as it is received. Both None if buffered by tornado.
+        self._body_chunks = None
+        self._streamed_body = None
+
+        # Times the stages of the request, if enabled by the registry.
+        if registry.server_timing or registry.timing_observer is not None:
+            self._timer = Timer()
+        else:
+            self._timer = NULL_TIMER
 
     @gen.coroutine
     def prepare(self):
         """Runs before any specific handler. """
+        if isinstance(self.request.connection, CaptureConnection):
+            # Sub-request of a batch, already authenticated.
+            self.current_user = self.request.connection.current_user
+            return
+
         authenticator = self.registry.authenticator
-        self.current_user = yield authenticator.authenticate(self)
+        with self._timer.stage("authenticate"):
+            self.current_user = yield authenticator.authenticate(self)
+
+    def flush(self, include_footers=False, callback=None):
+        """Adds the Server-Timing header, if enabled, before the headers
+        are sent. Only the stages completed at the first flush are
+        reported."""
+        if (self._registry.server_timing and
+                not self._headers_written and
+                len(self._timer.durations) != 0):
+            self.set_header("Server-Timing", self._timer.server_timing())
+
+        return super().flush(include_footers, callback)
+
+    def on_finish(self):
+        """Passes the timings of the request to the timing observer
+        of the registry, if any."""
+        observer = self._registry.timing_observer
+        if observer is None:
+            return
+
+        try:
+            observer(self, self._timer.durations)
+        except Exception:
+            self.log.exception("Exception in the timing observer")
 
     @property
     def registry(self):
         """Returns the class vs Resource registry"""
         return self._registry
 
+    @property
+    def request_transport(self):
+        """Returns the transport for the request body, according to
+        its Content-Type."""
+        if self._request_transport is None:
+            self._request_transport = self._registry.request_transport(
+                self.request.headers.get("Content-Type"))
+
+        return self._request_transport
+
+    @property
+    def response_transport(self):
+        """Returns the transport for the response, negotiated from the
+        Accept header of the request."""
+        if self._response_transport is None:
+            registry = self._registry
+            self._response_transport = registry.response_transport(
+                self.request.headers.get("Accept"))
+            if len(registry.transports) > 1:
+                self._add_vary("Accept")
+
+        return self._response_transport
+
     @property
     def base_urlpath(self):
         """Returns the Base urlpath as from initial setup"""
@@ -50,19 +217,146 @@ class BaseWebHandler(web.RequestHandler):
     def log(self):
         return app_log
 
+    def compute_etag(self):
+        """ETags are set explicitly when sending the payload, or from
+        the handler versions. Prevents tornado from computing them
+        on the (possibly absent) body."""
+        return None
+
     def get_resource_handler_or_404(self, collection_name):
         """Given a collection name, inquires the registry
         for its associated Resource class. If not found
         raises HTTPError(NOT_FOUND)"""
+        if (self._res_handler is not None and
+                self._res_handler_name == collection_name):
+            return self._res_handler
 
         try:
-            resource_class = self.registry[collection_name]
-            return resource_class(
+            res_handler = self.registry.resource_handler(
+                collection_name,
                 application=self.application,
                 current_user=self.current_user)
         except KeyError:
             raise web.HTTPError(httpstatus.NOT_FOUND)
 
+        self._compression_level = res_handler.compression_level
+        self._res_handler = res_handler
+        self._res_handler_name = collection_name
+        return res_handler
+
+    def _prepare_body(self, collection_name):
+        """Prepares the reception of the request body, for the streamed
+        web handlers, according to the max_body_size and
+        stream_request_body of the resource handler of the collection.
+        """
+        res_handler = self.get_resource_handler_or_404(collection_name)
+        max_size = res_handler.max_body_size
+        body = self.request.body
+
+        if not isinstance(body, Future):
+            # Dispatched in-process with the whole body, e.g. as
+            # a sub-request of a batch.
+            if max_size is not None and body and len(body) > max_size:
+                raise web.HTTPError(httpstatus.REQUEST_ENTITY_TOO_LARGE)
+
+            self._body_chunks = [body] if body else []
+            self.request.body = Future()
+            self.request.body.set_result(None)
+            return
+
+        if max_size is not None:
+            # Also aborts the reception of larger bodies without
+            # Content-Length, or exceeding it.
+            self.request.connection.set_max_body_size(max_size)
+            content_length = self.request.headers.get("Content-Length")
+            if content_length is not None:
+                try:
+                    too_large = int(content_length) > max_size
+                except ValueError:
+                    raise web.HTTPError(httpstatus.BAD_REQUEST)
+
+                if too_large:
+                    raise web.HTTPError(
+                        httpstatus.REQUEST_ENTITY_TOO_LARGE)
+
+        if not (res_handler.stream_request_body and
+                self.request.method in ("POST", "PUT", "PATCH")):
+            self._body_chunks = []
+            return
+
+        coding = self._request_coding()
+        decompressor = None
+        if coding is not None:
+            decompressor = content_encoding.Decompressor(
+                coding, self.request_transport.max_decompressed_size)
+
+        self._streamed_body = _StreamedBody(
+            self.request_transport.parser.incremental(), decompressor)
+
+    def data_received(self, chunk):
+        """Receives a chunk of the request body, for the streamed
+        web handlers."""
+        if self._finished:
+            return
+
+        if self._streamed_body is not None:
+            self._streamed_body.feed(chunk)
+        else:
+            self._body_chunks.append(chunk)
+
+    def _request_coding(self):
+        """Returns the content coding of the request body, from its
+        Content-Encoding header, or None if not encoded.
+        Raises UNSUPPORTED_MEDIA_TYPE if the coding is not supported."""
+        coding = self.request.headers.get(
+            "Content-Encoding", "identity").strip().lower()
+
+        if coding == "identity":
+            return None
+
+        if coding not in content_encoding.WBITS:
+            raise web.HTTPError(httpstatus.UNSUPPORTED_MEDIA_TYPE)
+
+        return coding
+
+    def request_body(self):
+        """Returns the body of the request, decompressed according to
+        its Content-Encoding header, if any."""
+        if self._body_chunks is None:
+            body = self.request.body
+        else:
+            body = b"".join(self._body_chunks)
+
+        if len(body) == 0:
+            return body
+
+        coding = self._request_coding()
+        if coding is None:
+            return body
+
+        try:
+            return content_encoding.decompress(
+                body, coding, self.request_transport.max_decompressed_size)
+        except OverflowError:
+            raise web.HTTPError(httpstatus.REQUEST_ENTITY_TOO_LARGE)
+        except ValueError as e:
+            raise self.to_http_exception(
+                exceptions.BadRepresentation(message=str(e)))
+
+    def parse_request_body(self):
+        """Returns the request body, decompressed and parsed by the
+        transport of the request."""
+        with self._timer.stage("parse"):
+            if self._streamed_body is None:
+                return self.request_transport.parser.parse(
+                    self.request_body())
+
+            streamed_body, self._streamed_body = self._streamed_body, None
+            try:
+                return streamed_body.close()
+            except OverflowError:
+                raise web.HTTPError(httpstatus.REQUEST_ENTITY_TOO_LARGE)
+
     def write_error(self, status_code, **kwargs):
         """Provides appropriate payload to the response in case of error.
         """
@@ -76,7 +370,8 @@ class BaseWebHandler(web.RequestHandler):
 
         if isinstance(exc, PayloadedHTTPError) and exc.payload is not None:
             self.set_header('Content-Type', exc.content_type)
-            self.finish(exc.payload)
+            self._write_payload(exc.payload)
+            self.finish()
         else:
             # For non-payloaded http errors or any other exception
             # we don't want to return anything as payload.
@@ -87,9 +382,11 @@ class BaseWebHandler(web.RequestHandler):
     def to_http_exception(self, exc):
         """Converts a REST exception into the appropriate HTTP one."""
 
-        transport = self._registry.transport
-        payload = transport.renderer.render(
-            transport.serializer.serialize(exc))
+        transport = self.response_transport
+        with self._timer.stage("serialize"):
+            representation = transport.serializer.serialize(exc)
+        with self._timer.stage("render"):
+            payload = transport.renderer.render(representation)
 
         if payload is not None:
             return PayloadedHTTPError(
@@ -114,14 +411,19 @@ class BaseWebHandler(web.RequestHandler):
                 ))
             raise exceptions.Unable()
 
-    def _check_resource_sanity(self, resource, scope):
+    def _check_resource_sanity(self, resource, scope, fields=None):
         """Checks if a resource contains all the mandatory
         data. The response is different depending if the scope
         is input or output. In the first case, it's the client's fault (bad
         representation). In the second, it's the server's fault (internal
-        error)
+        error). If fields is not None, only the data selected by this
+        projection are checked.
         """
-        absents = resource_mod.mandatory_absents(resource, scope)
+        with self._timer.stage("check"):
+            absents = resource_mod.mandatory_absents(resource, scope)
+            if fields is not None:
+                absents = resource_mod.select_fields(absents, fields)
+
         if len(absents) != 0:
             if scope == "input":
                 raise exceptions.BadRepresentation(
@@ -137,7 +439,37 @@ class BaseWebHandler(web.RequestHandler):
                 raise ValueError(
                     "scope must be either input or output")  # pragma: no cover
 
-    @contextlib.contextmanager
+    def _encode_next_cursor(self, items_response):
+        """Replaces the sort key set by items() as next_cursor with the
+        token that is sent to the client."""
+        if items_response.next_cursor is not None:
+            items_response.next_cursor = self._encode_cursor(
+                items_response.next_cursor)
+
+    def _check_items_sanity(self, items, fields=None):
+        """Checks the sanity of the resources returned by items()"""
+        for resource in items:
+            self._check_none(resource.identifier,
+                             "identifier",
+                             "items")
+            self._check_resource_sanity(resource, "output", fields)
+
+    def _validate_fields(self, res_handler, args):
+        """Checks the fields projection passed as query argument, if any,
+        against the resource class of the handler.
+        Returns the projection, or None if not specified."""
+        fields = args.get("fields")
+        if fields is None:
+            return None
+
+        try:
+            resource_mod.validate_fields(res_handler.resource_class, fields)
+        except ValueError as e:
+            raise self.to_http_exception(
+                exceptions.BadQueryArguments(message=str(e)))
+
+        return fields
+
     def exceptions_to_http(self,
                            res_handler,
                            handler_method,
@@ -148,28 +480,55 @@ class BaseWebHandler(web.RequestHandler):
         on_generic_raise, or if not defined, a simple internal server error.
         Any exception created within this context manager will eventually
         be converted into a HTTPError or PayloadedHTTPError.
+
+        on_generic_raise can be a WebAPIException, which is converted
+        only if raised, so that no error payload is rendered on success.
         """
-        try:
-            yield
-        except web.HTTPError:
-            raise
-        except exceptions.WebAPIException as e:
+        return _ExceptionsToHttp(self,
+                                 res_handler,
+                                 handler_method,
+                                 identifier,
+                                 on_generic_raise)
+
+    def _raise_as_http(self, exc, res_handler, handler_method, identifier,
+                       on_generic_raise):
+        """Raises the HTTP error corresponding to an exception
+        occurred within exceptions_to_http."""
+        if isinstance(exc, exceptions.WebAPIException):
             self.log.error("Web API exception on {} {} {}: {} {}".format(
                 res_handler, identifier, handler_method,
-                type(e), str(e)
+                type(exc), str(exc)
             ))
-            raise self.to_http_exception(e)
-        except NotImplementedError:
+            raise self.to_http_exception(exc)
+        elif isinstance(exc, NotImplementedError):
             raise web.HTTPError(httpstatus.METHOD_NOT_ALLOWED)
-        except Exception:
-            self.log.exception(
-                "Internal error on {} {} {}".format(
-                    res_handler, identifier, handler_method
-                ))
-            if on_generic_raise is None:
-                raise web.HTTPError(httpstatus.INTERNAL_SERVER_ERROR)
-            else:
-                raise on_generic_raise
+
+        self.log.error(
+            "Internal error on {} {} {}".format(
+                res_handler, identifier, handler_method
+            ),
+            exc_info=(type(exc), exc, exc.__traceback__))
+        if on_generic_raise is None:
+            raise web.HTTPError(httpstatus.INTERNAL_SERVER_ERROR)
+        elif isinstance(on_generic_raise, exceptions.WebAPIException):
+            raise self.to_http_exception(on_generic_raise)
+        else:
+            raise on_generic_raise
+
+    def handler_arguments(self, res_handler):
+        """Returns the keyword arguments to pass to the methods of the
+        resource handler: the parsed query arguments and, for stateless
+        handlers, the current user."""
+        args = self.parsed_query_arguments()
+        args.update(self._user_arguments(res_handler))
+        return args
+
+    def _user_arguments(self, res_handler):
+        """Stateless handlers are shared among requests, so they receive
+        the current user as a keyword argument of each call."""
+        if res_handler.stateless:
+            return {"current_user": self.current_user}
+        return {}
 
     def parsed_query_arguments(self):
         """Converts the query arguments to a dict. This works around
@@ -178,6 +537,8 @@ class BaseWebHandler(web.RequestHandler):
         """
         ret = {}
         arguments = self.request.query_arguments
+        if len(arguments) == 0:
+            return ret
 
         for key in arguments.keys():
             value = self.get_query_arguments(key)
@@ -210,41 +571,515 @@ class BaseWebHandler(web.RequestHandler):
                 # is a python function and we want to reduce chances of
                 # collision.
                 del ret["filter"]
+            elif key == "fields":
+                values = ret[key] if isinstance(ret[key], list) else [ret[key]]
+                fields = frozenset(
+                    name.strip()
+                    for value in values for name in value.split(",")
+                    if len(name.strip()) > 0)
+
+                if len(fields) == 0:
+                    del ret[key]
+                else:
+                    ret[key] = fields
+            elif key == "ids":
+                values = ret[key] if isinstance(ret[key], list) else [ret[key]]
+                ids = []
+                seen = set()
+                for value in values:
+                    for identifier in value.split(","):
+                        identifier = identifier.strip()
+                        if len(identifier) > 0 and identifier not in seen:
+                            seen.add(identifier)
+                            ids.append(identifier)
+
+                if len(ids) == 0:
+                    del ret[key]
+                else:
+                    ret[key] = ids
+            elif key == "total":
+                if ret[key] not in TOTAL_MODES:
+                    raise web.HTTPError(httpstatus.BAD_REQUEST)
+
+                # Renamed, to prevent confusion with the actual total.
+                ret["total_mode"] = ret.pop("total")
+            elif key == "cursor":
+                if not isinstance(ret[key], str):
+                    raise web.HTTPError(httpstatus.BAD_REQUEST)
+                ret[key] = self._decode_cursor(ret[key])
 
         return ret
 
-    def _send_to_client(self, entity):
+    def _cursor_key(self):
+        """Returns the key signing the cursor tokens, from the
+        cookie_secret application setting, or None if not set."""
+        settings = self.application.settings
+        secret = settings.get("cookie_secret")
+        if isinstance(secret, dict):
+            secret = secret.get(settings.get("key_version"))
+
+        return None if secret is None else escape.utf8(secret)
+
+    @staticmethod
+    def _cursor_signature(key, payload):
+        """Returns the HMAC of an encoded sort key. Unlike signed cookies,
+        it has no timestamp, so that the same sort key always produces
+        the same token, and the hash ETags of the pages are stable."""
+        return escape.utf8(
+            hmac.new(key, b"cursor:" + payload, hashlib.sha256).hexdigest())
+
+    def _encode_cursor(self, sort_key):
+        """Encodes a sort key into an opaque cursor token for the client.
+        The token is signed with the application cookie_secret, so that
+        clients cannot forge it."""
+        self.require_setting("cookie_secret", "cursor pagination")
+        payload = base64.urlsafe_b64encode(
+            escape.utf8(escape.json_encode(sort_key))).rstrip(b"=")
+        return escape.to_unicode(
+            payload + b"." + self._cursor_signature(self._cursor_key(),
+                                                    payload))
+
+    def _decode_cursor(self, token):
+        """Decodes a cursor token produced by _encode_cursor into the
+        sort key it contains. Raises BAD_REQUEST if the token is invalid
+        or has been tampered with, or if the application has no
+        cookie_secret, and thus does not support cursors."""
+        key = self._cursor_key()
+        if key is None:
+            raise web.HTTPError(httpstatus.BAD_REQUEST)
+
+        payload, _, signature = escape.utf8(token).rpartition(b".")
+        if (len(payload) == 0 or
+                not hmac.compare_digest(
+                    signature, self._cursor_signature(key, payload))):
+            raise web.HTTPError(httpstatus.BAD_REQUEST)
+
+        try:
+            return escape.json_decode(base64.urlsafe_b64decode(
+                payload + b"=" * (-len(payload) % 4)))
+        except ValueError:
+            raise web.HTTPError(httpstatus.BAD_REQUEST)
+
+    def _send_to_client(self, entity, fields=None):
         """Convenience method to send a given entity to a client.
-        Serializes it and puts the right headers.
+        Serializes it, applying the fields projection, and puts the right
+        headers.
         If entity is None, sets no content http response."""
         if entity is None:
             self.clear_header('Content-Type')
             self.set_status(httpstatus.NO_CONTENT)
             return
 
-        self.set_status(httpstatus.OK)
+        self._send_payload_to_client(self._render(entity, fields))
+
+    def _render(self, entity, fields=None):
+        """Serializes and renders the entity, applying the fields
+        projection. Returns the payload."""
         # Need to convert into a dict for security issue tornado/1009
-        transport = self._registry.transport
-        self.write(
-            transport.renderer.render(
-                transport.serializer.serialize(
-                    entity)
-            )
-        )
+        transport = self.response_transport
+        with self._timer.stage("serialize"):
+            representation = transport.serializer.serialize(entity, fields)
+        with self._timer.stage("render"):
+            return transport.renderer.render(representation)
+
+    def _send_payload_to_client(self, payload):
+        """Sends an already rendered payload to the client, with
+        the right headers."""
+        transport = self.response_transport
+
+        if self.request.method == "GET" and not self._has_version_etag:
+            # No cheap version available from the handler.
+            # Use the hash of the payload.
+            digest = hashlib.sha1()
+            for chunk in payload_chunks(payload):
+                digest.update(chunk)
+            self.set_header("Etag", '"{}"'.format(digest.hexdigest()))
+            if self._not_modified():
+                return
+
+        self.set_status(httpstatus.OK)
+        self._write_payload(payload)
         self.set_header("Content-Type", transport.content_type)
         self.flush()
 
-    def _send_created_to_client(self, resource):
-        """Sends a created message to the client for a given resource"""
+    def _write_payload(self, payload):
+        """Writes a rendered payload, either a str, bytes, or a list of
+        bytes chunks. Bytes are buffered as they are, without copies,
+        unless the payload is compressed."""
+        chunks = payload_chunks(payload)
+        coding = self._response_coding(sum(len(chunk) for chunk in chunks))
+        if coding is not None:
+            chunks = content_encoding.compress(
+                chunks, coding, self._compression_level)
+
+        for chunk in chunks:
+            self.write(chunk)
+
+    def _response_coding(self, size):
+        """Negotiates the content coding of a response payload of the
+        given size in bytes, or of unknown size if None. Sets the response
+        headers accordingly, and returns the coding, or None if the
+        response must not be compressed."""
+        min_size = self.response_transport.compression_min_size
+        if min_size is None or self._compression_level is None:
+            return None
+
+        self._add_vary("Accept-Encoding")
+        if size is not None and size < min_size:
+            return None
+
+        coding = content_encoding.negotiate(
+            self.request.headers.get("Accept-Encoding"))
+        if coding is not None:
+            self.set_header("Content-Encoding", coding)
+
+        return coding
+
+    def _add_vary(self, header):
+        """Adds a request header to the Vary response header."""
+        vary = self._headers.get("Vary")
+        if vary is None:
+            self.set_header("Vary", header)
+        elif header not in vary:
+            self.set_header("Vary", vary + ", " + header)
+
+    def _variant_key(self, res_handler):
+        """Returns the key distinguishing the responses to GET requests for
+        the same resource: the query arguments, the partition key and the
+        content type."""
+        query = tuple(sorted(
+            (key, tuple(values))
+            for key, values in self.request.query_arguments.items()))
+
+        return (query,
+                res_handler.partition_key(
+                    **self._user_arguments(res_handler)),
+                self.response_transport.content_type)
+
+    @gen.coroutine
+    def _read_payload(self, res_handler, identifier, func):
+        """Returns the payload for the GET request, from the response
+        cache if the resource handler enables it. Otherwise, runs the
+        coroutine function func to produce it."""
+        if res_handler.cache_ttl is None:
+            payload = yield self._coalesced(res_handler, identifier, func)
+            return payload
+
+        cache = self._registry.response_cache
+        name = res_handler.bound_name()
+        identifier = None if identifier is None else str(identifier)
+        variant = self._variant_key(res_handler)
+
+        payload = cache.get(name, identifier, variant)
+        if payload is not None:
+            return payload
+
+        generation = cache.generation(name)
+        payload = yield self._coalesced(res_handler, identifier, func)
+        cache.put(name, identifier, variant, payload,
+                  ttl=res_handler.cache_ttl,
+                  max_entries=res_handler.cache_max_entries,
+                  max_bytes=res_handler.cache_max_bytes,
+                  generation=generation)
+
+        return payload
+
+    def _coalesced(self, res_handler, identifier, func):
+        """Runs the coroutine function func, producing the payload for the
+        GET request, coalescing it with the identical requests in flight
+        if the resource handler enables it. Returns the payload."""
+        if not res_handler.coalesce_reads:
+            return func()
+
+        key = (res_handler.bound_name(),
+               None if identifier is None else str(identifier),
+               self._variant_key(res_handler))
+
+        return self._registry.coalescer.run(key, func)
+
+    def _invalidate_cache(self, res_handler, identifier=None):
+        """Invalidates the cached responses affected by a successful
+        modification of the given resource or, if identifier is None,
+        of the whole collection."""
+        self._registry.response_cache.invalidate(
+            res_handler.bound_name(),
+            None if identifier is None else str(identifier))
+
+    def _send_headers_to_client(self):
+        """Sends a successful response to a HEAD request. Only the headers
+        are sent."""
+        self.set_status(httpstatus.OK)
+        self.set_header("Content-Type", self.response_transport.content_type)
+        self.flush()
+
+    def _not_modified_since_version(self, version):
+        """Sets the ETag according to the version token returned by the
+        resource handler, if any. The token is combined with the query
+        arguments and the content type, as they can change the
+        representation.
+        Returns True if the client has a current copy, in which case the
+        Not Modified response has been set up and nothing else must be sent.
+        """
+        if version is None:
+            return False
+
+        if not isinstance(version, (bytes, str)):
+            # e.g. a revision number.
+            version = str(version)
+
+        self._has_version_etag = True
+        self.set_header("Etag", '"{}"'.format(
+            hashlib.sha1(escape.utf8(version) + b"?" +
+                         escape.utf8(self.request.query) + b";" +
+                         escape.utf8(self.response_transport.content_type)
+                         ).hexdigest()))
+
+        return self._not_modified()
+
+    def _not_modified(self):
+        """Checks the ETag against If-None-Match. If the client copy is
+        current, sets up the Not Modified response and returns True."""
+        if not self.check_etag_header():
+            return False
+
+        self.clear_header("Content-Type")
+        self.set_status(httpstatus.NOT_MODIFIED)
+        return True
+
+    @gen.coroutine
+    def _stream_items_to_client(self, res_handler, items_response,
+                                batch_size, fields=None):
+        """Sends an ItemsResponse to the client, pulling, serializing and
+        rendering batch_size items at a time and flushing after each batch,
+        so that the memory used does not depend on the size of the
+        collection. The fields projection is applied to the items.
+        Errors occurring before the first flush produce a regular error
+        response. Errors occurring later can only truncate the response,
+        because the status has already been sent.
+        If compressed, the compression is flushed with every batch."""
+        transport = self.response_transport
+        serializer = transport.serializer
+        renderer = transport.renderer
+        timer = self._timer
+
+        self.set_status(httpstatus.OK)
+        self.set_header("Content-Type", transport.content_type)
+
+        coding = self._response_coding(None)
+        if coding is None:
+            write = self.write
+            sync = None
+        else:
+            compressobj = content_encoding.compressor(
+                coding, self._compression_level)
+
+            def write(chunk):
+                self.write(compressobj.compress(escape.utf8(chunk)))
+
+            def sync(mode=zlib.Z_SYNC_FLUSH):
+                self.write(compressobj.flush(mode))
+
+        write(renderer.render_stream_open(serializer.items_key))
+
+        keys = []
+        while True:
+            with self.exceptions_to_http(res_handler, "get"):
+                batch = yield items_response.fetch_next(batch_size)
+
+            if len(batch) == 0:
+                break
+
+            self._check_items_sanity(batch, fields)
+
+            for item in batch:
+                with timer.stage("serialize"):
+                    key, representation = serializer.serialize_item(
+                        item, fields)
+                with timer.stage("render"):
+                    chunk = renderer.render_stream_item(key,
+                                                        representation,
+                                                        len(keys) == 0)
+                write(chunk)
+                keys.append(key)
+
+            if sync is not None:
+                sync()
+            yield self.flush()
+
+        self._encode_next_cursor(items_response)
+        write(renderer.render_stream_close(
+            serializer.serialize_items_envelope(items_response, keys)))
+        if sync is not None:
+            sync(zlib.Z_FINISH)
+        yield self.flush()
+
+    def _input_resource(self, res_handler, representation,
+                        identifier=None, scope="input"):
+        """Converts a single representation from the request payload into
+        a resource with the given identifier. If scope is not None, checks
+        that it contains all the mandatory data for that scope.
+        As for single resources, the representation is preprocessed only
+        for creation, i.e. if the identifier is None.
+        Raises WebAPIException if the representation is not acceptable."""
+        transport = self.request_transport
+
+        if identifier is None:
+            try:
+                with self._timer.stage("preprocess"):
+                    representation = res_handler.preprocess_representation(
+                        representation)
+            except exceptions.WebAPIException:
+                raise
+            except Exception:
+                self.log.exception(
+                    "Internal error on {} preprocess_representation".format(
+                        res_handler))
+                raise exceptions.BadRepresentation("Generic exception "
+                                                   "during preprocessing")
+
+            self._check_none(representation,
+                             "representation",
+                             "preprocess_representation")
+
+        try:
+            with self._timer.stage("deserialize"):
+                resource = transport.deserializer.deserialize(
+                    res_handler.resource_class,
+                    identifier,
+                    representation,
+                )
+        except exceptions.WebAPIException:
+            raise
+        except Exception as e:
+            # Includes TraitError. One entry must not fail the whole request.
+            raise exceptions.BadRepresentation(message=str(e))
+
+        if scope is not None:
+            self._check_resource_sanity(resource, scope)
+
+        return resource
+
+    def _input_resources_by_identifier(self, res_handler, handler_method,
+                                       scope):
+        """Parses the request payload as a mapping from identifiers to
+        representations, as for PUT and PATCH on a collection.
+        Returns a list of (identifier, outcome) pairs, where the outcome is
+        either the resource or the WebAPIException that prevents it from
+        being processed."""
+        with self.exceptions_to_http(res_handler, handler_method):
+            representations = self.parse_request_body()
+
+            if not isinstance(representations, dict):
+                raise exceptions.BadRepresentation(
+                    message="Expected a mapping of identifiers "
+                            "to representations")
+
+        outcomes = []
+        for identifier, representation in representations.items():
+            try:
+                try:
+                    preprocessed = res_handler.preprocess_identifier(
+                        identifier)
+                except exceptions.WebAPIException:
+                    raise
+                except Exception:
+                    raise exceptions.NotFound()
+
+                if preprocessed is None:
+                    raise exceptions.NotFound()
+
+                outcome = self._input_resource(res_handler,
+                                               representation,
+                                               preprocessed,
+                                               scope)
+            except exceptions.WebAPIException as e:
+                outcome = e
+
+            outcomes.append((identifier, outcome))
+
+        return outcomes
+
+    def _bulk_instances(self, outcomes):
+        """Returns the resources of the outcomes that can be passed
+        to the bulk handler methods."""
+        return [outcome for _, outcome in outcomes
+                if not isinstance(outcome, exceptions.WebAPIException)]
+
+    def _check_bulk_results(self, results, instances, culprit_routine):
+        """Checks that a bulk handler method returned one result
+        per instance."""
+        self._check_none(results, "results", culprit_routine)
+        if len(results) != len(instances):
+            self.log.error(
+                "{} returned {} results for {} instances".format(
+                    culprit_routine, len(results), len(instances)))
+            raise exceptions.Unable()
+
+    def _bulk_response(self, outcomes, results, on_success):
+        """Merges the outcomes of the preparation of the items with the
+        results of the bulk handler method into a BulkResponse, in the
+        order of the request. on_success is called with the BulkResponse
+        and the resource to report a successful item."""
+        results = iter(results)
+        bulk_response = BulkResponse()
+        for identifier, outcome in outcomes:
+            if isinstance(outcome, exceptions.WebAPIException):
+                bulk_response.add_failure(outcome, identifier=identifier)
+                continue
+
+            error = next(results)
+            if error is not None:
+                if outcome.identifier is not None:
+                    identifier = str(outcome.identifier)
+                bulk_response.add_failure(error, identifier=identifier)
+            else:
+                on_success(bulk_response, outcome)
+
+        return bulk_response
+
+    def _check_ids(self, res_handler, ids):
+        """Checks the number of identifiers of the ids query argument
+        against the max_ids of the resource handler."""
+        max_ids = res_handler.max_ids
+        if max_ids is not None and len(ids) > max_ids:
+            raise self.to_http_exception(
+                exceptions.BadQueryArguments(
+                    message="Too many identifiers. At most {} are "
+                            "allowed".format(max_ids)))
+
+    def _location_of(self, resource):
+        """Returns the URL of a resource created from this request"""
         if isinstance(resource, Resource):
-            location = with_end_slash(
+            return with_end_slash(
                 url_path_join(self.request.full_url(),
                               str(resource.identifier)))
         elif isinstance(resource, SingletonResource):
-            location = with_end_slash(self.request.full_url())
+            return with_end_slash(self.request.full_url())
         else:
             raise TypeError("Invalid resource type {}".format(resource))
 
+    def _send_bulk_to_client(self, bulk_response, status):
+        """Sends the per-item outcome of a bulk operation.
+        The given status is used if all the items succeeded,
+        MULTI_STATUS otherwise."""
+        transport = self.response_transport
+        with self._timer.stage("serialize"):
+            representation = transport.serializer.serialize(bulk_response)
+        with self._timer.stage("render"):
+            payload = transport.renderer.render(representation)
+
+        if not bulk_response.succeeded:
+            status = httpstatus.MULTI_STATUS
+
+        self.set_status(status)
+        self._write_payload(payload)
+        self.set_header("Content-Type", transport.content_type)
+        self.flush()
+
+    def _send_created_to_client(self, resource):
+        """Sends a created message to the client for a given resource"""
+        location = self._location_of(resource)
+
         self.set_status(httpstatus.CREATED)
         self.set_header("Location", location)
         self.clear_header('Content-Type')
@@ -257,7 +1092,7 @@ class WithoutIdentifierWebHandler(BaseWebHandler):
     @gen.coroutine
     def get(self, name):
         res_handler = self.get_resource_handler_or_404(name)
-        args = self.parsed_query_arguments()
+        args = self.handler_arguments(res_handler)
 
         if res_handler.handles_singleton():
             subcoro = self._get_singleton
@@ -270,37 +1105,179 @@ class WithoutIdentifierWebHandler(BaseWebHandler):
     def _get_collection(self, res_handler, args):
         """Returns the collection of available items"""
 
+        fields = self._validate_fields(res_handler, args)
+
+        with self.exceptions_to_http(res_handler, "get"):
+            with self._timer.stage("handler"):
+                version = yield res_handler.items_version(**args)
+
+        if self._not_modified_since_version(version):
+            return
+
+        if (res_handler.stream_batch_size is not None and
+                "ids" not in args and
+                self.response_transport.renderer.streaming):
+            items_response = ItemsResponse(res_handler.resource_class)
+
+            with self.exceptions_to_http(res_handler, "get"):
+                with self._timer.stage("handler"):
+                    yield res_handler.items(items_response, **args)
+
+            yield self._stream_items_to_client(res_handler,
+                                               items_response,
+                                               res_handler.stream_batch_size,
+                                               fields)
+            return
+
+        payload = yield self._read_payload(
+            res_handler, None,
+            lambda: self._render_collection(res_handler, args, fields))
+        self._send_payload_to_client(payload)
+
+    @gen.coroutine
+    def _render_collection(self, res_handler, args, fields):
+        """Obtains the items of the collection, or the ones requested with
+        the ids query argument, and returns the rendered payload."""
         items_response = ItemsResponse(res_handler.resource_class)
 
+        if "ids" in args:
+            yield self._retrieve_many(res_handler, items_response, args)
+        else:
+            with self.exceptions_to_http(res_handler, "get"):
+                with self._timer.stage("handler"):
+                    yield res_handler.items(items_response, **args)
+                yield items_response.fetch_all()
+
+            self._encode_next_cursor(items_response)
+
+        self._check_items_sanity(items_response.items, fields)
+        return self._render(items_response, fields)
+
+    @gen.coroutine
+    def _retrieve_many(self, res_handler, items_response, args):
+        """Fills the items_response with the items requested with
+        the ids query argument, reporting the ones not found."""
+        args = dict(args)
+        ids = args.pop("ids")
+        self._check_ids(res_handler, ids)
+
+        requested = []
+        for identifier in ids:
+            try:
+                preprocessed = res_handler.preprocess_identifier(identifier)
+            except Exception:
+                # An invalid identifier cannot be found.
+                preprocessed = None
+
+            if preprocessed is None:
+                requested.append((identifier, None))
+            else:
+                requested.append((identifier,
+                                  res_handler.resource_class(
+                                      identifier=preprocessed)))
+
         with self.exceptions_to_http(res_handler, "get"):
-            yield res_handler.items(items_response, **args)
+            with self._timer.stage("handler"):
+                found = yield res_handler.retrieve_many(
+                    [instance for _, instance in requested
+                     if instance is not None],
+                    **args)
 
-        for resource in items_response.items:
-            self._check_none(resource.identifier,
-                             "identifier",
-                             "items")
-            self._check_resource_sanity(resource, "output")
+            self._check_none(found, "found", "retrieve_many()")
 
-        self._send_to_client(items_response)
+        found_ids = set(str(instance.identifier) for instance in found)
+        items_response.set(found)
+        items_response.missing = [
+            identifier for identifier, instance in requested
+            if instance is None or str(instance.identifier) not in found_ids]
 
     @gen.coroutine
     def _get_singleton(self, res_handler, args):
-        transport = self._registry.transport
+        transport = self.request_transport
+        fields = self._validate_fields(res_handler, args)
 
         with self.exceptions_to_http(res_handler, "get"):
-            resource = transport.deserializer.deserialize(
-                res_handler.resource_class)
+            with self._timer.stage("deserialize"):
+                resource = transport.deserializer.deserialize(
+                    res_handler.resource_class)
+
+            with self._timer.stage("handler"):
+                version = yield res_handler.version(resource, **args)
 
-            yield res_handler.retrieve(resource, **args)
+        if self._not_modified_since_version(version):
+            return
+
+        with self.exceptions_to_http(res_handler, "get"):
+            with self._timer.stage("handler"):
+                yield res_handler.retrieve(resource, **args)
 
-            self._check_resource_sanity(resource, "output")
+            self._check_resource_sanity(resource, "output", fields)
 
-        self._send_to_client(resource)
+        self._send_to_client(resource, fields)
+
+    @gen.coroutine
+    def head(self, name):
+        res_handler = self.get_resource_handler_or_404(name)
+        args = self.handler_arguments(res_handler)
+
+        if res_handler.handles_singleton():
+            subcoro = self._head_singleton
+        else:
+            subcoro = self._head_collection
+
+        yield subcoro(res_handler, args)
+
+    @gen.coroutine
+    def _head_collection(self, res_handler, args):
+        """Returns the headers of the collection, with the total number
+        of items, without producing the items. As for the resources, the
+        ETag of GET is sent only if the resource handler implements
+        items_version()."""
+        with self.exceptions_to_http(res_handler, "head"):
+            with self._timer.stage("handler"):
+                version = yield res_handler.items_version(**args)
+
+        if self._not_modified_since_version(version):
+            return
+
+        with self.exceptions_to_http(res_handler, "head"):
+            with self._timer.stage("handler"):
+                count = yield res_handler.count(**args)
+
+        if count is not None:
+            self.set_header("X-Total-Count", str(count))
+
+        self._send_headers_to_client()
+
+    @gen.coroutine
+    def _head_singleton(self, res_handler, args):
+        """Checks the existence of the singleton resource."""
+        transport = self.request_transport
+
+        with self.exceptions_to_http(res_handler, "head"):
+            with self._timer.stage("deserialize"):
+                resource = transport.deserializer.deserialize(
+                    res_handler.resource_class)
+
+            with self._timer.stage("handler"):
+                version = yield res_handler.version(resource, **args)
+
+        if self._not_modified_since_version(version):
+            return
+
+        with self.exceptions_to_http(res_handler, "head"):
+            with self._timer.stage("handler"):
+                exists = yield res_handler.exists(resource, **args)
+
+        if not exists:
+            raise web.HTTPError(httpstatus.NOT_FOUND)
+
+        self._send_headers_to_client()
 
     @gen.coroutine
     def post(self, name):
         res_handler = self.get_resource_handler_or_404(name)
-        args = self.parsed_query_arguments()
+        args = self.handler_arguments(res_handler)
 
         if res_handler.handles_singleton():
             subcoro = self._post_singleton
@@ -308,24 +1285,28 @@ class WithoutIdentifierWebHandler(BaseWebHandler):
             subcoro = self._post_collection
 
         yield subcoro(res_handler, args)
+        self._invalidate_cache(res_handler)
 
     @gen.coroutine
     def _post_collection(self, res_handler, args):
         """Creates a new resource in the collection."""
-        transport = self._registry.transport
-        payload = self.request.body
+        transport = self.request_transport
 
         with self.exceptions_to_http(res_handler, "post"):
-            representation = transport.parser.parse(payload)
+            representation = self.parse_request_body()
 
-        on_generic_raise = self.to_http_exception(
-            exceptions.BadRepresentation("Generic exception "
-                                         "during preprocessing"))
+        if isinstance(representation, list):
+            yield self._post_collection_many(res_handler,
+                                             representation,
+                                             args)
+            return
 
-        with self.exceptions_to_http(res_handler, "post",
-                                     on_generic_raise=on_generic_raise):
-            representation = res_handler.preprocess_representation(
-                representation)
+        with self.exceptions_to_http(
+                res_handler, "post",
+                on_generic_raise=_GENERIC_PREPROCESSING_ERROR):
+            with self._timer.stage("preprocess"):
+                representation = res_handler.preprocess_representation(
+                    representation)
 
             self._check_none(representation,
                              "representation",
@@ -333,17 +1314,19 @@ class WithoutIdentifierWebHandler(BaseWebHandler):
 
         with self.exceptions_to_http(res_handler, "post"):
             try:
-                resource = transport.deserializer.deserialize(
-                    res_handler.resource_class,
-                    None,
-                    representation,
-                )
+                with self._timer.stage("deserialize"):
+                    resource = transport.deserializer.deserialize(
+                        res_handler.resource_class,
+                        None,
+                        representation,
+                    )
             except TraitError as e:
                 raise exceptions.BadRepresentation(message=str(e))
 
             self._check_resource_sanity(resource, "input")
 
-            yield res_handler.create(resource, **args)
+            with self._timer.stage("handler"):
+                yield res_handler.create(resource, **args)
 
             self._check_none(resource.identifier,
                              "resource_id",
@@ -351,24 +1334,54 @@ class WithoutIdentifierWebHandler(BaseWebHandler):
 
         self._send_created_to_client(resource)
 
+    @gen.coroutine
+    def _post_collection_many(self, res_handler, representations, args):
+        """Creates multiple resources in the collection, one per
+        representation in the array. Failures are reported per item."""
+        outcomes = []
+        for representation in representations:
+            try:
+                outcome = self._input_resource(res_handler, representation)
+            except exceptions.WebAPIException as e:
+                outcome = e
+
+            outcomes.append((None, outcome))
+
+        instances = self._bulk_instances(outcomes)
+        with self.exceptions_to_http(res_handler, "post"):
+            with self._timer.stage("handler"):
+                results = yield res_handler.create_many(instances, **args)
+            self._check_bulk_results(results, instances, "create_many()")
+
+        def created(bulk_response, resource):
+            if resource.identifier is None:
+                self.log.error("resource_id is None. "
+                               "Is create_many() not setting it?")
+                bulk_response.add_failure(exceptions.Unable())
+            else:
+                bulk_response.add_success(
+                    httpstatus.CREATED,
+                    identifier=str(resource.identifier),
+                    location=self._location_of(resource))
+
+        bulk_response = self._bulk_response(outcomes, results, created)
+        self._send_bulk_to_client(bulk_response, httpstatus.CREATED)
+
     @gen.coroutine
     def _post_singleton(self, res_handler, args):
         """POST on a singleton creates the resource and fills the information
         if the resource is not there. If it's there, will return a conflict."""
-        transport = self._registry.transport
-        payload = self.request.body
+        transport = self.request_transport
 
         with self.exceptions_to_http(res_handler, "post"):
-            representation = transport.parser.parse(payload)
-
-        on_generic_raise = self.to_http_exception(
-            exceptions.BadRepresentation("Generic exception "
-                                         "during preprocessing"))
+            representation = self.parse_request_body()
 
-        with self.exceptions_to_http(res_handler, "post",
-                                     on_generic_raise=on_generic_raise):
-            representation = res_handler.preprocess_representation(
-                representation)
+        with self.exceptions_to_http(
+                res_handler, "post",
+                on_generic_raise=_GENERIC_PREPROCESSING_ERROR):
+            with self._timer.stage("preprocess"):
+                representation = res_handler.preprocess_representation(
+                    representation)
 
             self._check_none(representation,
                              "representation",
@@ -376,29 +1389,32 @@ class WithoutIdentifierWebHandler(BaseWebHandler):
 
         with self.exceptions_to_http(res_handler, "post"):
             try:
-                resource = transport.deserializer.deserialize(
-                    res_handler.resource_class,
-                    None,
-                    representation,
-                )
+                with self._timer.stage("deserialize"):
+                    resource = transport.deserializer.deserialize(
+                        res_handler.resource_class,
+                        None,
+                        representation,
+                    )
             except TraitError as e:
                 raise exceptions.BadRepresentation(message=str(e))
 
             self._check_resource_sanity(resource, "input")
 
-            exists = yield res_handler.exists(resource)
+            with self._timer.stage("handler"):
+                exists = yield res_handler.exists(resource, **args)
 
             if exists:
                 raise exceptions.Exists()
 
-            yield res_handler.create(resource, **args)
+            with self._timer.stage("handler"):
+                yield res_handler.create(resource, **args)
 
         self._send_created_to_client(resource)
 
     @gen.coroutine
     def put(self, name):
         res_handler = self.get_resource_handler_or_404(name)
-        args = self.parsed_query_arguments()
+        args = self.handler_arguments(res_handler)
 
         if res_handler.handles_singleton():
             coro = self._put_singleton
@@ -406,28 +1422,45 @@ class WithoutIdentifierWebHandler(BaseWebHandler):
             coro = self._put_collection
 
         yield coro(res_handler, args)
+        self._invalidate_cache(res_handler)
 
     @gen.coroutine
     def _put_collection(self, res_handler, args):
-        """You cannot PUT on a collection"""
-        raise HTTPError(httpstatus.METHOD_NOT_ALLOWED)
+        """Replaces multiple resources of the collection, given a mapping
+        from their identifiers to the new representations."""
+        outcomes = self._input_resources_by_identifier(res_handler,
+                                                       "put",
+                                                       "input")
+
+        instances = self._bulk_instances(outcomes)
+        with self.exceptions_to_http(res_handler, "put"):
+            with self._timer.stage("handler"):
+                results = yield res_handler.update_many(instances, **args)
+            self._check_bulk_results(results, instances, "update_many()")
+
+        bulk_response = self._bulk_response(outcomes, results, self._updated)
+        self._send_bulk_to_client(bulk_response, httpstatus.OK)
+
+    def _updated(self, bulk_response, resource):
+        """Reports a resource as successfully updated or deleted"""
+        bulk_response.add_success(httpstatus.NO_CONTENT,
+                                  identifier=str(resource.identifier))
 
     @gen.coroutine
     def _put_singleton(self, res_handler, args):
         """Replaces the resource with a new representation."""
-        transport = self._registry.transport
+        transport = self.request_transport
 
-        on_generic_raise = self.to_http_exception(
-            exceptions.BadRepresentation("Generic exception during "
-                                         "deserialization"))
-        with self.exceptions_to_http(res_handler,
-                                     "put",
-                                     on_generic_raise=on_generic_raise):
+        with self.exceptions_to_http(
+                res_handler, "put",
+                on_generic_raise=_GENERIC_DESERIALIZATION_ERROR):
+            representation = self.parse_request_body()
             try:
-                resource = transport.deserializer.deserialize(
-                    res_handler.resource_class,
-                    None,
-                    transport.parser.parse(self.request.body))
+                with self._timer.stage("deserialize"):
+                    resource = transport.deserializer.deserialize(
+                        res_handler.resource_class,
+                        None,
+                        representation)
             except TraitError as e:
                 raise exceptions.BadRepresentation(message=str(e))
 
@@ -438,14 +1471,80 @@ class WithoutIdentifierWebHandler(BaseWebHandler):
         with self.exceptions_to_http(res_handler, "put"):
             self._check_resource_sanity(resource, "input")
 
-            yield res_handler.update(resource, **args)
+            with self._timer.stage("handler"):
+                yield res_handler.update(resource, **args)
+
+        self._send_to_client(None)
+
+    @gen.coroutine
+    def patch(self, name):
+        res_handler = self.get_resource_handler_or_404(name)
+        args = self.handler_arguments(res_handler)
+
+        if res_handler.handles_singleton():
+            coro = self._patch_singleton
+        else:
+            coro = self._patch_collection
+
+        yield coro(res_handler, args)
+        self._invalidate_cache(res_handler)
+
+    @gen.coroutine
+    def _patch_collection(self, res_handler, args):
+        """Updates multiple resources of the collection, given a mapping
+        from their identifiers to the data to change."""
+        outcomes = self._input_resources_by_identifier(res_handler,
+                                                       "patch",
+                                                       None)
+
+        instances = self._bulk_instances(outcomes)
+        with self.exceptions_to_http(res_handler, "patch"):
+            with self._timer.stage("handler"):
+                results = yield res_handler.patch_many(
+                    instances,
+                    [resource_mod.present_fields(instance)
+                     for instance in instances],
+                    **args)
+            self._check_bulk_results(results, instances, "patch_many()")
+
+        bulk_response = self._bulk_response(outcomes, results, self._updated)
+        self._send_bulk_to_client(bulk_response, httpstatus.OK)
+
+    @gen.coroutine
+    def _patch_singleton(self, res_handler, args):
+        """Updates the resource with the data present in the
+        representation."""
+        transport = self.request_transport
+
+        with self.exceptions_to_http(
+                res_handler, "patch",
+                on_generic_raise=_GENERIC_DESERIALIZATION_ERROR):
+            representation = self.parse_request_body()
+            try:
+                with self._timer.stage("deserialize"):
+                    resource = transport.deserializer.deserialize(
+                        res_handler.resource_class,
+                        None,
+                        representation)
+            except TraitError as e:
+                raise exceptions.BadRepresentation(message=str(e))
+
+            self._check_none(resource,
+                             "representation",
+                             "deserialize")
+
+        with self.exceptions_to_http(res_handler, "patch"):
+            with self._timer.stage("handler"):
+                yield res_handler.patch(resource,
+                                        resource_mod.present_fields(resource),
+                                        **args)
 
         self._send_to_client(None)
 
     @gen.coroutine
     def delete(self, name):
         res_handler = self.get_resource_handler_or_404(name)
-        args = self.parsed_query_arguments()
+        args = self.handler_arguments(res_handler)
 
         if res_handler.handles_singleton():
             coro = self._delete_singleton
@@ -453,21 +1552,73 @@ class WithoutIdentifierWebHandler(BaseWebHandler):
             coro = self._delete_collection
 
         yield coro(res_handler, args)
+        self._invalidate_cache(res_handler)
 
     @gen.coroutine
     def _delete_collection(self, res_handler, args):
-        raise HTTPError(httpstatus.METHOD_NOT_ALLOWED)
+        """Deletes the resources of the collection selected with the ids
+        query argument or, if not given, with a filter. Deleting the
+        whole collection is not allowed."""
+        args = dict(args)
+        ids = args.pop("ids", None)
+
+        if ids is not None:
+            self._check_ids(res_handler, ids)
+            outcomes = []
+            for identifier in ids:
+                try:
+                    preprocessed = res_handler.preprocess_identifier(
+                        identifier)
+                except exceptions.WebAPIException as e:
+                    outcomes.append((identifier, e))
+                    continue
+                except Exception:
+                    preprocessed = None
+
+                if preprocessed is None:
+                    outcomes.append((identifier, exceptions.NotFound()))
+                else:
+                    outcomes.append((identifier, res_handler.resource_class(
+                        identifier=preprocessed)))
+        elif "filter_" in args:
+            # The filter is applied by items(), and is not passed on.
+            items_response = ItemsResponse(res_handler.resource_class)
+            with self.exceptions_to_http(res_handler, "delete"):
+                with self._timer.stage("handler"):
+                    yield res_handler.items(
+                        items_response,
+                        filter_=args.pop("filter_"),
+                        **self._user_arguments(res_handler))
+                yield items_response.fetch_all()
+
+            outcomes = [
+                (str(item.identifier),
+                 res_handler.resource_class(identifier=item.identifier))
+                for item in items_response.items]
+        else:
+            raise HTTPError(httpstatus.METHOD_NOT_ALLOWED)
+
+        instances = self._bulk_instances(outcomes)
+        with self.exceptions_to_http(res_handler, "delete"):
+            with self._timer.stage("handler"):
+                results = yield res_handler.delete_many(instances, **args)
+            self._check_bulk_results(results, instances, "delete_many()")
+
+        bulk_response = self._bulk_response(outcomes, results, self._updated)
+        self._send_bulk_to_client(bulk_response, httpstatus.OK)
 
     @gen.coroutine
     def _delete_singleton(self, res_handler, args):
         """Deletes the singleton resource."""
-        transport = self._registry.transport
+        transport = self.request_transport
 
         with self.exceptions_to_http(res_handler, "delete"):
-            resource = transport.deserializer.deserialize(
-                res_handler.resource_class)
+            with self._timer.stage("deserialize"):
+                resource = transport.deserializer.deserialize(
+                    res_handler.resource_class)
 
-            yield res_handler.delete(resource, **args)
+            with self._timer.stage("handler"):
+                yield res_handler.delete(resource, **args)
 
         self._send_to_client(None)
 
@@ -479,28 +1630,82 @@ class WithIdentifierWebHandler(BaseWebHandler):
     def get(self, collection_name, identifier):
         """Retrieves the resource representation."""
         res_handler = self.get_resource_handler_or_404(collection_name)
-        transport = self._registry.transport
-        args = self.parsed_query_arguments()
+        transport = self.request_transport
+        args = self.handler_arguments(res_handler)
 
         with self.exceptions_to_http("get",
                                      collection_name,
                                      identifier,
-                                     on_generic_raise=web.HTTPError(
-                                         httpstatus.NOT_FOUND)):
+                                     on_generic_raise=_IDENTIFIER_NOT_FOUND):
             identifier = res_handler.preprocess_identifier(identifier)
 
+        fields = self._validate_fields(res_handler, args)
+
         with self.exceptions_to_http("get", collection_name, identifier):
-            resource = transport.deserializer.deserialize(
-                res_handler.resource_class,
-                identifier)
+            with self._timer.stage("deserialize"):
+                resource = transport.deserializer.deserialize(
+                    res_handler.resource_class,
+                    identifier)
+
+            self._check_none(identifier, "identifier", "preprocess_identifier")
+
+            with self._timer.stage("handler"):
+                version = yield res_handler.version(resource, **args)
+
+        if self._not_modified_since_version(version):
+            return
+
+        @gen.coroutine
+        def retrieve():
+            with self.exceptions_to_http("get", collection_name, identifier):
+                with self._timer.stage("handler"):
+                    yield res_handler.retrieve(resource, **args)
+
+                self._check_resource_sanity(resource, "output", fields)
+
+            return self._render(resource, fields)
+
+        payload = yield self._read_payload(res_handler, identifier, retrieve)
+        self._send_payload_to_client(payload)
+
+    @gen.coroutine
+    def head(self, collection_name, identifier):
+        """Checks the existence of the resource, without retrieving it.
+        The response carries the ETag of GET only if the resource handler
+        implements version(): the hash of the payload, used by GET
+        otherwise, would require retrieving and rendering the resource."""
+        res_handler = self.get_resource_handler_or_404(collection_name)
+        transport = self.request_transport
+        args = self.handler_arguments(res_handler)
+
+        with self.exceptions_to_http("head",
+                                     collection_name,
+                                     identifier,
+                                     on_generic_raise=_IDENTIFIER_NOT_FOUND):
+            identifier = res_handler.preprocess_identifier(identifier)
 
+        with self.exceptions_to_http("head", collection_name, identifier):
             self._check_none(identifier, "identifier", "preprocess_identifier")
 
-            yield res_handler.retrieve(resource, **args)
+            with self._timer.stage("deserialize"):
+                resource = transport.deserializer.deserialize(
+                    res_handler.resource_class,
+                    identifier)
+
+            with self._timer.stage("handler"):
+                version = yield res_handler.version(resource, **args)
 
-            self._check_resource_sanity(resource, "output")
+        if self._not_modified_since_version(version):
+            return
+
+        with self.exceptions_to_http("head", collection_name, identifier):
+            with self._timer.stage("handler"):
+                exists = yield res_handler.exists(resource, **args)
+
+        if not exists:
+            raise web.HTTPError(httpstatus.NOT_FOUND)
 
-        self._send_to_client(resource)
+        self._send_headers_to_client()
 
     @gen.coroutine
     def post(self, collection_name, identifier):
@@ -508,24 +1713,25 @@ class WithIdentifierWebHandler(BaseWebHandler):
         in either Conflict or NotFound, depending on the
         presence of a resource at the given URL"""
         res_handler = self.get_resource_handler_or_404(collection_name)
-        transport = self._registry.transport
-        args = self.parsed_query_arguments()
+        transport = self.request_transport
+        args = self.handler_arguments(res_handler)
 
         with self.exceptions_to_http("post",
                                      collection_name,
                                      identifier,
-                                     on_generic_raise=web.HTTPError(
-                                         httpstatus.NOT_FOUND)):
+                                     on_generic_raise=_IDENTIFIER_NOT_FOUND):
             identifier = res_handler.preprocess_identifier(identifier)
 
         with self.exceptions_to_http("post", collection_name, identifier):
             self._check_none(identifier, "identifier", "preprocess_identifier")
 
-            resource = transport.deserializer.deserialize(
-                res_handler.resource_class,
-                identifier)
+            with self._timer.stage("deserialize"):
+                resource = transport.deserializer.deserialize(
+                    res_handler.resource_class,
+                    identifier)
 
-            exists = yield res_handler.exists(resource, **args)
+            with self._timer.stage("handler"):
+                exists = yield res_handler.exists(resource, **args)
 
         if exists:
             raise web.HTTPError(httpstatus.CONFLICT)
@@ -536,31 +1742,31 @@ class WithIdentifierWebHandler(BaseWebHandler):
     def put(self, collection_name, identifier):
         """Replaces the resource with a new representation."""
         res_handler = self.get_resource_handler_or_404(collection_name)
-        transport = self._registry.transport
-        args = self.parsed_query_arguments()
+        transport = self.request_transport
+        args = self.handler_arguments(res_handler)
 
         with self.exceptions_to_http("put",
                                      collection_name,
                                      identifier,
-                                     on_generic_raise=web.HTTPError(
-                                         httpstatus.NOT_FOUND)):
+                                     on_generic_raise=_IDENTIFIER_NOT_FOUND):
             identifier = res_handler.preprocess_identifier(identifier)
 
-        on_generic_raise = self.to_http_exception(
-            exceptions.BadRepresentation(
-                "Generic exception during preprocessing of {}".format(
-                    collection_name)))
+        on_generic_raise = exceptions.BadRepresentation(
+            "Generic exception during preprocessing of {}".format(
+                collection_name))
         with self.exceptions_to_http("put",
                                      collection_name,
                                      identifier,
                                      on_generic_raise=on_generic_raise):
             self._check_none(identifier, "identifier", "preprocess_identifier")
 
+            representation = self.parse_request_body()
             try:
-                resource = transport.deserializer.deserialize(
-                    res_handler.resource_class,
-                    identifier,
-                    transport.parser.parse(self.request.body))
+                with self._timer.stage("deserialize"):
+                    resource = transport.deserializer.deserialize(
+                        res_handler.resource_class,
+                        identifier,
+                        representation)
             except TraitError as e:
                 raise exceptions.BadRepresentation(message=str(e))
 
@@ -573,22 +1779,71 @@ class WithIdentifierWebHandler(BaseWebHandler):
                                      identifier):
             self._check_resource_sanity(resource, "input")
 
-            yield res_handler.update(resource, **args)
+            with self._timer.stage("handler"):
+                yield res_handler.update(resource, **args)
+
+        self._invalidate_cache(res_handler, identifier)
+        self._send_to_client(None)
+
+    @gen.coroutine
+    def patch(self, collection_name, identifier):
+        """Updates the resource with the data present in the
+        representation. Absent data are left unchanged."""
+        res_handler = self.get_resource_handler_or_404(collection_name)
+        transport = self.request_transport
+        args = self.handler_arguments(res_handler)
+
+        with self.exceptions_to_http("patch",
+                                     collection_name,
+                                     identifier,
+                                     on_generic_raise=_IDENTIFIER_NOT_FOUND):
+            identifier = res_handler.preprocess_identifier(identifier)
+
+        on_generic_raise = exceptions.BadRepresentation(
+            "Generic exception during preprocessing of {}".format(
+                collection_name))
+        with self.exceptions_to_http("patch",
+                                     collection_name,
+                                     identifier,
+                                     on_generic_raise=on_generic_raise):
+            self._check_none(identifier, "identifier", "preprocess_identifier")
+
+            representation = self.parse_request_body()
+            try:
+                with self._timer.stage("deserialize"):
+                    resource = transport.deserializer.deserialize(
+                        res_handler.resource_class,
+                        identifier,
+                        representation)
+            except TraitError as e:
+                raise exceptions.BadRepresentation(message=str(e))
 
+            self._check_none(resource,
+                             "representation",
+                             "preprocess_representation")
+
+        with self.exceptions_to_http("patch",
+                                     collection_name,
+                                     identifier):
+            with self._timer.stage("handler"):
+                yield res_handler.patch(resource,
+                                        resource_mod.present_fields(resource),
+                                        **args)
+
+        self._invalidate_cache(res_handler, identifier)
         self._send_to_client(None)
 
     @gen.coroutine
     def delete(self, collection_name, identifier):
         """Deletes the resource."""
         res_handler = self.get_resource_handler_or_404(collection_name)
-        transport = self._registry.transport
-        args = self.parsed_query_arguments()
+        transport = self.request_transport
+        args = self.handler_arguments(res_handler)
 
         with self.exceptions_to_http("delete",
                                      collection_name,
                                      identifier,
-                                     on_generic_raise=web.HTTPError(
-                                         httpstatus.NOT_FOUND)):
+                                     on_generic_raise=_IDENTIFIER_NOT_FOUND):
             identifier = res_handler.preprocess_identifier(identifier)
 
         self._check_none(identifier, "identifier", "preprocess_identifier")
@@ -597,19 +1852,258 @@ class WithIdentifierWebHandler(BaseWebHandler):
                                      collection_name,
                                      identifier):
 
-            resource = transport.deserializer.deserialize(
-                res_handler.resource_class,
-                identifier)
+            with self._timer.stage("deserialize"):
+                resource = transport.deserializer.deserialize(
+                    res_handler.resource_class,
+                    identifier)
 
-            yield res_handler.delete(resource, **args)
+            with self._timer.stage("handler"):
+                yield res_handler.delete(resource, **args)
 
+        self._invalidate_cache(res_handler, identifier)
         self._send_to_client(None)
 
 
+@web.stream_request_body
+class StreamedWithoutIdentifierWebHandler(WithoutIdentifierWebHandler):
+    """Handler for URLs without an identifier, of the collections whose
+    resource handler receives the request bodies in streaming.
+    """
+    @gen.coroutine
+    def prepare(self):
+        yield super().prepare()
+        self._prepare_body(self.path_args[0])
+
+
+@web.stream_request_body
+class StreamedWithIdentifierWebHandler(WithIdentifierWebHandler):
+    """Handler for URLs addressing a resource, of the collections whose
+    resource handler receives the request bodies in streaming.
+    """
+    @gen.coroutine
+    def prepare(self):
+        yield super().prepare()
+        self._prepare_body(self.path_args[0])
+
+
+class BatchWebHandler(BaseWebHandler):
+    """Handles a batch of sub-requests to the API in a single request.
+    The sub-requests are dispatched in-process to the resource web
+    handlers, and executed concurrently. The client is authenticated
+    once for the whole batch.
+    """
+
+    #: The maximum number of sub-requests accepted in a batch.
+    max_requests = 100
+
+    #: The methods allowed in the sub-requests.
+    methods = ("GET", "HEAD", "POST", "PUT", "PATCH", "DELETE")
+
+    #: The response headers not reported for the sub-requests.
+    ignored_headers = ("Server", "Date", "Content-Length", "Content-Type")
+
+    #: The zlib compression level of the batch responses, as
+    #: ResourceHandler.compression_level.
+    compression_level = 6
+
+    @gen.coroutine
+    def post(self):
+        """Executes the sub-requests in the payload, a list of
+        {method, path, query, body} objects. path is relative to the
+        API root, e.g. "students/1/". query is a dictionary of query
+        arguments, and body the representation to send, if any.
+        Returns the list of {status, headers, body} responses, in order.
+        """
+        self._compression_level = self.compression_level
+        body = self.request_body()
+
+        try:
+            sub_requests = self.request_transport.parser.parse(body)
+        except Exception:
+            raise self.to_http_exception(
+                exceptions.BadRepresentation("Unparsable payload"))
+
+        if not isinstance(sub_requests, list):
+            raise self.to_http_exception(
+                exceptions.BadRepresentation(
+                    "Expected a list of requests"))
+
+        if len(sub_requests) > self.max_requests:
+            raise self.to_http_exception(
+                exceptions.BadRepresentation(
+                    "Too many requests. At most {} are allowed".format(
+                        self.max_requests)))
+
+        responses = yield gen.multi([
+            self._execute_sub_request(sub_request)
+            for sub_request in sub_requests])
+
+        transport = self.response_transport
+        self.set_status(httpstatus.OK)
+        self._write_payload(
+            transport.renderer.render({"responses": responses}))
+        self.set_header("Content-Type", transport.content_type)
+        self.flush()
+
+    @gen.coroutine
+    def _execute_sub_request(self, sub_request):
+        """Executes a single sub-request, and returns its response."""
+        transport = self.response_transport
+
+        try:
+            method, path, query, body = self._unpack_sub_request(sub_request)
+        except ValueError as e:
+            return self._sub_response(
+                httpstatus.BAD_REQUEST,
+                body=transport.serializer.serialize(
+                    exceptions.BadRepresentation(message=str(e))))
+
+        path = self._resource_path(path)
+        if path is None:
+            return self._sub_response(httpstatus.NOT_FOUND)
+
+        uri = url_path_join(self.base_urlpath, "api", self.api_version, path)
+        if len(query) != 0:
+            uri += "?" + query
+
+        headers = httputil.HTTPHeaders(self.request.headers)
+        headers.pop("Content-Length", None)
+        headers.pop("Content-Encoding", None)
+        # The sub-responses are parsed, and compressed only as a whole.
+        headers.pop("Accept-Encoding", None)
+        # The preconditions of the batch request do not apply to the
+        # resources of its sub-requests.
+        for name in _CONDITIONAL_HEADERS:
+            headers.pop(name, None)
+        # The sub-requests and responses use the transport of the response.
+        headers["Content-Type"] = transport.content_type
+        headers["Accept"] = transport.content_type
+        if body is not None:
+            body = b"".join(
+                payload_chunks(transport.renderer.render(body)))
+            headers["Content-Length"] = str(len(body))
+
+        connection = CaptureConnection(current_user=self.current_user)
+        request = httputil.HTTPServerRequest(
+            method=method,
+            uri=uri,
+            version=self.request.version,
+            headers=headers,
+            body=body,
+            host=self.request.host,
+            connection=connection)
+        request.remote_ip = self.request.remote_ip
+        request.protocol = self.request.protocol
+
+        # Routed by the application, as the requests it receives.
+        self.application(request)
+        yield connection.finished
+
+        response_body = None
+        if len(connection.body) != 0:
+            try:
+                response_body = transport.parser.parse(connection.body)
+            except Exception:
+                response_body = escape.to_unicode(connection.body)
+
+        return self._sub_response(
+            connection.code,
+            headers={
+                name: value
+                for name, value in connection.headers.get_all()
+                if name not in self.ignored_headers},
+            body=response_body)
+
+    def _unpack_sub_request(self, sub_request):
+        """Validates a sub-request, returning its method, path,
+        query string and body. Raises ValueError if invalid."""
+        if not isinstance(sub_request, dict):
+            raise ValueError("Request must be an object")
+
+        method = sub_request.get("method")
+        if method not in self.methods:
+            raise ValueError("Invalid method {}".format(method))
+
+        path = sub_request.get("path")
+        if not isinstance(path, str):
+            raise ValueError("Invalid path {}".format(path))
+
+        query = sub_request.get("query")
+        if query is None:
+            query = ""
+        elif isinstance(query, dict):
+            query = urlencode(query, doseq=True)
+        elif not isinstance(query, str):
+            raise ValueError("Invalid query {}".format(query))
+
+        return method, path, query, sub_request.get("body")
+
+    def _resource_path(self, path):
+        """Returns the given path, relative to the API root, as routed
+        to the resource web handlers, or None if it does not refer to a
+        resource. Nested batch requests are not allowed."""
+        path = with_end_slash(path.lstrip("/"))
+        if path in ("/", "_batch/"):
+            return None
+
+        return path
+
+    def _sub_response(self, status, headers=None, body=None):
+        """Returns the representation of the response to a sub-request"""
+        response = {"status": status}
+        if headers:
+            response["headers"] = headers
+
+        if body is not None:
+            response["body"] = body
+
+        return response
+
+
 class JSAPIWebHandler(BaseWebHandler):
-    """Handles the JavaScript API request."""
+    """Handles the JavaScript API request.
+    The API is rendered once, and cached by the registry. The minify query
+    argument, if true, requests a minified version."""
+
+    #: The time in seconds for which clients can cache the API
+    #: without revalidating it.
+    cache_max_age = 86400
+
     @gen.coroutine
     def get(self):
+        minify = self.get_query_argument("minify", "0").lower() not in (
+            "", "0", "false", "no")
+
+        bundle = self.registry.jsapi_bundle(self.base_urlpath,
+                                            self.api_version,
+                                            minify,
+                                            self._render_bundle)
+
+        self.set_header("Content-Type", "application/javascript")
+        self.set_header("Cache-Control",
+                        "public, max-age={}".format(self.cache_max_age))
+        self.set_header("Vary", "Accept-Encoding")
+
+        coding = content_encoding.negotiate(
+            self.request.headers.get("Accept-Encoding"),
+            supported=("gzip",))
+        if coding is None:
+            etag, body = bundle.etag, bundle.body
+        else:
+            etag, body = bundle.gzip_etag, bundle.gzip_body
+
+        self.set_header("Etag", etag)
+        if self.check_etag_header():
+            self.clear_header("Content-Type")
+            self.set_status(httpstatus.NOT_MODIFIED)
+            return
+
+        if coding is not None:
+            self.set_header("Content-Encoding", coding)
+        self.write(body)
+
+    def _render_bundle(self):
+        """Renders the JavaScript API source."""
         resources = []
         reg = self.registry
         for resource_handler in reg.registered_handlers.values():
@@ -621,11 +2115,11 @@ class JSAPIWebHandler(BaseWebHandler):
                 "bound_name": bound_name,
                 "singleton": resource_handler.handles_singleton()
             })
-        self.set_header("Content-Type", "application/javascript")
-        self.render("templates/resources.template.js",
-                    base_urlpath=self.base_urlpath,
-                    api_version=self.api_version,
-                    resources=resources)
+
+        return self.render_string("templates/resources.template.js",
+                                  base_urlpath=self.base_urlpath,
+                                  api_version=self.api_version,
+                                  resources=resources)
 
     def create_template_loader(self, template_path):
         """Ovberride the default template loader, because if